@@ -1,61 +1,156 @@
 # lexical_analyzer.py
-from tokens_def import COMPILED_REGEX, Token
+import os
+import sys
+
+# Los módulos que comparten las etapas están en ../comun
+_RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _RAIZ not in sys.path:
+    sys.path.append(_RAIZ)
+
+from comun.dfa_lexer import compile_spec
+from comun.incremental_lexer import relex as _relex
+from comun.parallel_lexer import MIN_SHARD_SIZE, tokenize_parallel
+from comun.source_index import SourceIndex
+from comun.token_stream import TokenStream
+from tokens_def import COMPILED_REGEX, TOKEN_SPECIFICATION, Token
 
 class Lexer:
-    def __init__(self, code):
+    def __init__(self, code, first_line=1, backend='re'):
         self.code = code
-        self.line_num = 1
+        # backend='dfa' usa el AFD de comun.dfa_lexer, con las mismas
+        # coincidencias que COMPILED_REGEX
+        self.regex = compile_spec(TOKEN_SPECIFICATION) if backend == 'dfa' else COMPILED_REGEX
+        self.index = SourceIndex(code, first_line)
+        self.line_num = first_line
         self.column_num = 1
 
-    def tokenize(self):
+    def scan(self):
         """
-        Convierte el código fuente en una lista de objetos Token.
+        Genera (tipo, inicio, fin) por cada token válido del código.
         Lanza excepciones en caso de errores léxicos.
         """
-        tokens = []
         pos = 0
-        while pos < len(self.code):
-            # Intentamos hacer match en la posición actual
-            match = COMPILED_REGEX.match(self.code, pos)
-            if not match:
-                # No hay coincidencia: error léxico.
+        index = self.index
+        for match in self.regex.finditer(self.code):
+            if match.start() != pos:
+                # Hubo caracteres sin coincidencia: error léxico.
+                self.line_num, self.column_num = index.position(pos)
                 raise Exception(f"Error léxico en línea {self.line_num}, columna {self.column_num}")
 
             # Nombre del grupo que coincide (p.e. IF, ELSE, IDENT, etc.)
             token_type = match.lastgroup
-            # Lexema del token
-            token_value = match.group(token_type)
+            end_pos = match.end()
 
             if token_type == 'COMMENT':
-                # Ignoramos comentarios, pero actualizamos la línea y columna si hay saltos de línea
+                # Ignoramos comentarios
                 pass  
             elif token_type == 'SKIP':
                 # Espacios o tabulaciones (se ignoran)
                 pass
             elif token_type == 'MISMATCH':
                 # Carácter o secuencia no válida
-                raise Exception(f"Caracter inesperado '{token_value}' "
+                self.line_num, self.column_num = index.position(pos)
+                raise Exception(f"Caracter inesperado '{match.group()}' "
                                 f"en línea {self.line_num}, columna {self.column_num}")
             else:
-                # Creamos un token válido
-                tokens.append(Token(token_type, token_value, self.line_num, self.column_num))
+                yield token_type, pos, end_pos
 
             # Avanzamos la posición al final de la coincidencia
-            end_pos = match.end()
-            consumed_len = end_pos - pos
-            self.column_num += consumed_len
-
-            # Contamos los saltos de línea para actualizar línea/columna
-            for c in self.code[pos:end_pos]:
-                if c == '\n':
-                    self.line_num += 1
-                    self.column_num = 1
-
             pos = end_pos
+
+        if pos < len(self.code):
+            self.line_num, self.column_num = index.position(pos)
+            raise Exception(f"Error léxico en línea {self.line_num}, columna {self.column_num}")
         
+        self.line_num, self.column_num = index.position(pos)
+
+    def tokenize(self):
+        """
+        Convierte el código fuente en una lista de objetos Token.
+        Lanza excepciones en caso de errores léxicos.
+
+        Los tokens solo guardan su desplazamiento; la línea y la columna
+        se resuelven con self.index cuando se consultan.
+        """
+        return list(self.iter_tokens())
+
+    def iter_tokens(self):
+        """
+        Genera los Token uno por uno, a medida que se piden, para que el
+        parser no espere a que termine el análisis léxico.
+        """
+        code = self.code
+        index = self.index
+        for token_type, start, end in self.scan():
+            yield Token(token_type, code[start:end], offset=start, index=index)
+
+    def tokenize_stream(self):
+        """
+        Igual que tokenize(), pero devuelve un TokenStream: columnas de
+        enteros en vez de un objeto Token por token.
+        """
+        tokens = TokenStream(self.code, Token)
+        add = tokens.add
+        position = self.index.position
+        for token_type, start, end in self.scan():
+            line, column = position(start)
+            add(token_type, start, end, line, column)
         return tokens
 
 
+def tokenize_shard(code, first_line=1):
+    """Tokeniza un fragmento que empieza en la línea `first_line`."""
+    return Lexer(code, first_line).tokenize_stream()
+
+
+def tokenize_parallel_stream(code, workers=None, min_shard_size=MIN_SHARD_SIZE):
+    """
+    Igual que Lexer(code).tokenize_stream(), repartiendo el trabajo entre
+    `workers` procesos, con fragmentos de al menos `min_shard_size`
+    caracteres. No hay token de fin, así que a los fragmentos no se les
+    dice cuál es el último. Los tokens no cruzan líneas (los comentarios son
+    de una sola línea), así que cualquier salto de línea es un corte seguro.
+    """
+    return tokenize_parallel(code, tokenize_shard, workers, min_shard_size=min_shard_size)
+
+
+def scan_from(code, pos, line, line_start):
+    """
+    Genera (tipo, inicio, fin, línea, columna) desde `pos`, el inicio de
+    un token en la línea `line` que empieza en `line_start`.
+    Lanza excepciones en caso de errores léxicos, como Lexer.scan().
+    """
+    for match in COMPILED_REGEX.finditer(code, pos):
+        if match.start() != pos:
+            raise Exception(f"Error léxico en línea {line}, columna {pos - line_start + 1}")
+        token_type = match.lastgroup
+        end_pos = match.end()
+        if token_type == 'SKIP':
+            newline = code.rfind('\n', pos, end_pos)
+            if newline >= 0:
+                line += code.count('\n', pos, end_pos)
+                line_start = newline + 1
+        elif token_type == 'MISMATCH':
+            raise Exception(f"Caracter inesperado '{match.group()}' "
+                            f"en línea {line}, columna {pos - line_start + 1}")
+        elif token_type != 'COMMENT':
+            yield token_type, pos, end_pos, line, pos - line_start + 1
+        pos = end_pos
+    if pos < len(code):
+        raise Exception(f"Error léxico en línea {line}, columna {pos - line_start + 1}")
+
+
+def relex(tokens, edit_offset, deleted_len, inserted_text, first_line=1):
+    """
+    Actualiza el TokenStream de Lexer.tokenize_stream() tras una edición
+    del código: reemplazar `deleted_len` caracteres en `edit_offset` por
+    `inserted_text`. Solo se vuelve a analizar alrededor de la edición
+    (ver incremental_lexer.relex).
+    """
+    return _relex(tokens, edit_offset, deleted_len, inserted_text, scan_from,
+                  first_line=first_line)
+
+
 if __name__ == '__main__':
     # Ejemplo de uso
     code_example = r"""
@@ -1,8 +1,20 @@
+import os
+import sys
+
+# Los módulos que comparten las etapas están en ../comun
+_RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _RAIZ not in sys.path:
+    sys.path.append(_RAIZ)
+
+from comun.token_buffer import TokenBuffer
+
 class Parser:
     def __init__(self, tokens):
-        self.tokens = tokens
+        # Lista o iterable de tokens (p. ej. Lexer.iter_tokens()); se piden
+        # a medida que se necesitan, así un error detiene también al lexer
+        self.tokens = TokenBuffer(tokens)
         self.pos = 0
-        self.current_token = self.tokens[self.pos] if self.tokens else None
+        self.current_token = self.tokens.peek()
 
     def error(self, msg=None):
         token_info = (
@@ -18,7 +30,7 @@ class Parser:
         """Verifica que el token actual sea del tipo esperado y avanza."""
         if self.current_token and self.current_token.type == token_type:
             self.pos += 1
-            self.current_token = self.tokens[self.pos] if self.pos < len(self.tokens) else None
+            self.current_token = self.tokens.advance()
         else:
             self.error(f"Se esperaba '{token_type}'")
 
@@ -4,12 +4,37 @@ import re
 class Token:
     """
     Representa un token individual.
+
+    La línea y la columna pueden darse directamente o, si se pasa el
+    desplazamiento `offset` y un SourceIndex, calcularse la primera vez
+    que se consultan.
     """
-    def __init__(self, type_, value, line, column):
+    __slots__ = ('type', 'value', 'offset', 'index', '_line', '_column')
+
+    def __init__(self, type_, value, line=None, column=None, offset=None, index=None):
         self.type = type_    # tipo de token, por ejemplo 'IF', 'INT_LIT', 'IDENT', etc.
         self.value = value   # el lexema (texto) original del token
-        self.line = line     # número de línea donde aparece el token
-        self.column = column # número de columna donde aparece el token
+        self.offset = offset # desplazamiento del token en el código fuente
+        self.index = index   # SourceIndex para resolver línea y columna
+        self._line = line
+        self._column = column
+
+    def _resolve(self):
+        self._line, self._column = self.index.position(self.offset)
+
+    @property
+    def line(self):
+        """Número de línea donde aparece el token."""
+        if self._line is None:
+            self._resolve()
+        return self._line
+
+    @property
+    def column(self):
+        """Número de columna donde aparece el token."""
+        if self._column is None:
+            self._resolve()
+        return self._column
 
     def __repr__(self):
         return f"Token({self.type}, '{self.value}', {self.line}, {self.column})"
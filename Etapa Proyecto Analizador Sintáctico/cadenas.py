@@ -1,33 +1,136 @@
+import argparse
 import re
+import sys
+from collections import deque
+
+CLASES = ('int', 'float', 'id', 'error')
+
+# Un solo patrón con un grupo por clase, en el orden en que se probaban:
+# fullmatch prueba las alternativas hasta que alguna cubre todo el elemento
+PATRON = re.compile(r"(?P<int>[+-]?\d+)"
+                    r"|(?P<float>[+-]?(?:\d+\.\d*|\.\d+))"
+                    r"|(?P<id>[a-zA-Z_]\w*)")
+
+def clasificar(elemento):
+    # Devuelve la clase del elemento: int, float, id o error
+    coincidencia = PATRON.fullmatch(elemento)
+    return coincidencia.lastgroup if coincidencia else 'error'
 
 def identificar_elemento(elemento):
     # Quitar espacios en blanco al inicio y al final
     elemento = elemento.strip()
-    
-    # Verificar si es un entero
-    if re.fullmatch(r"[+-]?\d+", elemento):
-        return f"{elemento}: int"
-    
-    # Verificar si es un número flotante válido
-    elif re.fullmatch(r"[+-]?(\d+\.\d*|\.\d+)", elemento):
-        return f"{elemento}: float"
-    
-    # Verificar si es un identificador válido
-    elif re.fullmatch(r"[a-zA-Z_]\w*", elemento):
-        return f"{elemento}: id"
-    
-    # Si no cumple con ninguno de los anteriores, es un error
-    else:
-        return f"{elemento}: error"
+    return f"{elemento}: {clasificar(elemento)}"
 
 def procesar_entrada(entrada):
-    # Dividir la entrada en elementos separados por comas
+    # Dividir la entrada en elementos separados por espacios
     elementos = entrada.split(" ")
     # Evaluar cada elemento y devolver el resultado
     resultados = [identificar_elemento(elemento) for elemento in elementos]
     return "\n".join(resultados)
 
-# Solicitar la entrada al usuario
-entrada = input("Introduce los valores separados por espacios: ")
-print(procesar_entrada(entrada))
+def clasificar_bloque(bloque):
+    # Clasifica los elementos de un bloque (separados por cualquier espacio);
+    # devuelve el texto de salida y la cantidad por clase
+    fullmatch = PATRON.fullmatch
+    conteos = dict.fromkeys(CLASES, 0)
+    lineas = []
+    for elemento in bloque.split():
+        coincidencia = fullmatch(elemento)
+        clase = coincidencia.lastgroup if coincidencia else 'error'
+        conteos[clase] += 1
+        lineas.append(f"{elemento}: {clase}\n")
+    return "".join(lineas), conteos
+
+def leer_bloques(archivos, tamano):
+    # Lee los archivos por bloques de unos `tamano` caracteres, cortando
+    # después de un espacio para no partir ningún elemento
+    for archivo in archivos:
+        resto = ""
+        while True:
+            bloque = archivo.read(tamano)
+            if not bloque:
+                break
+            bloque = resto + bloque
+            corte = len(bloque)
+            while corte and not bloque[corte - 1].isspace():
+                corte -= 1
+            if corte == 0:
+                # Un solo elemento más largo que el bloque: seguir leyendo
+                resto = bloque
+                continue
+            resto = bloque[corte:]
+            yield bloque[:corte]
+        if resto:
+            yield resto
+
+def clasificar_flujo(bloques, salida, procesos=1):
+    # Escribe la clasificación de cada bloque en orden, a medida que se
+    # obtiene, y devuelve los conteos totales. Con varios procesos se
+    # mantienen a lo sumo 2 bloques por proceso en vuelo.
+    totales = dict.fromkeys(CLASES, 0)
+
+    def escribir(resultado):
+        texto, conteos = resultado
+        salida.write(texto)
+        for clase, cantidad in conteos.items():
+            totales[clase] += cantidad
+
+    if procesos <= 1:
+        for bloque in bloques:
+            escribir(clasificar_bloque(bloque))
+        return totales
+
+    from concurrent.futures import ProcessPoolExecutor
+    with ProcessPoolExecutor(max_workers=procesos) as pool:
+        pendientes = deque()
+        for bloque in bloques:
+            pendientes.append(pool.submit(clasificar_bloque, bloque))
+            if len(pendientes) >= 2 * procesos:
+                escribir(pendientes.popleft().result())
+        while pendientes:
+            escribir(pendientes.popleft().result())
+    return totales
+
+def tamano_bloque(texto):
+    # '1M', '256K' o un número de caracteres (1K = 1000, como en benchmarks/corpus.py)
+    texto = texto.strip().upper()
+    for sufijo, factor in (('K', 10 ** 3), ('M', 10 ** 6), ('G', 10 ** 9)):
+        if texto.endswith(sufijo):
+            return int(float(texto[:-1]) * factor)
+    return int(texto)
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Clasifica elementos separados por espacios como int, float, id o error.")
+    parser.add_argument('archivos', nargs='*',
+                        help="archivos a clasificar ('-' o ninguno: entrada estándar)")
+    parser.add_argument('-j', '--procesos', type=int, default=1,
+                        help="procesos para clasificar bloques en paralelo")
+    parser.add_argument('--bloque', type=tamano_bloque, default=tamano_bloque('1M'),
+                        help="caracteres por bloque leído (por defecto 1M)")
+    args = parser.parse_args()
+
+    if not args.archivos and sys.stdin.isatty():
+        # Uso interactivo: una sola línea
+        entrada = input("Introduce los valores separados por espacios: ")
+        print(procesar_entrada(entrada))
+        return
+
+    abiertos = [sys.stdin if nombre == '-' else open(nombre, encoding='utf-8')
+                for nombre in args.archivos or ['-']]
+    try:
+        totales = clasificar_flujo(leer_bloques(abiertos, args.bloque), sys.stdout, args.procesos)
+    finally:
+        for archivo in abiertos:
+            if archivo is not sys.stdin:
+                archivo.close()
+    sys.stdout.flush()
+
+    # El resumen va a stderr para no mezclarse con la clasificación
+    total = sum(totales.values())
+    for clase in CLASES:
+        print(f"{clase}: {totales[clase]}", file=sys.stderr)
+    print(f"total: {total}", file=sys.stderr)
 
+if __name__ == '__main__':
+    main()
@@ -1,22 +1,86 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 
+import os
 import re
-from tabulate import tabulate  # Para generar tablas bonitas en la salida
+import sys
+
+# Los módulos que comparten las etapas están en ../comun
+_RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _RAIZ not in sys.path:
+    sys.path.append(_RAIZ)
+
+from comun.name_table import NameTable
+from comun.token_buffer import TokenBuffer
+from comun.token_stream import TokenStream
 
 class Token:
-    def __init__(self, tipo, valor, linea, columna):
+    def __init__(self, tipo, valor, linea, columna, nombre_id=None):
         self.tipo = tipo
         self.valor = valor
         self.linea = linea
         self.columna = columna
+        # Id del nombre en la NameTable del lexer (solo los ID)
+        self.nombre_id = nombre_id
     
     def __str__(self):
         return f"Token({self.tipo}, '{self.valor}', {self.linea}, {self.columna})"
 
+# Operadores y puntuación
+OPERADORES = {
+    '+': 'OP_SUMA',
+    '-': 'OP_RESTA',
+    '*': 'OP_MULT',
+    '/': 'OP_DIV',
+    '=': 'OP_ASIG',
+    '==': 'OP_IGUAL',
+    '!=': 'OP_DIFERENTE',
+    '<': 'OP_MENOR',
+    '>': 'OP_MAYOR',
+    '<=': 'OP_MENOR_IGUAL',
+    '>=': 'OP_MAYOR_IGUAL',
+    '(': 'PARENTESIS_IZQ',
+    ')': 'PARENTESIS_DER',
+    '{': 'LLAVE_IZQ',
+    '}': 'LLAVE_DER',
+    '[': 'CORCHETE_IZQ',
+    ']': 'CORCHETE_DER',
+    ';': 'PUNTO_COMA',
+    ',': 'COMA'
+}
+
+# Clases de caracteres del lexer
+ESPACIO, BARRA, LETRA, DIGITO, COMILLA, OPERADOR, OTRO = range(7)
+
+def clase_caracter(caracter):
+    """Clase de un carácter, con las mismas pruebas que usaba el lexer."""
+    if caracter.isspace():
+        return ESPACIO
+    if caracter == '/':
+        return BARRA
+    if caracter.isalpha() or caracter == '_':
+        return LETRA
+    if caracter.isdigit():
+        return DIGITO
+    if caracter == "'":
+        return COMILLA
+    if caracter in OPERADORES or caracter == '!':
+        return OPERADOR
+    return OTRO
+
+# Tabla precalculada para ASCII; el resto usa clase_caracter()
+CLASES_ASCII = [clase_caracter(chr(i)) for i in range(128)]
+
+# \s y \w de `re` equivalen a str.isspace() y a (str.isalnum() o '_')
+ESPACIOS_RE = re.compile(r'\s+')
+PALABRA_RE = re.compile(r'\w*')
+NUMERO_ASCII_RE = re.compile(r'[0-9]+(?:\.[0-9]+)?')
+
 class AnalizadorLexico:
-    def __init__(self, codigo_fuente):
+    def __init__(self, codigo_fuente, nombres=None):
         self.codigo_fuente = codigo_fuente
+        # Tabla de nombres de la compilación; los identificadores se internan aquí
+        self.nombres = nombres if nombres is not None else NameTable()
         self.posicion = 0
         self.linea = 1
         self.columna = 1
@@ -33,172 +97,176 @@ class AnalizadorLexico:
             'return': 'RETURN'
         }
     
-    def analizar(self):
-        while self.posicion < len(self.codigo_fuente):
-            caracter = self.codigo_fuente[self.posicion]
-            
-            # Ignorar espacios en blanco
-            if caracter.isspace():
-                if caracter == '\n':
-                    self.linea += 1
-                    self.columna = 1
-                else:
-                    self.columna += 1
-                self.posicion += 1
-                continue
+    def analizar(self, flujo=False):
+        """
+        Devuelve la lista de tokens o, con flujo=True, un TokenStream que
+        guarda los tokens por columnas y crea cada Token al accederlo.
+        """
+        if flujo:
+            tokens = self.tokens = TokenStream(self.codigo_fuente, Token)
+            agregar = tokens.add
+            for token in self._escanear(internar=False):
+                agregar(*token)
+            return tokens
+        self.tokens.extend(self.iterar())
+        return self.tokens
+
+    def iterar(self):
+        """
+        Genera los tokens uno por uno, a medida que se piden, para que el
+        parser no espere a que termine el análisis léxico.
+        """
+        codigo = self.codigo_fuente
+        nombres = self.nombres.names
+        for tipo, inicio, fin, linea, columna, valor in self._escanear():
+            if tipo == 'ID':
+                yield Token(tipo, nombres[valor], linea, columna, valor)
+            else:
+                yield Token(tipo, codigo[inicio:fin] if valor is None else valor, linea, columna)
+
+    def _escanear(self, internar=True):
+        """
+        Genera (tipo, inicio, fin, línea, columna, valor) por token; valor es
+        None si el lexema es codigo[inicio:fin]. Los ID se internan siempre
+        en self.nombres; con internar=True su valor es el id del nombre.
+        """
+        codigo = self.codigo_fuente
+        longitud = len(codigo)
+        clases = CLASES_ASCII
+        reservadas = self.palabras_reservadas
+        internar_nombre = self.nombres.intern
+        posicion, linea, columna = self.posicion, self.linea, self.columna
+        while posicion < longitud:
+            caracter = codigo[posicion]
+            codigo_car = ord(caracter)
+            clase = clases[codigo_car] if codigo_car < 128 else clase_caracter(caracter)
             
-            # Comentarios
-            if caracter == '/' and self.posicion + 1 < len(self.codigo_fuente):
-                if self.codigo_fuente[self.posicion + 1] == '/':
+            # Comentarios: se calcula hasta dónde llegan y se tratan como espacio
+            fin = -1
+            if clase == ESPACIO:
+                fin = ESPACIOS_RE.match(codigo, posicion).end()
+            elif clase == BARRA and posicion + 1 < longitud:
+                if codigo[posicion + 1] == '/':
                     # Comentario de línea
-                    self.posicion += 2
-                    self.columna += 2
-                    while (self.posicion < len(self.codigo_fuente) and 
-                           self.codigo_fuente[self.posicion] != '\n'):
-                        self.posicion += 1
-                        self.columna += 1
-                    continue
-                elif self.codigo_fuente[self.posicion + 1] == '*':
-                    # Comentario de bloque
-                    self.posicion += 2
-                    self.columna += 2
-                    while self.posicion + 1 < len(self.codigo_fuente):
-                        if (self.codigo_fuente[self.posicion] == '*' and 
-                            self.codigo_fuente[self.posicion + 1] == '/'):
-                            self.posicion += 2
-                            self.columna += 2
-                            break
-                        if self.codigo_fuente[self.posicion] == '\n':
-                            self.linea += 1
-                            self.columna = 1
-                        else:
-                            self.columna += 1
-                        self.posicion += 1
-                    continue
+                    fin = codigo.find('\n', posicion + 2)
+                    if fin < 0:
+                        fin = longitud
+                elif codigo[posicion + 1] == '*':
+                    # Comentario de bloque; sin cierre, se detiene antes del último carácter
+                    fin = codigo.find('*/', posicion + 2)
+                    fin = fin + 2 if fin >= 0 else max(posicion + 2, longitud - 1)
+            
+            # Ignorar espacios en blanco y comentarios
+            if fin >= 0:
+                saltos = codigo.count('\n', posicion, fin)
+                if saltos:
+                    linea += saltos
+                    columna = fin - codigo.rfind('\n', posicion, fin)
+                else:
+                    columna += fin - posicion
+                posicion = fin
+                continue
             
             # Identificadores y palabras reservadas
-            if caracter.isalpha() or caracter == '_':
-                inicio = self.posicion
-                col_inicio = self.columna
-                while (self.posicion < len(self.codigo_fuente) and 
-                       (self.codigo_fuente[self.posicion].isalnum() or 
-                        self.codigo_fuente[self.posicion] == '_')):
-                    self.posicion += 1
-                    self.columna += 1
-                
-                valor = self.codigo_fuente[inicio:self.posicion]
-                tipo = self.palabras_reservadas.get(valor, 'ID')
-                self.tokens.append(Token(tipo, valor, self.linea, col_inicio))
+            if clase == LETRA:
+                fin = PALABRA_RE.match(codigo, posicion + 1).end()
+                valor = codigo[posicion:fin]
+                tipo = reservadas.get(valor)
+                if tipo is None:
+                    tipo, valor = 'ID', internar_nombre(valor)
+                else:
+                    valor = None
+                yield tipo, posicion, fin, linea, columna, valor if internar else None
+                columna += fin - posicion
+                posicion = fin
                 continue
             
             # Números
-            if caracter.isdigit():
-                inicio = self.posicion
-                col_inicio = self.columna
+            if clase == DIGITO:
+                inicio = posicion
                 es_flotante = False
                 
-                while self.posicion < len(self.codigo_fuente):
-                    if (self.codigo_fuente[self.posicion] == '.' and 
-                        not es_flotante and 
-                        self.posicion + 1 < len(self.codigo_fuente) and 
-                        self.codigo_fuente[self.posicion + 1].isdigit()):
-                        es_flotante = True
-                        self.posicion += 1
-                        self.columna += 1
-                    elif self.codigo_fuente[self.posicion].isdigit():
-                        self.posicion += 1
-                        self.columna += 1
-                    else:
-                        break
+                numero = NUMERO_ASCII_RE.match(codigo, inicio)
+                fin = numero.end() if numero else inicio
+                if numero and (fin >= longitud or ord(codigo[fin]) < 128) and (
+                        fin + 1 >= longitud or ord(codigo[fin + 1]) < 128):
+                    # Caso común: solo dígitos ASCII alrededor del número
+                    es_flotante = '.' in numero.group()
+                    posicion = fin
+                else:
+                    # Dígitos Unicode (p. ej. '²'): mismas reglas que str.isdigit()
+                    while posicion < longitud:
+                        if (codigo[posicion] == '.' and 
+                            not es_flotante and 
+                            posicion + 1 < longitud and 
+                            codigo[posicion + 1].isdigit()):
+                            es_flotante = True
+                            posicion += 1
+                        elif codigo[posicion].isdigit():
+                            posicion += 1
+                        else:
+                            break
                 
-                valor = self.codigo_fuente[inicio:self.posicion]
                 tipo = 'NUM_FLOAT' if es_flotante else 'NUM_INT'
-                self.tokens.append(Token(tipo, valor, self.linea, col_inicio))
+                yield tipo, inicio, posicion, linea, columna, None
+                columna += posicion - inicio
                 continue
             
             # Caracteres
-            if caracter == "'":
-                inicio = self.posicion
-                col_inicio = self.columna
-                self.posicion += 1
-                self.columna += 1
+            if clase == COMILLA:
+                inicio = posicion
+                col_inicio = columna
+                posicion += 1
+                columna += 1
                 
                 # Manejo de escape
-                if (self.posicion < len(self.codigo_fuente) and 
-                    self.codigo_fuente[self.posicion] == '\\'):
-                    self.posicion += 2  # Saltar el carácter de escape y el siguiente
-                    self.columna += 2
-                elif self.posicion < len(self.codigo_fuente):
-                    self.posicion += 1
-                    self.columna += 1
+                if posicion < longitud and codigo[posicion] == '\\':
+                    posicion += 2  # Saltar el carácter de escape y el siguiente
+                    columna += 2
+                elif posicion < longitud:
+                    posicion += 1
+                    columna += 1
                 
                 # Cerrar comilla
-                if (self.posicion < len(self.codigo_fuente) and 
-                    self.codigo_fuente[self.posicion] == "'"):
-                    self.posicion += 1
-                    self.columna += 1
-                    valor = self.codigo_fuente[inicio:self.posicion]
-                    self.tokens.append(Token('CARACTER', valor, self.linea, col_inicio))
-                    continue
+                if posicion < longitud and codigo[posicion] == "'":
+                    posicion += 1
+                    columna += 1
+                    yield 'CARACTER', inicio, posicion, linea, col_inicio, None
                 else:
                     # Error: comilla sin cerrar
-                    self.tokens.append(Token('ERROR', 'Comilla sin cerrar', self.linea, col_inicio))
-                    continue
-            
-            # Operadores y puntuación
-            operadores = {
-                '+': 'OP_SUMA',
-                '-': 'OP_RESTA',
-                '*': 'OP_MULT',
-                '/': 'OP_DIV',
-                '=': 'OP_ASIG',
-                '==': 'OP_IGUAL',
-                '!=': 'OP_DIFERENTE',
-                '<': 'OP_MENOR',
-                '>': 'OP_MAYOR',
-                '<=': 'OP_MENOR_IGUAL',
-                '>=': 'OP_MAYOR_IGUAL',
-                '(': 'PARENTESIS_IZQ',
-                ')': 'PARENTESIS_DER',
-                '{': 'LLAVE_IZQ',
-                '}': 'LLAVE_DER',
-                '[': 'CORCHETE_IZQ',
-                ']': 'CORCHETE_DER',
-                ';': 'PUNTO_COMA',
-                ',': 'COMA'
-            }
+                    yield 'ERROR', inicio, posicion, linea, col_inicio, 'Comilla sin cerrar'
+                continue
             
             # Operadores dobles
-            if (caracter in ['=', '!', '<', '>'] and 
-                self.posicion + 1 < len(self.codigo_fuente) and 
-                self.codigo_fuente[self.posicion:self.posicion + 2] in operadores):
-                valor = self.codigo_fuente[self.posicion:self.posicion + 2]
-                self.tokens.append(Token(operadores[valor], valor, self.linea, self.columna))
-                self.posicion += 2
-                self.columna += 2
+            if (caracter in '=!<>' and 
+                posicion + 1 < longitud and 
+                codigo[posicion:posicion + 2] in OPERADORES):
+                yield OPERADORES[codigo[posicion:posicion + 2]], posicion, posicion + 2, linea, columna, None
+                posicion += 2
+                columna += 2
                 continue
             
             # Operadores simples
-            if caracter in operadores:
-                self.tokens.append(Token(operadores[caracter], caracter, self.linea, self.columna))
-                self.posicion += 1
-                self.columna += 1
-                continue
-            
-            # Caracteres no reconocidos
-            self.tokens.append(Token('ERROR', caracter, self.linea, self.columna))
-            self.posicion += 1
-            self.columna += 1
+            if caracter in OPERADORES:
+                yield OPERADORES[caracter], posicion, posicion + 1, linea, columna, None
+            else:
+                # Caracteres no reconocidos
+                yield 'ERROR', posicion, posicion + 1, linea, columna, None
+            posicion += 1
+            columna += 1
+        
+        self.posicion, self.linea, self.columna = posicion, linea, columna
         
         # Agregar token de fin de archivo
-        self.tokens.append(Token('EOF', '', self.linea, self.columna))
-        return self.tokens
+        yield 'EOF', posicion, posicion, linea, columna, None
 
 class NodoAST:
-    def __init__(self, tipo, valor=None, hijos=None):
+    def __init__(self, tipo, valor=None, hijos=None, nombre_id=None):
         self.tipo = tipo
         self.valor = valor
         self.hijos = hijos if hijos is not None else []
+        # Nodos con un identificador: id del nombre en la NameTable
+        self.nombre_id = nombre_id
     
     def agregar_hijo(self, hijo):
         self.hijos.append(hijo)
@@ -208,9 +276,10 @@ class NodoAST:
 
 class AnalizadorSintactico:
     def __init__(self, tokens):
-        self.tokens = tokens
+        # Lista o iterable de tokens; se piden al lexer a medida que se necesitan
+        self.tokens = TokenBuffer(tokens)
         self.posicion = 0
-        self.token_actual = self.tokens[0]
+        self.token_actual = self.tokens.peek()
         # Para el registro de la pila
         self.pila = []
         self.registro_pila = []
@@ -218,8 +287,9 @@ class AnalizadorSintactico:
     
     def avanzar(self):
         self.posicion += 1
-        if self.posicion < len(self.tokens):
-            self.token_actual = self.tokens[self.posicion]
+        siguiente = self.tokens.advance()
+        if siguiente is not None:
+            self.token_actual = siguiente
         return self.token_actual
     
     def emparejar(self, tipo_esperado):
@@ -340,7 +410,7 @@ class AnalizadorSintactico:
                     self.emparejar('PARENTESIS_DER')
                     bloque_func = self.bloque()
                     
-                    nodo = NodoAST('funcion', id_token.valor)
+                    nodo = NodoAST('funcion', id_token.valor, nombre_id=id_token.nombre_id)
                     nodo.agregar_hijo(NodoAST('tipo', tipo.valor))
                     nodo.agregar_hijo(NodoAST('parametros', hijos=params))
                     nodo.agregar_hijo(bloque_func)
@@ -351,7 +421,7 @@ class AnalizadorSintactico:
                     self.emparejar('PUNTO_COMA')
                     nodo = NodoAST('declaracion_variable')
                     nodo.agregar_hijo(NodoAST('tipo', tipo.valor))
-                    nodo.agregar_hijo(NodoAST('id', id_token.valor))
+                    nodo.agregar_hijo(NodoAST('id', id_token.valor, nombre_id=id_token.nombre_id))
                     return nodo
             
             else:
@@ -373,7 +443,7 @@ class AnalizadorSintactico:
             
             param = NodoAST('parametro')
             param.agregar_hijo(NodoAST('tipo', tipo.valor))
-            param.agregar_hijo(NodoAST('id', id_token.valor))
+            param.agregar_hijo(NodoAST('id', id_token.valor, nombre_id=id_token.nombre_id))
             params.append(param)
             
             while self.token_actual.tipo == 'COMA':
@@ -383,7 +453,7 @@ class AnalizadorSintactico:
                 
                 param = NodoAST('parametro')
                 param.agregar_hijo(NodoAST('tipo', tipo.valor))
-                param.agregar_hijo(NodoAST('id', id_token.valor))
+                param.agregar_hijo(NodoAST('id', id_token.valor, nombre_id=id_token.nombre_id))
                 params.append(param)
         
         return params
@@ -424,7 +494,7 @@ class AnalizadorSintactico:
         if self.token_actual.tipo == 'TIPO_DATO':
             return self.declaracion_local()
         elif self.token_actual.tipo == 'ID':
-            if self.tokens[self.posicion + 1].tipo == 'OP_ASIG':
+            if self.tokens.peek(1).tipo == 'OP_ASIG':
                 return self.asignacion()
             else:
                 return self.llamada_funcion()
@@ -447,7 +517,7 @@ class AnalizadorSintactico:
         
         nodo = NodoAST('declaracion_local')
         nodo.agregar_hijo(NodoAST('tipo', tipo.valor))
-        nodo.agregar_hijo(NodoAST('id', id_token.valor))
+        nodo.agregar_hijo(NodoAST('id', id_token.valor, nombre_id=id_token.nombre_id))
         return nodo
     
     def asignacion(self):
@@ -460,7 +530,7 @@ class AnalizadorSintactico:
         self.emparejar('PUNTO_COMA')
         
         nodo = NodoAST('asignacion')
-        nodo.agregar_hijo(NodoAST('id', id_token.valor))
+        nodo.agregar_hijo(NodoAST('id', id_token.valor, nombre_id=id_token.nombre_id))
         nodo.agregar_hijo(expr)
         return nodo
     
@@ -474,7 +544,7 @@ class AnalizadorSintactico:
         self.emparejar('PARENTESIS_DER')
         self.emparejar('PUNTO_COMA')
         
-        nodo = NodoAST('llamada_funcion', id_token.valor)
+        nodo = NodoAST('llamada_funcion', id_token.valor, nombre_id=id_token.nombre_id)
         nodo.agregar_hijo(NodoAST('argumentos', hijos=args))
         return nodo
     
@@ -598,11 +668,12 @@ class AnalizadorSintactico:
         """
         if self.token_actual.tipo == 'ID':
             # Verificar si es una llamada a función
-            if self.posicion + 1 < len(self.tokens) and self.tokens[self.posicion + 1].tipo == 'PARENTESIS_IZQ':
+            siguiente = self.tokens.peek(1)
+            if siguiente is not None and siguiente.tipo == 'PARENTESIS_IZQ':
                 return self.llamada_funcion_expr()
             else:
                 id_token = self.emparejar('ID')
-                return NodoAST('id', id_token.valor)
+                return NodoAST('id', id_token.valor, nombre_id=id_token.nombre_id)
         
         elif self.token_actual.tipo == 'NUM_INT':
             num = self.emparejar('NUM_INT')
@@ -634,7 +705,7 @@ class AnalizadorSintactico:
         args = self.argumentos()
         self.emparejar('PARENTESIS_DER')
         
-        nodo = NodoAST('llamada_funcion_expr', id_token.valor)
+        nodo = NodoAST('llamada_funcion_expr', id_token.valor, nombre_id=id_token.nombre_id)
         nodo.agregar_hijo(NodoAST('argumentos', hijos=args))
         return nodo
     
@@ -648,10 +719,12 @@ class AnalizadorSintactico:
             return None, self.registro_pila
 
 class TablaSimbolo:
-    def __init__(self):
+    def __init__(self, nombres=None):
         self.tabla = {}
         self.nivel_actual = 0
         self.ambitos = [{}]  # Pila de ámbitos
+        # tabla y ámbitos usan como clave el id del nombre en la NameTable
+        self.nombres = nombres if nombres is not None else NameTable()
     
     def entrar_ambito(self):
         self.nivel_actual += 1
@@ -662,38 +735,41 @@ class TablaSimbolo:
             self.ambitos.pop()
             self.nivel_actual -= 1
     
-    def insertar(self, nombre, tipo, categoria="variable", valor=None):
-        # Insertar en el ámbito actual
+    def insertar(self, nombre_id, tipo, categoria="variable", valor=None):
+        # Insertar en el ámbito actual; nombre_id es el id que el lexer dejó en el token
         simbolo = {
-            "nombre": nombre,
+            "nombre": self.nombres.names[nombre_id],
             "tipo": tipo,
             "categoria": categoria,
             "ambito": self.nivel_actual,
             "valor": valor
         }
         
-        self.ambitos[self.nivel_actual][nombre] = simbolo
-        self.tabla[nombre] = simbolo
+        self.ambitos[self.nivel_actual][nombre_id] = simbolo
+        self.tabla[nombre_id] = simbolo
         return simbolo
     
-    def buscar(self, nombre):
+    def buscar(self, nombre_id):
         # Buscar en todos los ámbitos, empezando por el actual
-        for nivel in range(self.nivel_actual, -1, -1):
-            if nombre in self.ambitos[nivel]:
-                return self.ambitos[nivel][nombre]
+        for ambito in reversed(self.ambitos):
+            simbolo = ambito.get(nombre_id)
+            if simbolo is not None:
+                return simbolo
         return None
     
-    def actualizar(self, nombre, valor):
-        simbolo = self.buscar(nombre)
+    def actualizar(self, nombre_id, valor):
+        simbolo = self.buscar(nombre_id)
         if simbolo:
             simbolo["valor"] = valor
             return True
         return False
 
 class AnalizadorSemantico:
-    def __init__(self, ast):
+    def __init__(self, ast, nombres=None):
         self.ast = ast
-        self.tabla_simbolos = TablaSimbolo()
+        self.tabla_simbolos = TablaSimbolo(nombres)
+        # 'main' es palabra reservada: no trae id del lexer
+        self.id_main = self.tabla_simbolos.nombres.intern('main')
         self.errores = []
         # Registro de operaciones semánticas
         self.registro_operaciones = []
@@ -724,7 +800,7 @@ class AnalizadorSemantico:
         elif nodo.tipo == 'funcion_main':
             # Registrar la función main
             self.registrar_operacion("Declaración de función", f"main: {nodo.valor}")
-            self.tabla_simbolos.insertar('main', nodo.valor, 'funcion')
+            self.tabla_simbolos.insertar(self.id_main, nodo.valor, 'funcion')
             
             # Entrar en el ámbito de la función
             self.tabla_simbolos.entrar_ambito()
@@ -742,7 +818,7 @@ class AnalizadorSemantico:
         
         elif nodo.tipo == 'funcion':
             # Verificar que no exista otra función con el mismo nombre
-            if self.tabla_simbolos.buscar(nodo.valor):
+            if self.tabla_simbolos.buscar(nodo.nombre_id):
                 self.errores.append(f"Error semántico: La función '{nodo.valor}' ya está definida")
                 self.registrar_operacion("Error", f"La función '{nodo.valor}' ya está definida")
             return
@@ -750,7 +826,7 @@ class AnalizadorSemantico:
             # Registrar la función
             tipo = nodo.hijos[0].valor
             self.registrar_operacion("Declaración de función", f"{nodo.valor}: {tipo}")
-            self.tabla_simbolos.insertar(nodo.valor, tipo, 'funcion')
+            self.tabla_simbolos.insertar(nodo.nombre_id, tipo, 'funcion')
             
             # Entrar en el ámbito de la función
             self.tabla_simbolos.entrar_ambito()
@@ -774,12 +850,12 @@ class AnalizadorSemantico:
             
             if tipo_nodo and id_nodo:
                 # Verificar que no exista otro parámetro con el mismo nombre
-                if self.tabla_simbolos.buscar(id_nodo.valor):
+                if self.tabla_simbolos.buscar(id_nodo.nombre_id):
                     self.errores.append(f"Error semántico: El parámetro '{id_nodo.valor}' ya está definido")
                     self.registrar_operacion("Error", f"El parámetro '{id_nodo.valor}' ya está definido")
                 else:
                     self.registrar_operacion("Declaración de parámetro", f"{id_nodo.valor}: {tipo_nodo.valor}")
-                    self.tabla_simbolos.insertar(id_nodo.valor, tipo_nodo.valor, 'parametro')
+                    self.tabla_simbolos.insertar(id_nodo.nombre_id, tipo_nodo.valor, 'parametro')
         
         elif nodo.tipo == 'bloque':
             for sentencia in nodo.hijos:
@@ -797,20 +873,20 @@ class AnalizadorSemantico:
             
             if tipo_nodo and id_nodo:
                 # Verificar que no exista otra variable con el mismo nombre en el ámbito actual
-                simbolo = self.tabla_simbolos.buscar(id_nodo.valor)
+                simbolo = self.tabla_simbolos.buscar(id_nodo.nombre_id)
                 if simbolo and simbolo['ambito'] == self.tabla_simbolos.nivel_actual:
                     self.errores.append(f"Error semántico: La variable '{id_nodo.valor}' ya está definida en este ámbito")
                     self.registrar_operacion("Error", f"La variable '{id_nodo.valor}' ya está definida en este ámbito")
                 else:
                     self.registrar_operacion("Declaración de variable", f"{id_nodo.valor}: {tipo_nodo.valor}")
-                    self.tabla_simbolos.insertar(id_nodo.valor, tipo_nodo.valor, 'variable')
+                    self.tabla_simbolos.insertar(id_nodo.nombre_id, tipo_nodo.valor, 'variable')
         
         elif nodo.tipo == 'asignacion':
             id_nodo = nodo.hijos[0]
             expr_nodo = nodo.hijos[1]
             
             # Verificar que la variable esté definida
-            simbolo = self.tabla_simbolos.buscar(id_nodo.valor)
+            simbolo = self.tabla_simbolos.buscar(id_nodo.nombre_id)
             if not simbolo:
                 self.errores.append(f"Error semántico: La variable '{id_nodo.valor}' no está definida")
                 self.registrar_operacion("Error", f"La variable '{id_nodo.valor}' no está definida")
@@ -828,7 +904,7 @@ class AnalizadorSemantico:
         
         elif nodo.tipo == 'llamada_funcion' or nodo.tipo == 'llamada_funcion_expr':
             # Verificar que la función esté definida
-            simbolo = self.tabla_simbolos.buscar(nodo.valor)
+            simbolo = self.tabla_simbolos.buscar(nodo.nombre_id)
             if not simbolo or simbolo['categoria'] != 'funcion':
                 self.errores.append(f"Error semántico: La función '{nodo.valor}' no está definida")
                 self.registrar_operacion("Error", f"La función '{nodo.valor}' no está definida")
@@ -894,7 +970,7 @@ class AnalizadorSemantico:
         
         elif nodo.tipo == 'id':
             # Verificar que la variable esté definida
-            simbolo = self.tabla_simbolos.buscar(nodo.valor)
+            simbolo = self.tabla_simbolos.buscar(nodo.nombre_id)
             if not simbolo:
                 self.errores.append(f"Error semántico: La variable '{nodo.valor}' no está definida")
                 self.registrar_operacion("Error", f"La variable '{nodo.valor}' no está definida")
@@ -904,7 +980,7 @@ class AnalizadorSemantico:
     def inferir_tipo(self, nodo):
         """Infiere el tipo de una expresión"""
         if nodo.tipo == 'id':
-            simbolo = self.tabla_simbolos.buscar(nodo.valor)
+            simbolo = self.tabla_simbolos.buscar(nodo.nombre_id)
             if simbolo:
                 return simbolo['tipo']
             return None
@@ -931,7 +1007,7 @@ class AnalizadorSemantico:
             return None
         
         elif nodo.tipo == 'llamada_funcion_expr':
-            simbolo = self.tabla_simbolos.buscar(nodo.valor)
+            simbolo = self.tabla_simbolos.buscar(nodo.nombre_id)
             if simbolo and simbolo['categoria'] == 'funcion':
                 return simbolo['tipo']
             return None
@@ -940,6 +1016,9 @@ class AnalizadorSemantico:
 
 def mostrar_tabla_registros(registros, titulo):
     """Muestra una tabla bonita con los registros"""
+    # tabulate se importa aquí: es lo más lento de cargar y solo se usa
+    # al imprimir una tabla
+    from tabulate import tabulate
     if registros:
         encabezados = registros[0].keys()
         tabla = [[registro[key] for key in encabezados] for registro in registros]
@@ -952,15 +1031,17 @@ def compilar(codigo_fuente):
     """Realiza todo el proceso de compilación"""
     # Análisis léxico
     lexico = AnalizadorLexico(codigo_fuente)
-    tokens = lexico.analizar()
     
-    # Mostrar tokens
+    # Mostrar tokens a medida que el parser los pide: con un error de
+    # sintaxis no se analiza (ni se muestra) el resto del código
+    def mostrar(tokens):
+        for token in tokens:
+            print(token)
+            yield token
     print("\nTokens generados:")
-    for token in tokens:
-        print(token)
     
     # Análisis sintáctico
-    sintactico = AnalizadorSintactico(tokens)
+    sintactico = AnalizadorSintactico(mostrar(lexico.iterar()))
     ast, registro_pila = sintactico.analizar()
     
     # Mostrar registro de la pila
@@ -971,7 +1052,7 @@ def compilar(codigo_fuente):
         return False
     
     # Análisis semántico
-    semantico = AnalizadorSemantico(ast)
+    semantico = AnalizadorSemantico(ast, lexico.nombres)
     resultado, errores, registro_operaciones = semantico.analizar()
     
     # Mostrar registro de operaciones semánticas
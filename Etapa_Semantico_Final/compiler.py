@@ -1,22 +1,58 @@
 import csv
+import os
 import re
+import sys
+
+# Los módulos que comparten las etapas están en ../comun
+_RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _RAIZ not in sys.path:
+    sys.path.append(_RAIZ)
+
+from comun.dfa_lexer import compile_spec
+from comun.name_table import NameTable
+from comun.source_index import SourceIndex
+from comun.token_buffer import TokenBuffer
+from comun.token_stream import TokenStream
 
 
 class Token:
-    def __init__(self, type, value, line=0, column=0):
+    def __init__(self, type, value, line=0, column=0, offset=None, index=None, name_id=None):
         self.type = type
         self.value = value
-        self.line = line
-        self.column = column
+        # Id of the name in the lexer's NameTable (ID tokens only)
+        self.name_id = name_id
+        self.offset = offset
+        self.index = index
+        self._line = line if index is None else None
+        self._column = column if index is None else None
+
+    def _resolve(self):
+        # Línea desde 1 y columna desde 0, como las calculaba el lexer
+        line, column = self.index.position(self.offset)
+        self._line, self._column = line, column - 1
+
+    @property
+    def line(self):
+        if self._line is None:
+            self._resolve()
+        return self._line
+
+    @property
+    def column(self):
+        if self._column is None:
+            self._resolve()
+        return self._column
 
     def __str__(self):
         return f"Token({self.type}, '{self.value}', line={self.line}, col={self.column})"
 
 
 class LexicalAnalyzer:
-    def __init__(self):
+    def __init__(self, backend='re', names=None):
         self.tokens = []
         self.current_position = 0
+        # Per-compilation name table; identifier lexemes are interned here
+        self.names = names if names is not None else NameTable()
         
         # Definición de patrones para tokens
         self.token_patterns = [
@@ -40,30 +76,49 @@ class LexicalAnalyzer:
             ('COMMENT', r'//.*')
         ]
         self.token_regex = '|'.join('(?P<%s>%s)' % pair for pair in self.token_patterns)
-        self.pattern = re.compile(self.token_regex)
+        if backend == 'dfa':
+            # AFD con tablas: una consulta por carácter, mismas coincidencias que re
+            self.pattern = compile_spec(self.token_patterns)
+        else:
+            self.pattern = re.compile(self.token_regex)
         
-    def tokenize(self, code):
+    def tokenize(self, code, stream=False):
+        """
+        Returns the token list or, with stream=True, a TokenStream that keeps
+        the tokens as integer columns and builds each Token on access.
+        """
         self.tokens = []
-        line_num = 1
-        line_start = 0
+        index = SourceIndex(code)
+        intern = self.names.intern
+        names = self.names.names
+        if stream:
+            tokens = self.tokens = TokenStream(code, Token)
+            position = index.position
+            for match in self.pattern.finditer(code):
+                if match.lastgroup != 'WHITESPACE' and match.lastgroup != 'COMMENT':
+                    start = match.start()
+                    line, column = position(start)
+                    tokens.add(match.lastgroup, start, match.end(), line, column - 1)
+            tokens.add('EOF', len(code), len(code), len(index), 0)
+            self.current_position = 0
+            return tokens
         
         for match in self.pattern.finditer(code):
             token_type = match.lastgroup
-            token_value = match.group()
-            column = match.start() - line_start
             
-            if token_type == 'WHITESPACE':
-                line_num += token_value.count('\n')
-                if '\n' in token_value:
-                    line_start = match.end() - token_value.rfind('\n') - 1
-                continue
-            elif token_type == 'COMMENT':
+            if token_type == 'WHITESPACE' or token_type == 'COMMENT':
                 continue
             else:
-                self.tokens.append(Token(token_type, token_value, line_num, column))
+                value = match.group()
+                if token_type == 'ID':
+                    name_id = intern(value)
+                    self.tokens.append(Token(token_type, names[name_id], offset=match.start(),
+                                             index=index, name_id=name_id))
+                    continue
+                self.tokens.append(Token(token_type, value, offset=match.start(), index=index))
                 
         # Añadir un token de fin de archivo
-        self.tokens.append(Token('EOF', '', line_num, 0))
+        self.tokens.append(Token('EOF', '', len(index), 0))
         self.current_position = 0
         return self.tokens
     
@@ -97,7 +152,7 @@ class SyntaxAnalyzer:
         self.terminals = set()
         self.non_terminals = set()
         self.stack = ['$']  # Inicializar con el símbolo de fin de entrada
-        self.input_tokens = []
+        self.input_tokens = TokenBuffer([])
         self.current_token_index = 0
         self.stack_trace = []
         
@@ -158,8 +213,12 @@ class SyntaxAnalyzer:
             print(f"Error al cargar la tabla de análisis: {e}")
     
     def analyze(self, tokens):
-        """Realiza el análisis sintáctico usando la tabla de análisis LL(1)"""
-        self.input_tokens = tokens
+        """
+        Realiza el análisis sintáctico usando la tabla de análisis LL(1).
+        `tokens` puede ser una lista o un iterable: los tokens se piden a
+        medida que se necesitan.
+        """
+        self.input_tokens = TokenBuffer(tokens)
         self.current_token_index = 0
         self.stack = ['$', 'program']  # Empezar con el símbolo inicial
         self.stack_trace = []
@@ -169,7 +228,7 @@ class SyntaxAnalyzer:
             self.stack_trace.append(self.stack.copy())
             
             top = self.stack[-1]
-            current_token = self.current_token() if self.current_token_index < len(tokens) else Token('EOF', '$')
+            current_token = self.current_token()
             
             print(f"Pila: {self.stack}, Token: {current_token.type}:{current_token.value}")
             
@@ -182,6 +241,7 @@ class SyntaxAnalyzer:
                 # Si el tope de la pila es un terminal, debe coincidir con el token actual
                 if (top == current_token.value) or (top == '$' and current_token.type == 'EOF'):
                     self.stack.pop()
+                    self.input_tokens.advance()
                     self.current_token_index += 1
                 else:
                     print(f"Error sintáctico: Se esperaba '{top}', pero se encontró '{current_token.value}'")
@@ -207,29 +267,39 @@ class SyntaxAnalyzer:
         return True
     
     def current_token(self):
-        if self.current_token_index < len(self.input_tokens):
-            return self.input_tokens[self.current_token_index]
-        return Token('EOF', '$')
+        token = self.input_tokens.peek()
+        return token if token is not None else Token('EOF', '$')
     
     def get_stack_trace(self):
         return self.stack_trace
 
 
 class SemanticAnalyzer:
-    def __init__(self):
+    def __init__(self, names=None):
+        # Variables are keyed by (scope id, name id) and functions by name id.
+        # Name ids come from the per-compilation NameTable and are the ones
+        # the lexer stored on the ID tokens; scope names get their own table
+        # so they never take ids in the identifier one
+        self.names = names if names is not None else NameTable()
+        self.scopes = NameTable()
         self.symbol_table = {}
         self.function_table = {}
+        self.global_scope_id = self.scopes.intern("global")
         self.current_scope = "global"
+        self.current_scope_id = self.global_scope_id
         self.errors = []
     
     def enter_scope(self, scope_name):
         self.current_scope = scope_name
+        self.current_scope_id = self.scopes.intern(scope_name)
     
     def exit_scope(self):
         self.current_scope = "global"
+        self.current_scope_id = self.global_scope_id
     
-    def add_variable(self, name, var_type):
-        key = f"{self.current_scope}.{name}"
+    def add_variable(self, name_id, var_type):
+        key = (self.current_scope_id, name_id)
+        name = self.names.names[name_id]
         if key in self.symbol_table:
             self.errors.append(f"Error semántico: Variable '{name}' ya declarada en el ámbito '{self.current_scope}'")
             return False
@@ -241,38 +311,40 @@ class SemanticAnalyzer:
         }
         return True
     
-    def add_function(self, name, return_type, parameters):
-        if name in self.function_table:
+    def add_function(self, name_id, return_type, parameters):
+        name = self.names.names[name_id]
+        if name_id in self.function_table:
             self.errors.append(f"Error semántico: Función '{name}' ya declarada")
             return False
         
-        self.function_table[name] = {
+        self.function_table[name_id] = {
             "name": name,
             "return_type": return_type,
             "parameters": parameters
         }
         return True
     
-    def get_variable_type(self, name):
+    def get_variable_type(self, name_id):
         # Primero buscar en el ámbito actual
-        key = f"{self.current_scope}.{name}"
+        key = (self.current_scope_id, name_id)
         if key in self.symbol_table:
             return self.symbol_table[key]["type"]
         
         # Luego buscar en el ámbito global si no estamos ya en él
-        if self.current_scope != "global":
-            key = f"global.{name}"
+        if self.current_scope_id != self.global_scope_id:
+            key = (self.global_scope_id, name_id)
             if key in self.symbol_table:
                 return self.symbol_table[key]["type"]
         
         return None
     
-    def check_function_call(self, name, arguments):
-        if name not in self.function_table:
+    def check_function_call(self, name_id, arguments):
+        func_info = self.function_table.get(name_id)
+        name = self.names.names[name_id]
+        if func_info is None:
             self.errors.append(f"Error semántico: Función '{name}' no declarada")
             return False
         
-        func_info = self.function_table[name]
         if len(arguments) != len(func_info["parameters"]):
             self.errors.append(f"Error semántico: Número incorrecto de argumentos para la función '{name}'")
             return False
@@ -326,7 +398,7 @@ class Translator:
     def __init__(self, grammar_file, parse_table_file):
         self.lexical_analyzer = LexicalAnalyzer()
         self.syntax_analyzer = SyntaxAnalyzer(grammar_file, parse_table_file)
-        self.semantic_analyzer = SemanticAnalyzer()
+        self.semantic_analyzer = SemanticAnalyzer(self.lexical_analyzer.names)
     
     def process_code(self, code):
         print("=== Análisis Léxico ===")
@@ -0,0 +1,513 @@
+"""
+Generador de tablas LALR(1) a partir de las reglas de compilador.inf.
+
+Construye el autómata LR(0) y calcula los símbolos de preanálisis con el
+método de DeRemer y Pennello: los conjuntos Read y Follow de cada
+transición con no terminal se obtienen con el algoritmo digraph sobre
+las relaciones reads e includes, y el preanálisis de cada reducción es
+la unión de los Follow de sus transiciones lookback. Los conjuntos son
+enteros usados como bitsets (un bit por id de terminal).
+
+Los estados se numeran en el orden en que se descubren (a lo ancho) y
+las transiciones de cada estado en el orden en que aparecen sus símbolos
+en la cerradura (calculada en profundidad). Los conflictos de las
+expresiones se resuelven con la precedencia de C (PRECEDENCE y
+RULE_PRECEDENCE), y los demás como en yacc: desplazar antes que reducir
+y, entre dos reducciones, la regla de menor número.
+
+Con compat=True (--compat) se imitan además dos rarezas de la
+herramienta que generó compilador.csv, para que la tabla salga igual a
+ese archivo:
+    - si el núcleo de una transición está contenido en el de un estado
+      ya creado, se reutiliza ese estado en lugar de crear otro (el
+      autómata deja de ser el LR(0) canónico);
+    - cuando desplazar gana por omisión, ese terminal deja de ser
+      preanálisis de las reducciones que comparten las transiciones
+      lookback de la descartada (ver _drop_default_shifts).
+
+Uso:
+    python lalr.py [compilador.inf] [--csv salida.csv] [--compat] [--check compilador.csv]
+
+Desde código, load() devuelve la tabla (un parser_lr.DenseTable), las
+reglas y los conflictos, guardados en una caché junto al .inf mientras
+no cambien la gramática ni este generador.
+"""
+import argparse
+import csv
+import io
+import os
+import re
+import sys
+import time
+
+# Los módulos que comparten las etapas están en ../comun
+_RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _RAIZ not in sys.path:
+    sys.path.append(_RAIZ)
+
+from comun import table_cache
+from parser_lr import DenseTable
+
+START = "programa'"
+
+# Niveles de precedencia de menor a mayor: (asociatividad, terminales)
+PRECEDENCE = (
+    ('left', ('opOr',)),
+    ('left', ('opAnd',)),
+    ('left', ('opIgualdad',)),
+    ('left', ('opRelac',)),
+    ('left', ('opSuma',)),
+    ('left', ('opMul',)),
+    ('right', ('opNot',)),
+)
+
+# Reglas cuya precedencia no es la de su último terminal (%prec de yacc),
+# por (cabeza, cuerpo): el opSuma unario va con opNot
+RULE_PRECEDENCE = {
+    ('Expresion', ('opSuma', 'Expresion')): 'opNot',
+}
+
+
+def read_grammar(path):
+    """
+    Lee un .inf: las líneas 'terminal<TAB>id' y las reglas
+    'R<n> <cabeza> ::= cuerpo'. Devuelve (terminales ordenados por id,
+    reglas {n: (cabeza, cuerpo)}), con los no terminales del cuerpo sin
+    '<>' y el cuerpo vacío ('\\e') como tupla vacía.
+    """
+    terminals = {}
+    rules = {}
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            match = re.match(r'R(\d+)\s+<([^>]+)>\s*::=(.*)', line.strip())
+            if match:
+                body = tuple(s[1:-1] if s.startswith('<') and s.endswith('>') else s
+                             for s in match.group(3).split() if s != '\\e')
+                rules[int(match.group(1))] = (match.group(2), body)
+                continue
+            parts = line.split('\t')
+            if len(parts) == 2 and parts[1].strip().isdigit():
+                terminals[parts[0].strip()] = int(parts[1])
+    return sorted(terminals, key=terminals.get), rules
+
+
+def _digraph(nodes, edges, initial):
+    """
+    Algoritmo digraph de DeRemer y Pennello: F(x) es initial[x] unido con
+    F(y) para todo y alcanzable desde x por `edges`; los nodos de una
+    misma componente fuertemente conexa comparten el conjunto. Iterativo,
+    para no depender del límite de recursión en gramáticas grandes.
+    """
+    result = dict(initial)
+    depth = dict.fromkeys(nodes, 0)
+    stack = []
+    for root in nodes:
+        if depth[root]:
+            continue
+        stack.append(root)
+        depth[root] = len(stack)
+        # Pila de llamadas: (nodo, profundidad al entrar, sucesores pendientes)
+        calls = [(root, len(stack), iter(edges.get(root, ())))]
+        while calls:
+            node, entry, successors = calls[-1]
+            for succ in successors:
+                if not depth[succ]:
+                    stack.append(succ)
+                    depth[succ] = len(stack)
+                    calls.append((succ, len(stack), iter(edges.get(succ, ()))))
+                    break
+                depth[node] = min(depth[node], depth[succ])
+                result[node] |= result[succ]
+            else:
+                calls.pop()
+                if depth[node] == entry:
+                    while True:
+                        top = stack.pop()
+                        depth[top] = sys.maxsize
+                        result[top] = result[node]
+                        if top == node:
+                            break
+                if calls:
+                    parent = calls[-1][0]
+                    depth[parent] = min(depth[parent], depth[node])
+                    result[parent] |= result[node]
+    return result
+
+
+class LALR:
+    """
+    Autómata LALR(1) de una gramática. `terminals` es la lista de
+    terminales por id (con '$') y `rules` {n: (cabeza, cuerpo)}; la regla
+    0, <programa'> ::= <cabeza de la primera regla>, se agrega aquí y
+    reducir por ella es aceptar.
+
+    Después de construirlo:
+        states       núcleos de los estados, tuplas de ítems (regla, punto)
+        transitions  {(estado, símbolo): estado}
+        lookaheads   {(estado, regla): bitset de terminales}
+        actions      {(estado, terminal): 'd<estado>' o 'r<regla>'}
+        conflicts    lista de (estado, terminal, acción elegida, descartada,
+                     'precedencia' u 'omisión')
+        unused_precedence
+                     entradas de `precedence` y `rule_precedence` que no
+                     corresponden a ningún terminal o regla de la gramática
+
+    `compat` activa las rarezas de compilador.csv (ver el docstring del
+    módulo); por omisión el autómata es el LR(0) canónico.
+    """
+    def __init__(self, terminals, rules, precedence=PRECEDENCE, rule_precedence=RULE_PRECEDENCE,
+                 compat=False):
+        self.compat = compat
+        self.terminals = list(terminals)
+        self.terminal_ids = {name: i for i, name in enumerate(self.terminals)}
+        self.rules = {0: (START, (rules[min(rules)][0],)), **rules}
+        self.nonterminals = []
+        self.productions = {}
+        for number in sorted(rules):
+            head = rules[number][0]
+            if head not in self.productions:
+                self.nonterminals.append(head)
+                self.productions[head] = []
+            self.productions[head].append(number)
+        self._check_symbols()
+        self._set_precedence(precedence, rule_precedence)
+
+        self._nullable()
+        self._build_lr0()
+        self._build_lookaheads()
+        self._build_actions()
+
+    def _set_precedence(self, precedence, rule_precedence):
+        self.unused_precedence = []
+        self.precedence = {}
+        for level, (assoc, names) in enumerate(precedence, 1):
+            for name in names:
+                if name in self.terminal_ids:
+                    self.precedence[name] = (level, assoc)
+                else:
+                    self.unused_precedence.append(name)
+        overrides = {}
+        for (head, body), name in rule_precedence.items():
+            numbers = [n for n, rule in self.rules.items() if rule == (head, tuple(body))]
+            if not numbers or name not in self.precedence:
+                self.unused_precedence.append((head, tuple(body)))
+            for number in numbers:
+                overrides[number] = name
+        self.rule_precedence = {}
+        for number, (_, body) in self.rules.items():
+            name = overrides.get(number)
+            if name is None:
+                name = next((s for s in reversed(body) if s in self.terminal_ids), None)
+            if name in self.precedence:
+                self.rule_precedence[number] = self.precedence[name][0]
+
+    def _check_symbols(self):
+        if '$' not in self.terminal_ids:
+            raise ValueError("La gramática no define el terminal '$'")
+        for number, (_, body) in self.rules.items():
+            for symbol in body:
+                if symbol not in self.terminal_ids and symbol not in self.productions:
+                    raise ValueError(f"R{number}: símbolo desconocido '{symbol}'")
+
+    def _nullable(self):
+        self.nullable = set()
+        changed = True
+        while changed:
+            changed = False
+            for head, body in self.rules.values():
+                if head not in self.nullable and all(s in self.nullable for s in body):
+                    self.nullable.add(head)
+                    changed = True
+        # Por regla, la posición desde la que el resto del cuerpo es anulable
+        self.nullable_tail = {}
+        for number, (_, body) in self.rules.items():
+            position = len(body)
+            while position and body[position - 1] in self.nullable:
+                position -= 1
+            self.nullable_tail[number] = position
+
+    def _closure(self, kernel):
+        # En profundidad: cada no terminal se expande apenas aparece tras
+        # el punto, en el orden de sus reglas
+        items = []
+        seen = set()
+        expanded = set()
+        pending = list(reversed(kernel))
+        while pending:
+            item = pending.pop()
+            if item in seen:
+                continue
+            seen.add(item)
+            items.append(item)
+            rule, dot = item
+            body = self.rules[rule][1]
+            if dot < len(body) and body[dot] in self.productions and body[dot] not in expanded:
+                expanded.add(body[dot])
+                pending.extend((number, 0) for number in reversed(self.productions[body[dot]]))
+        return items
+
+    def _build_lr0(self):
+        self.states = [((0, 0),)]
+        self.closures = []
+        self.transitions = {}
+        numbers = {frozenset(self.states[0]): 0}
+        owners = {(0, 0): {0}}  # ítem -> estados con ese ítem en el núcleo (compat)
+        state = 0
+        while state < len(self.states):
+            closure = self._closure(self.states[state])
+            self.closures.append(closure)
+            moves = {}
+            for rule, dot in closure:
+                body = self.rules[rule][1]
+                if dot < len(body):
+                    moves.setdefault(body[dot], []).append((rule, dot + 1))
+            for symbol, kernel in moves.items():
+                target = numbers.get(frozenset(kernel))
+                if target is None and self.compat:
+                    containing = set.intersection(*(owners.get(item, set()) for item in kernel))
+                    target = min(containing) if containing else None
+                if target is None:
+                    target = numbers[frozenset(kernel)] = len(self.states)
+                    self.states.append(tuple(kernel))
+                    if self.compat:
+                        for item in kernel:
+                            owners.setdefault(item, set()).add(target)
+                self.transitions[state, symbol] = target
+            state += 1
+
+    def _build_lookaheads(self):
+        terminal_ids = self.terminal_ids
+        transitions = self.transitions
+        goto_keys = [key for key in transitions if key[1] in self.productions]
+
+        # DR: terminales que se desplazan justo después de la transición;
+        # reads: transiciones anulables que siguen a continuación
+        direct = {}
+        reads = {}
+        for key in goto_keys:
+            target = transitions[key]
+            bits = 0
+            for rule, dot in self.closures[target]:
+                body = self.rules[rule][1]
+                if dot < len(body):
+                    following = body[dot]
+                    if following in terminal_ids:
+                        bits |= 1 << terminal_ids[following]
+                    elif following in self.nullable:
+                        reads.setdefault(key, []).append((target, following))
+            direct[key] = bits
+        # Después del símbolo inicial solo puede venir el fin de la entrada
+        end = 1 << terminal_ids['$']
+        direct[0, self.rules[0][1][0]] |= end
+        read = _digraph(goto_keys, reads, direct)
+
+        # includes y lookback: cada regla de A se recorre desde el estado
+        # donde empieza cada transición con A
+        includes = {}
+        lookback = {}
+        for state, head in goto_keys:
+            for number in self.productions[head]:
+                body = self.rules[number][1]
+                tail = self.nullable_tail[number]
+                current = state
+                for position, symbol in enumerate(body):
+                    if position + 1 >= tail and symbol in self.productions:
+                        includes.setdefault((current, symbol), []).append((state, head))
+                    current = transitions[current, symbol]
+                lookback.setdefault((current, number), []).append((state, head))
+        self._follow = _digraph(goto_keys, includes, read)
+        self._lookback = lookback
+        self._accept = (transitions[0, self.rules[0][1][0]], end)
+        self._collect_lookaheads()
+
+    def _collect_lookaheads(self):
+        state, end = self._accept
+        self.lookaheads = {(state, 0): end}
+        for key, origins in self._lookback.items():
+            bits = 0
+            for origin in origins:
+                bits |= self._follow[origin]
+            self.lookaheads[key] = bits
+
+    def _build_actions(self):
+        self._fill_actions()
+        if self.compat:
+            self._drop_default_shifts()
+
+    def _drop_default_shifts(self):
+        conflicts = self.conflicts
+        # Como en la herramienta que generó compilador.csv: cuando desplazar
+        # gana por omisión, el terminal se quita del Follow de las
+        # transiciones de esa reducción, y con eso de las demás reducciones
+        # que dependen de ellas (con el 'else' colgante, de <Otro> ::= else
+        # <SentenciaBloque>)
+        dropped = [c for c in conflicts if c[4] == 'omisión' and c[2][0] == 'd']
+        if dropped:
+            for state, terminal, _, reduce, _ in dropped:
+                for origin in self._lookback.get((state, int(reduce[1:])), ()):
+                    self._follow[origin] &= ~(1 << self.terminal_ids[terminal])
+            self._collect_lookaheads()
+            self._fill_actions()
+            self.conflicts = conflicts
+
+    def _fill_actions(self):
+        self.actions = {}
+        self.conflicts = []
+        for (state, symbol), target in self.transitions.items():
+            if symbol in self.terminal_ids:
+                self.actions[state, symbol] = f'd{target}'
+        for (state, number), bits in sorted(self.lookaheads.items()):
+            reduce = f'r{number}'
+            for terminal in self._members(bits):
+                current = self.actions.get((state, terminal))
+                if current is None:
+                    self.actions[state, terminal] = reduce
+                elif current[0] == 'd':
+                    self._shift_reduce(state, terminal, current, number)
+                else:
+                    # Reducción contra reducción: gana la regla de menor número
+                    chosen, discarded = sorted((current, reduce), key=lambda a: int(a[1:]))
+                    self.actions[state, terminal] = chosen
+                    self.conflicts.append((state, terminal, chosen, discarded, 'omisión'))
+
+    def _shift_reduce(self, state, terminal, shift, number):
+        reduce = f'r{number}'
+        level = self.rule_precedence.get(number)
+        if level is None or terminal not in self.precedence:
+            self.conflicts.append((state, terminal, shift, reduce, 'omisión'))
+            return
+        token_level, assoc = self.precedence[terminal]
+        if token_level > level or (token_level == level and assoc == 'right'):
+            chosen, discarded = shift, reduce
+        elif token_level < level or assoc == 'left':
+            chosen, discarded = reduce, shift
+        else:
+            # nonassoc: la combinación es un error
+            chosen, discarded = '', f'{shift}/{reduce}'
+        if chosen:
+            self.actions[state, terminal] = chosen
+        else:
+            del self.actions[state, terminal]
+        self.conflicts.append((state, terminal, chosen, discarded, 'precedencia'))
+
+    def _members(self, bits):
+        terminal = 0
+        while bits:
+            if bits & 1:
+                yield self.terminals[terminal]
+            bits >>= 1
+            terminal += 1
+
+    def rows(self):
+        """Encabezado y filas de la tabla, en el formato de compilador.csv."""
+        header = [''] + self.terminals + self.nonterminals
+        rows = []
+        for state in range(len(self.states)):
+            row = [str(state)]
+            row += [self.actions.get((state, t), '') for t in self.terminals]
+            row += [str(self.transitions[state, n]) if (state, n) in self.transitions else ''
+                    for n in self.nonterminals]
+            rows.append(row)
+        return header, rows
+
+    def rule_sizes(self):
+        """Reglas como las devuelve parser_lr.load_inf_rules: {n: (tamaño, cabeza)}."""
+        return {number: (len(body), head) for number, (head, body) in self.rules.items() if number}
+
+    def table(self):
+        return DenseTable(*self.rows(), self.rule_sizes())
+
+
+def report_unused_precedence(automaton):
+    """Avisa en stderr de la precedencia que no corresponde a la gramática."""
+    for entry in automaton.unused_precedence:
+        if isinstance(entry, tuple):
+            head, body = entry
+            print(f"Precedencia sin regla: {head} ::= {' '.join(body)}", file=sys.stderr)
+        else:
+            print(f"Precedencia de un terminal que no existe: {entry}", file=sys.stderr)
+
+
+def to_csv(header, rows):
+    out = io.StringIO()
+    writer = csv.writer(out, lineterminator='\n')
+    writer.writerow(header)
+    writer.writerows(rows)
+    return out.getvalue()
+
+
+def load(inf_path='compilador.inf', cache_path=None, compat=False):
+    """
+    Devuelve (tabla, reglas, conflictos) para la gramática `inf_path`:
+    la tabla es un parser_lr.DenseTable y las reglas {n: (tamaño, cabeza)}.
+    El resultado se guarda en `inf_path` + '.cache' (o '.compat.cache'
+    con `compat`, por omisión) con el hash del .inf y de este archivo,
+    así que solo se vuelve a generar cuando cambia alguno de los dos.
+    """
+    def build():
+        automaton = LALR(*read_grammar(inf_path), compat=compat)
+        report_unused_precedence(automaton)
+        table = automaton.table()
+        meta = {'terminals': table.terminals, 'nonterminals': table.nonterminals,
+                'n_states': table.n_states,
+                'rules': [[n, size, head] for n, (size, head) in automaton.rule_sizes().items()],
+                'conflicts': automaton.conflicts}
+        arrays = {'action': table.action, 'goto': table.goto,
+                  'rule_size': table.rule_size, 'rule_head': table.rule_head}
+        return meta, arrays
+
+    if cache_path is None:
+        cache_path = inf_path + ('.compat.cache' if compat else '.cache')
+    meta, arrays = table_cache.cached(cache_path, [inf_path, os.path.abspath(__file__)], build)
+    table, rules = DenseTable.from_cache(meta, arrays)
+    return table, rules, [tuple(conflict) for conflict in meta['conflicts']]
+
+
+def _first_difference(expected, generated):
+    for number, (a, b) in enumerate(zip(expected.splitlines(), generated.splitlines()), 1):
+        if a != b:
+            return number, a, b
+    return None
+
+
+def main():
+    cli = argparse.ArgumentParser(description="Genera la tabla LALR(1) de una gramática .inf.")
+    cli.add_argument('inf', nargs='?', default='compilador.inf')
+    cli.add_argument('--csv', help="escribir la tabla en este archivo")
+    cli.add_argument('--compat', action='store_true',
+                     help="imitar la herramienta que generó compilador.csv (ver el docstring)")
+    cli.add_argument('--check', metavar='CSV', help="comparar la tabla con este archivo")
+    args = cli.parse_args()
+
+    inicio = time.perf_counter()
+    automaton = LALR(*read_grammar(args.inf), compat=args.compat)
+    milisegundos = (time.perf_counter() - inicio) * 1000
+    print(f"{len(automaton.states)} estados, {len(automaton.rules) - 1} reglas ({milisegundos:.1f} ms)")
+    report_unused_precedence(automaton)
+
+    por_precedencia = [c for c in automaton.conflicts if c[4] == 'precedencia']
+    por_omision = [c for c in automaton.conflicts if c[4] == 'omisión']
+    print(f"Conflictos resueltos por precedencia: {len(por_precedencia)}")
+    print(f"Conflictos resueltos por omisión: {len(por_omision)}")
+    for state, terminal, chosen, discarded, _ in por_omision:
+        print(f"  estado {state}, {terminal}: {chosen} (se descarta {discarded})")
+
+    text = to_csv(*automaton.rows())
+    if args.csv:
+        with open(args.csv, 'w', encoding='utf-8', newline='') as f:
+            f.write(text)
+        print(f"Tabla escrita en {args.csv}")
+    if args.check:
+        with open(args.check, 'r', encoding='utf-8', newline='') as f:
+            expected = f.read()
+        if expected == text:
+            print(f"La tabla es igual a {args.check}")
+        else:
+            difference = _first_difference(expected, text)
+            print(f"La tabla difiere de {args.check}" +
+                  (f" en la línea {difference[0]}:\n  {difference[1]}\n  {difference[2]}" if difference else ""))
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,5 +1,16 @@
 
+import mmap
+import os
 import re
+import sys
+
+# Los módulos que comparten las etapas están en ../comun
+_RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _RAIZ not in sys.path:
+    sys.path.append(_RAIZ)
+
+from comun.dfa_lexer import compile_spec
+from comun.token_stream import TokenStream
 
 token_map = {
     'identificador': 0,
@@ -58,22 +69,126 @@ token_specification = [
     ('MISMATCH', r'.'),                                    # cualquier otro
 ]
 
-def tokenize(code):
-    tok_regex = '|'.join(f'(?P<{name}>{pattern})' for name, pattern in token_specification)
-    get_token = re.compile(tok_regex).match
+# Cache de escáneres compilados: una sola compilación por especificación de tokens
+_scanners = {}
+
+def compile_scanner(spec=None, backend='re'):
+    """
+    Devuelve (finditer, tipos) para la especificación dada, compilando la
+    expresión maestra solo la primera vez que se ve esa especificación.
+    Los grupos se nombran T0..Tn porque nombres como ';' o '\\(' no son
+    nombres de grupo válidos para `re`.
+    Con backend='dfa' se usa el AFD de dfa_lexer, que da las mismas
+    coincidencias que la expresión maestra, y con backend='bytes' la misma
+    expresión maestra compilada para bytes.
+    """
+    if spec is None:
+        spec = token_specification
+    key = (backend, tuple(spec))
+    scanner = _scanners.get(key)
+    if scanner is None:
+        if backend == 'dfa':
+            finditer = compile_spec([(f'T{i}', pattern) for i, (name, pattern) in enumerate(spec)]).finditer
+        else:
+            tok_regex = '|'.join(f'(?P<T{i}>{pattern})' for i, (name, pattern) in enumerate(spec))
+            if backend == 'bytes':
+                tok_regex = tok_regex.encode('ascii')
+            finditer = re.compile(tok_regex).finditer
+        kinds = {}
+        for i, (name, pattern) in enumerate(spec):
+            name = re.sub(r'\\(.)', r'\1', name)  # '\(' -> '('
+            kinds[f'T{i}'] = (name, token_map.get(name, name))
+        scanner = (finditer, kinds)
+        _scanners[key] = scanner
+    return scanner
+
+def tokenize_iter(code, spec=None, backend='re'):
+    """Genera los pares (id, lexema) de `code` de forma perezosa."""
+    finditer, kinds = compile_scanner(spec, backend)
     pos = 0
-    tokens = []
-    while pos < len(code):
-        match = get_token(code, pos)
-        if not match:
+    for match in finditer(code):
+        if match.start() != pos:
             raise RuntimeError(f'Error de tokenización en la posición {pos}')
-        kind = match.lastgroup
-        value = match.group()
-        if kind == 'SKIP' or kind == 'NEWLINE':
+        name, kind = kinds[match.lastgroup]
+        if name == 'SKIP' or name == 'NEWLINE':
             pass
-        elif kind == 'MISMATCH':
-            raise RuntimeError(f'Token inesperado: {value!r}')
+        elif name == 'MISMATCH':
+            raise RuntimeError(f'Token inesperado: {match.group()!r}')
         else:
-            tokens.append((token_map.get(kind, kind), value))
+            yield (kind, match.group())
         pos = match.end()
-    return tokens
+    if pos != len(code):
+        raise RuntimeError(f'Error de tokenización en la posición {pos}')
+
+def tokenize(code, backend='re'):
+    return list(tokenize_iter(code, backend=backend))
+
+def tokenize_file(path, spec=None, chunk_size=1 << 16, encoding='utf-8'):
+    """
+    Tokeniza un archivo por fragmentos de `chunk_size` caracteres sin cargarlo
+    completo. Genera (id, lexema, línea, columna), con línea y columna a
+    partir de 1; los tokens son los mismos que los de tokenize() y
+    tokenize_mmap() sobre el mismo texto.
+    Usa el AFD de dfa_lexer, que sigue un token de un fragmento al
+    siguiente sin volver a leerlo y no guarda el texto de los espacios y
+    saltos de línea. La memoria no depende del tamaño del archivo, salvo
+    por un token largo que se genera (su lexema) o uno que podría
+    reemplazarse por una coincidencia más corta (ver DFAScanner.scan_chunks).
+    """
+    if spec is None:
+        spec = token_specification
+    dfa = compile_spec([(f'T{i}', pattern) for i, (name, pattern) in enumerate(spec)])
+    _, kinds = compile_scanner(spec, 'dfa')
+    skip = [group for group, (name, kind) in kinds.items() if name == 'SKIP' or name == 'NEWLINE']
+    with open(path, 'r', encoding=encoding, newline='') as f:
+        for group, value, line, column in dfa.scan_chunks(iter(lambda: f.read(chunk_size), ''), skip):
+            if group is None:
+                raise RuntimeError(f'Error de tokenización en la línea {line}, columna {column}')
+            name, kind = kinds[group]
+            if name == 'MISMATCH':
+                raise RuntimeError(f'Token inesperado: {value!r} en la línea {line}, columna {column}')
+            if value is not None:
+                yield (kind, value, line, column)
+
+def _token_tuple(kind, value, line, column):
+    return (kind, value, line, column)
+
+def tokenize_mmap(path, spec=None, encoding='ascii'):
+    """
+    Tokeniza un archivo ASCII sin decodificarlo: lo mapea con mmap y corre
+    la expresión maestra en bytes directamente sobre el mapa.
+    Devuelve un TokenStream cuyo código es el mmap. Cada token guarda solo
+    su tipo, (inicio, fin), línea y columna; el lexema se decodifica al
+    acceder al elemento, y stream.view(i) lo da como memoryview sin copiarlo.
+    Los elementos son tuplas (id, lexema, línea, columna), como en
+    tokenize_file. El mapa se libera con stream.code.close() o al
+    descartar el stream.
+    """
+    finditer, kinds = compile_scanner(spec, 'bytes')
+    with open(path, 'rb') as f:
+        try:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # archivo vacío: no se puede mapear
+            buffer = b''
+    stream = TokenStream(buffer, _token_tuple, encoding)
+    add = stream.add
+    line = 1
+    line_start = 0
+    pos = 0
+    for match in finditer(buffer):
+        start, end = match.span()
+        if start != pos:
+            raise RuntimeError(f'Error de tokenización en la línea {line}, columna {pos - line_start + 1}')
+        name, kind = kinds[match.lastgroup]
+        if name == 'NEWLINE':
+            line += 1
+            line_start = end
+        elif name == 'MISMATCH':
+            raise RuntimeError(f'Token inesperado: {match.group().decode(encoding, "replace")!r} en la línea {line}, '
+                               f'columna {start - line_start + 1}')
+        elif name != 'SKIP':
+            add(kind, start, end, line, start - line_start + 1)
+        pos = end
+    if pos != len(buffer):
+        raise RuntimeError(f'Error de tokenización en la línea {line}, columna {pos - line_start + 1}')
+    return stream
@@ -1,51 +1,77 @@
-import pandas as pd
-from lexer import tokenize
-from parser_lr import LRParser
-from stack_trace import print_stack
-
-def load_table(csv_file):
-    df = pd.read_csv(csv_file, index_col=0)
-    df = df.astype(str).fillna('')  # Solución al warning
-    return df
-
-def load_rules(filename):
-    rules = {}
-    with open(filename, 'r', encoding='utf-8') as file:
-        for line in file:
-            parts = line.strip().split()
-            if len(parts) != 3:
-                continue  # Saltar líneas mal formateadas
-            try:
-                rule_num = int(parts[0])
-                size = int(parts[1])
-                head = parts[2]
-                rules[rule_num] = (size, head)
-            except ValueError:
-                continue
-    return rules
+import argparse
+import os
+import sys
+from itertools import chain
+
+# Los módulos que comparten las etapas están en ../comun
+_RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _RAIZ not in sys.path:
+    sys.path.append(_RAIZ)
+
+from comun.tracer import LEVELS, Tracer
+from lexer import token_map, tokenize_file, tokenize_iter
+from parser_lr import DenseTable, LRParser
+import parser_gen
 
 def main():
-    # Leer líneas de código desde archivo
-    with open("codigo.txt", "r", encoding="utf-8") as f:
-        code_lines = f.readlines()
+    cli = argparse.ArgumentParser(description="Analiza codigo.txt línea por línea con el parser LR.")
+    cli.add_argument('--traza', choices=LEVELS, default='full',
+                      help="nivel de traza del parser (por omisión: full)")
+    cli.add_argument('--ultimos', type=int, metavar='N',
+                      help="guardar solo los últimos N pasos y mostrarlos si hay error")
+    cli.add_argument('--colapsar-unitarias', action='store_true',
+                      help="hacer las cadenas de reducciones unitarias en un solo paso")
+    cli.add_argument('--completo', action='store_true',
+                      help="analizar el archivo completo como un solo programa, leyéndolo por fragmentos")
+    cli.add_argument('--generado', action='store_true',
+                      help="usar el parser generado por parser_gen.py (sin traza)")
+    args = cli.parse_args()
+    tracer = Tracer(args.traza, ring=args.ultimos)
+
+    # La tabla se compila a arreglos de enteros (con caché en
+    # compilador.csv.cache); las reglas salen de compilador.inf, que
+    # numera igual que la tabla
+    table, rules = DenseTable.load("compilador.csv", "compilador.inf")
+    parser = LRParser(table, rules, collapse_units=args.colapsar_unitarias)
 
-    table = load_table("compilador.csv")
-    rules = load_rules("compilador.lr")
-    parser = LRParser(table, rules)
+    if args.generado:
+        # El autómata escrito como código (parser_tabla.py, que se vuelve a
+        # generar si la tabla cambió); acepta y falla igual que LRParser
+        generado = parser_gen.load("compilador.csv", "compilador.inf")
 
-    for i, line in enumerate(code_lines, 1):
-        line = line.strip()
-        if not line:
-            continue
-        print(f"\n🟡 Línea {i}: {line}")
+        def analizar(tokens):
+            generado.parse(tokens)
+            print("✅ Cadena aceptada")
+    else:
+        def analizar(tokens):
+            parser.parse(tokens, tracer)
+
+    if args.completo:
+        # El lexer lee el archivo por fragmentos y el parser pide los
+        # tokens a medida que los necesita
+        tokens = ((kind, value) for kind, value, line, column in tokenize_file("codigo.txt"))
         try:
-            tokens = tokenize(line)
-            tokens.append(('$', 23))  # EOF
-            parser.parse(tokens)
+            analizar(chain(tokens, [(token_map['$'], '$')]))  # EOF
         except SyntaxError as e:
-            print(f"❌ Error en la línea {i}: {e}")
+            print(f"❌ Error: {e}")
         except Exception as e:
-            print(f"❌ Error inesperado en la línea {i}: {e}")
+            print(f"❌ Error inesperado: {e}")
+        return
+
+    # Leer líneas de código desde archivo, una a la vez
+    with open("codigo.txt", "r", encoding="utf-8") as f:
+        for i, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            print(f"\n🟡 Línea {i}: {line}")
+            try:
+                # El parser pide los tokens al lexer a medida que los necesita
+                analizar(chain(tokenize_iter(line), [(token_map['$'], '$')]))  # EOF
+            except SyntaxError as e:
+                print(f"❌ Error en la línea {i}: {e}")
+            except Exception as e:
+                print(f"❌ Error inesperado en la línea {i}: {e}")
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,224 @@
+"""
+Generador de un parser LR especializado para la tabla de compilador.csv.
+
+En lugar de interpretar la tabla, el módulo generado tiene el autómata
+escrito como código: cada estado es una función de nivel de módulo que
+recibe el id del token, la pila y la función que registra reducciones, y
+el ciclo de análisis llama a la del estado actual. Los terminales con la
+misma acción se prueban juntos con una máscara de bits. Las reducciones
+llevan su cantidad de estados a sacar de la pila ya calculada (y el
+destino fijo si la regla es vacía) y las transiciones de cada no
+terminal son tuplas indexadas por estado. Acepta las mismas entradas,
+hace las mismas reducciones y lanza los mismos errores que
+LRParser.parse(trace=False).
+
+Uso:
+    python parser_gen.py [compilador.csv] [compilador.inf] [parser_tabla.py]
+
+Desde código, load() devuelve el módulo y lo vuelve a generar si la
+tabla o la gramática cambiaron desde la última vez. main.py lo usa con
+--generado.
+"""
+import importlib.util
+import os
+import sys
+
+# Los módulos que comparten las etapas están en ../comun
+_RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _RAIZ not in sys.path:
+    sys.path.append(_RAIZ)
+
+from comun import table_cache
+from parser_lr import DenseTable
+
+# Cambia cuando cambia el código generado, para invalidar módulos viejos
+GENERATOR_VERSION = 2
+
+DEFAULT_MODULE = 'parser_tabla.py'
+
+
+def module_key(csv_path, inf_path):
+    return f"{GENERATOR_VERSION}:{table_cache.source_key([csv_path, inf_path]).hex()}"
+
+
+def generate(table, rules, key):
+    """Devuelve el código del módulo para `table` (DenseTable) y `rules`."""
+    lines = [
+        '# Generado por parser_gen.py a partir de compilador.csv y compilador.inf.',
+        '# No editar: se vuelve a generar cuando cambia la tabla.',
+        '',
+        f'SOURCE_KEY = {key!r}',
+        '',
+        f'TERMINALS = {tuple(table.terminals)!r}',
+        f'NONTERMINALS = {tuple(table.nonterminals)!r}',
+        'TERMINAL_IDS = {name: i for i, name in enumerate(TERMINALS)}',
+        '',
+        '# Regla -> (cabeza, tamaño del lado derecho)',
+        'RULES = {',
+    ]
+    for number in sorted(rules):
+        size, head = rules[number]
+        lines.append(f'    {number}: ({head!r}, {size}),')
+    lines += ['}', '']
+
+    # Transiciones: una tupla por no terminal, indexada por estado (-1 = ninguna)
+    goto_names = {}
+    for index, name in enumerate(table.nonterminals):
+        row = tuple(table.goto[state * table.n_nonterminals + index]
+                    for state in range(table.n_states))
+        if any(target >= 0 for target in row):
+            goto_names[index] = f'GOTO_{index}'
+            lines.append(f'# {name}')
+            lines.append(f'GOTO_{index} = {row!r}')
+    n_states = table.n_states
+    lines += [
+        '',
+        '',
+        'def _goto_error(head, state):',
+        '    raise SyntaxError(f"No hay transición para {NONTERMINALS[head]} desde estado {state}")',
+        '',
+        '',
+        '# Una función por estado: recibe el id del token y devuelve el estado',
+        '# al que se desplaza, ~estado tras una reducción (el token sigue',
+        f'# pendiente) o {n_states} al aceptar',
+    ]
+    for state in range(n_states):
+        _emit_state(lines, table, rules, goto_names, state)
+    lines += [
+        '',
+        f"STATES = ({', '.join(f'_s{state}' for state in range(n_states))})",
+        '',
+        '',
+        'def parse(tokens, reductions=None):',
+        '    """',
+        '    Analiza `tokens`, un iterable de pares (tipo, lexema) con el id del',
+        '    terminal o su nombre como tipo. Devuelve True si la entrada se acepta',
+        '    y lanza SyntaxError si no. Si se da la lista `reductions`, se le',
+        '    agregan los números de regla en el orden en que se reducen.',
+        '    """',
+        '    record = reductions.append if reductions is not None else None',
+        '    stack = [0]',
+        '    states = STATES',
+        '    state = 0',
+        '    for token in tokens:',
+        '        kind = token[0]',
+        '        if kind.__class__ is not int:',
+        f'            kind = TERMINAL_IDS.get(kind, {table.n_terminals})',
+        f'        if not 0 <= kind < {table.n_terminals}:',
+        '            raise SyntaxError(f"Token desconocido: {token}")',
+        '        state = states[state](kind, token, stack, record)',
+        '        while state < 0:',
+        '            state = states[~state](kind, token, stack, record)',
+        f'        if state == {n_states}:',
+        '            return True',
+        '    raise SyntaxError("Fin de entrada inesperado")',
+        '',
+    ]
+    return '\n'.join(lines)
+
+
+def _emit_state(lines, table, rules, goto_names, state):
+    # Terminales con la misma acción comparten una prueba; los grupos más
+    # grandes van primero
+    groups = {}
+    for kind in range(table.n_terminals):
+        code = table.action[state * table.n_terminals + kind]
+        if code:
+            groups.setdefault(code, []).append(kind)
+    lines.append('')
+    lines.append('')
+    lines.append(f'def _s{state}(kind, token, stack, record):')
+    for code, kinds in sorted(groups.items(), key=lambda item: (-len(item[1]), item[1][0])):
+        names = ' '.join(table.terminals[k] for k in kinds)
+        if len(kinds) == 1:
+            lines.append(f'    if kind == {kinds[0]}:  # {names}')
+        else:
+            mask = sum(1 << k for k in kinds)
+            lines.append(f'    if {mask:#x} >> kind & 1:  # {names}')
+        body = '        '
+        if code > 0:
+            lines.append(f'{body}stack.append({code - 1})')
+            lines.append(f'{body}return {code - 1}')
+        elif code == -1:
+            lines.append(f'{body}return {table.n_states}')
+        else:
+            rule = -code - 1
+            size, head = rules[rule]
+            head_id = table.nonterminal_ids[head]
+            lines.append(f'{body}# R{rule} <{head}>, {size} símbolo(s)')
+            lines.append(f'{body}if record:')
+            lines.append(f'{body}    record({rule})')
+            target = table.goto[state * table.n_nonterminals + head_id]
+            if not size and target >= 0:
+                # Regla vacía: el estado de abajo es este, el destino es fijo
+                lines.append(f'{body}stack.append({target})')
+                lines.append(f'{body}return ~{target}')
+                continue
+            # Se sacan size - 1 estados y el destino reemplaza al último,
+            # que queda arriba del estado de abajo
+            below = 'stack[-2]' if size else 'stack[-1]'
+            if size > 1:
+                lines.append(f'{body}del stack[-{size - 1}:]')
+            if head_id in goto_names:
+                lines.append(f'{body}target = {goto_names[head_id]}[{below}]')
+                lines.append(f'{body}if target < 0:')
+                lines.append(f'{body}    _goto_error({head_id}, {below})')
+                lines.append(f'{body}stack[-1] = target' if size else f'{body}stack.append(target)')
+                lines.append(f'{body}return ~target')
+            else:
+                lines.append(f'{body}_goto_error({head_id}, {below})')
+    lines.append('    raise SyntaxError(f"Token inesperado: {token}")')
+
+
+def write(csv_path, inf_path, module_path):
+    """Genera el módulo en `module_path` y devuelve su clave."""
+    key = module_key(csv_path, inf_path)
+    table, rules = DenseTable.load(csv_path, inf_path)
+    code = generate(table, rules, key)
+    temp = f'{module_path}.{os.getpid()}.tmp'
+    with open(temp, 'w', encoding='utf-8', newline='\n') as f:
+        f.write(code)
+    os.replace(temp, module_path)
+    return key
+
+
+def _stored_key(module_path):
+    # La clave está en la línea SOURCE_KEY, sin importar el módulo
+    try:
+        with open(module_path, encoding='utf-8') as f:
+            for line in f:
+                if line.startswith('SOURCE_KEY = '):
+                    return line[len('SOURCE_KEY = '):].strip().strip("'")
+    except OSError:
+        pass
+    return None
+
+
+def load(csv_path='compilador.csv', inf_path='compilador.inf', module_path=None):
+    """
+    Importa el parser generado para `csv_path` y `inf_path`. Si el
+    módulo no existe o fue generado a partir de otra tabla o gramática
+    (o con otra versión del generador), se vuelve a generar primero.
+    """
+    if module_path is None:
+        module_path = os.path.join(os.path.dirname(os.path.abspath(csv_path)), DEFAULT_MODULE)
+    if _stored_key(module_path) != module_key(csv_path, inf_path):
+        write(csv_path, inf_path, module_path)
+    name = os.path.splitext(os.path.basename(module_path))[0]
+    spec = importlib.util.spec_from_file_location(name, module_path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def main():
+    args = sys.argv[1:]
+    csv_path = args[0] if len(args) > 0 else 'compilador.csv'
+    inf_path = args[1] if len(args) > 1 else 'compilador.inf'
+    module_path = args[2] if len(args) > 2 else DEFAULT_MODULE
+    key = write(csv_path, inf_path, module_path)
+    print(f"Parser generado en {module_path} ({key})")
+
+
+if __name__ == '__main__':
+    main()
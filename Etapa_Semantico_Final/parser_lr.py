@@ -1,41 +1,460 @@
-from stack_trace import print_stack
+import csv
+import os
+import re
+import sys
+from array import array
+
+# Los módulos que comparten las etapas están en ../comun
+_RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _RAIZ not in sys.path:
+    sys.path.append(_RAIZ)
+
+from comun import table_cache
+from comun.lr_runtime import LRStack
+from comun.packed_table import PackedTable
+from comun.token_buffer import TokenBuffer
+from comun.tracer import make_tracer
+from stack_trace import format_stack
+
+# Tokens de entrada que se muestran en la traza; el resto se resume con '...'
+TRACE_LOOKAHEAD = 16
+
+def input_window(tokens):
+    return _cut_window(tokens.window(TRACE_LOOKAHEAD + 1))
+
+def _cut_window(window):
+    window = window[:TRACE_LOOKAHEAD + 1]
+    if len(window) > TRACE_LOOKAHEAD:
+        window[-1] = (None, '...')
+    return window
+
+def load_inf_rules(path):
+    """
+    Lee las reglas 'R<n> <cabeza> ::= cuerpo' de un archivo .inf y devuelve
+    {n: (tamaño, cabeza)}, con la cabeza sin '<>' y '\\e' como cuerpo vacío.
+    """
+    rules = {}
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            match = re.match(r'R(\d+)\s+<([^>]+)>\s*::=(.*)', line.strip())
+            if match:
+                body = [s for s in match.group(3).split() if s != '\\e']
+                rules[int(match.group(1))] = (len(body), match.group(2))
+    return rules
+
+class DenseTable:
+    """
+    Tabla LR compilada a arreglos de enteros, indexados por el número de
+    estado y el id entero del símbolo (el de lexer.token_map para los
+    terminales, que coincide con el orden de las columnas).
+
+    action[estado * n_terminals + terminal]:
+        0      error
+        n > 0  desplazar al estado n - 1
+        n < 0  reducir por la regla -n - 1; la regla 0 (la aumentada,
+               'r0' en la tabla) es aceptar
+    goto[estado * n_nonterminals + no_terminal]: estado destino o -1.
+    rule_size[n] y rule_head[n]: largo del lado derecho e índice del no
+    terminal de la regla n.
+    """
+    def __init__(self, header, rows, rules):
+        symbols = [s.strip() for s in header[1:]]
+        end = symbols.index('$') + 1
+        self._set_symbols(symbols[:end], symbols[end:])
+
+        rows = [row for row in rows if row and row[0].strip()]
+        n_states = max(int(float(row[0])) for row in rows) + 1
+        self.n_states = n_states
+        self.action = array('i', bytes(4 * n_states * self.n_terminals))
+        self.goto = array('i', [-1]) * (n_states * self.n_nonterminals)
+        for row in rows:
+            state = int(float(row[0]))
+            for column, cell in enumerate(row[1:]):
+                cell = str(cell).strip()
+                if cell in ('', 'nan'):
+                    continue
+                if column < end:
+                    self.action[state * self.n_terminals + column] = self.encode(cell)
+                else:
+                    self.goto[state * self.n_nonterminals + column - end] = int(float(cell))
+
+        size = max(rules) + 1 if rules else 1
+        self.rule_size = array('i', [0]) * size
+        self.rule_head = array('i', [-1]) * size
+        for number, (length, head) in rules.items():
+            self.rule_size[number] = length
+            self.rule_head[number] = self.nonterminal_ids[head]
+
+    def _set_symbols(self, terminals, nonterminals):
+        self.terminals = terminals
+        self.nonterminals = nonterminals
+        self.terminal_ids = {name: i for i, name in enumerate(terminals)}
+        self.nonterminal_ids = {name: i for i, name in enumerate(nonterminals)}
+        self.n_terminals = len(terminals)
+        self.n_nonterminals = len(nonterminals)
+
+    @staticmethod
+    def encode(cell):
+        """Código entero de una acción de la tabla ('d5', 's5', 'r3', 'r0', 'acc')."""
+        if cell == 'acc':
+            return -1
+        if cell[0] in 'ds':
+            return int(cell[1:]) + 1
+        if cell[0] == 'r':
+            return -int(cell[1:]) - 1
+        raise ValueError(f"Acción desconocida en la tabla LR: {cell!r}")
+
+    @staticmethod
+    def describe(code):
+        """Acción en texto para la traza."""
+        if code > 0:
+            return f"s{code - 1}"
+        if code == -1:
+            return 'acc'
+        if code < 0:
+            return f"r{-code - 1}"
+        return ''
+
+    def pack(self):
+        """
+        La tabla comprimida (packed_table.PackedTable), con los mismos
+        códigos e índices de terminal y no terminal.
+        """
+        return PackedTable(self.action, self.goto, self.n_states, self.n_terminals,
+                           self.n_nonterminals)
+
+    @classmethod
+    def from_csv(cls, path, rules):
+        with open(path, 'r', encoding='utf-8', newline='') as f:
+            reader = csv.reader(f)
+            header = next(reader)
+            return cls(header, list(reader), rules)
+
+    @classmethod
+    def from_frame(cls, frame, rules):
+        """Compila la tabla leída con pandas (índice = estados)."""
+        header = [''] + [str(c) for c in frame.columns]
+        rows = [[str(state)] + list(values)
+                for state, values in zip(frame.index, frame.itertuples(index=False))]
+        return cls(header, rows, rules)
+
+    @classmethod
+    def load(cls, csv_path, inf_path, cache_path=None):
+        """
+        Devuelve (tabla, reglas) de `csv_path` y `inf_path`. La tabla
+        compilada se guarda en una caché binaria junto al CSV
+        (`csv_path` + '.cache' por omisión) asociada al hash de ambos
+        archivos; mientras no cambien, se carga de ahí sin leerlos.
+        """
+        def build():
+            rules = load_inf_rules(inf_path)
+            table = cls.from_csv(csv_path, rules)
+            meta = {'terminals': table.terminals, 'nonterminals': table.nonterminals,
+                    'n_states': table.n_states,
+                    'rules': [[n, size, head] for n, (size, head) in rules.items()]}
+            arrays = {'action': table.action, 'goto': table.goto,
+                      'rule_size': table.rule_size, 'rule_head': table.rule_head}
+            return meta, arrays
+
+        if cache_path is None:
+            cache_path = csv_path + '.cache'
+        meta, arrays = table_cache.cached(cache_path, [csv_path, inf_path], build)
+        return cls.from_cache(meta, arrays)
+
+    @classmethod
+    def from_cache(cls, meta, arrays):
+        """(tabla, reglas) a partir de los metadatos y arreglos guardados en la caché."""
+        table = cls.__new__(cls)
+        table._set_symbols(meta['terminals'], meta['nonterminals'])
+        table.n_states = meta['n_states']
+        table.action, table.goto = arrays['action'], arrays['goto']
+        table.rule_size, table.rule_head = arrays['rule_size'], arrays['rule_head']
+        rules = {n: (size, head) for n, size, head in meta['rules']}
+        return table, rules
+
+class UnitChains:
+    """
+    Cadenas de reducciones unitarias (<A> ::= <B>) de un DenseTable,
+    precalculadas para que la transición que sigue a una reducción
+    llegue de una vez al estado final de la cadena.
+
+    Después de ir de p a q con el no terminal A, si con el preanálisis t
+    la acción de q es reducir por una regla de un símbolo X ::= A, esa
+    reducción saca solo a q y vuelve a p, así que su resultado es
+    goto(p, X) y no depende del resto de la pila. Para cada transición
+    (p, A) y terminal t se sigue la cadena hasta un estado cuya acción
+    con t no sea una reducción unitaria.
+
+    goto: copia de table.goto donde las transiciones con alguna cadena
+          valen -2 - fila (-1 sigue siendo "ninguna")
+    target[fila + t]: estado final con el preanálisis t
+    sequence[fila + t]: índice en `chains` de las reglas aplicadas, en
+          orden (0 = ninguna; chains[0] es la tupla vacía)
+    """
+    def __init__(self, table):
+        n_terminals, n_nonterminals = table.n_terminals, table.n_nonterminals
+        action, rule_size, rule_head = table.action, table.rule_size, table.rule_head
+        self.goto = array('i', table.goto)
+        self.target = array('i')
+        self.sequence = array('i')
+        self.chains = [()]
+        numbers = {(): 0}
+        for index, first in enumerate(table.goto):
+            if first < 0:
+                continue
+            below = index // n_nonterminals
+            targets, sequences = [], []
+            for kind in range(n_terminals):
+                state, rules = first, []
+                while len(rules) <= n_nonterminals:
+                    code = action[state * n_terminals + kind]
+                    if code >= -1 or rule_size[-code - 1] != 1:
+                        break
+                    next_state = table.goto[below * n_nonterminals + rule_head[-code - 1]]
+                    if next_state < 0:
+                        break  # el error se informa al reducir normalmente
+                    rules.append(-code - 1)
+                    state = next_state
+                rules = tuple(rules)
+                if rules not in numbers:
+                    numbers[rules] = len(self.chains)
+                    self.chains.append(rules)
+                targets.append(state)
+                sequences.append(numbers[rules])
+            if any(sequences):
+                self.goto[index] = -2 - len(self.target)
+                self.target.extend(targets)
+                self.sequence.extend(sequences)
+
+    def rules(self, goto_code, kind):
+        """Reglas de la cadena para el código de `goto` y el terminal `kind`."""
+        return self.chains[self.sequence[-2 - goto_code + kind]]
+
+def _step_kind(code):
+    # Tipo de paso para la traza según el código de la acción
+    if code > 0:
+        return 'shift'
+    if code < -1:
+        return 'reduce'
+    return 'accept' if code == -1 else 'error'
+
+def _format_step(stack, window, code, head=None, chain=()):
+    rule = f"{head} ← ..." if head is not None else None
+    if chain:
+        rule += f" (en cadena: {', '.join(f'R{n}' for n in chain)})"
+    return format_stack(stack, window, DenseTable.describe(code), rule)
+
+# Con `ring`, cada paso se guarda como (estado, token, código): la pila y
+# la entrada de los pasos guardados se reconstruyen solo si se imprimen
+# (ver _expand_ring). Una reducción guarda además los estados y símbolos
+# que saca (_ring_reduce), y la línea que sigue a la reducción, la cabeza
+# y la cadena.
+
+def _ring_step(state, token, code):
+    return f"Estado: {state} | Token: {token[1]} | Acción: {DenseTable.describe(code)}"
+
+def _ring_reduce(state, token, code, states, symbols):
+    return (f"{_ring_step(state, token, code)} | Saca: {' '.join(map(str, states))} "
+            f"({' '.join(map(str, symbols))})")
+
+def _ring_reduced(code, head, chain=()):
+    return f"Acción: {DenseTable.describe(code)} -> {head} ← ..."
+
+def _expand_ring(ring, states, symbols, window):
+    """
+    Cambia los pasos guardados en `ring` por los mismos pasos de la traza
+    full. Se recorren del último al primero deshaciendo cada uno sobre
+    una copia de la pila final (`states`, `symbols`) y de la entrada que
+    queda (`window`).
+    """
+    states, symbols = list(states), list(symbols)
+    steps = []
+    for fmt, args in reversed(ring):
+        if fmt is _ring_reduced:
+            code, head, chain = args
+            steps.append((_format_step, (LRParser._trace_stack(states, symbols), _cut_window(window),
+                                         code, head, chain)))
+            del states[-1], symbols[-1]
+            continue
+        if fmt is _ring_reduce:
+            state, token, code, popped_states, popped_symbols = args
+            states.extend(popped_states)
+            symbols.extend(popped_symbols)
+        else:
+            state, token, code = args
+            if code > 0:
+                del states[-1], symbols[-1]
+                window = [token] + window[:TRACE_LOOKAHEAD]
+        steps.append((_format_step, (LRParser._trace_stack(states, symbols), _cut_window(window), code)))
+    ring.clear()
+    ring.extend(reversed(steps))
 
 class LRParser:
-    def __init__(self, table, rules):
+    def __init__(self, table, rules, collapse_units=False):
+        """
+        `table` es un DenseTable o la tabla de pandas, que se compila aquí
+        una sola vez; `rules` es {n: (tamaño, cabeza)} (ver load_inf_rules).
+        Con `collapse_units` las cadenas de reducciones unitarias se hacen
+        en un solo paso (ver UnitChains).
+        """
+        if not isinstance(table, DenseTable):
+            table = DenseTable.from_frame(table, rules)
         self.table = table
         self.rules = rules
+        self.units = UnitChains(table) if collapse_units else None
+
+    def parse(self, tokens, trace=True):
+        """
+        Analiza `tokens`, una lista o cualquier iterable (p. ej. el generador
+        del lexer) de pares (tipo, lexema): los tokens se piden a medida que
+        se necesitan, así que un error de sintaxis detiene también el
+        análisis léxico. El tipo es el id entero de lexer.token_map o el
+        nombre del terminal.
+
+        `trace` es un tracer.Tracer, un nivel ('off', 'summary', 'full') o
+        un bool (True = 'full'). Sin traza se usa un ciclo que solo guarda
+        los estados.
+        """
+        tracer = make_tracer(trace)
+        if not tracer.enabled:
+            return self._parse_fast(tokens)
+        tracer.start()
+        try:
+            accepted = self._parse_traced(tokens, tracer)
+        except SyntaxError:
+            tracer.finish(False)
+            raise
+        tracer.finish(True)
+        return accepted
+
+    def _parse_traced(self, tokens, tracer):
+        table = self.table
+        action, goto = table.action, self._goto()
+        n_terminals, n_nonterminals = table.n_terminals, table.n_nonterminals
+        rule_size, rule_head = table.rule_size, table.rule_head
+        terminal_ids = table.terminal_ids
+        units = self.units
+        full = tracer.full
+        ring = tracer.ring
+        stack = LRStack()
+        states, symbols = stack.states, stack.values
+        tokens = TokenBuffer(tokens)
+        advance = tokens.advance
+        token = tokens.peek()
+
+        try:
+            while True:
+                if token is None:
+                    raise SyntaxError("Fin de entrada inesperado")
+                kind = token[0]
+                if kind.__class__ is not int:
+                    kind = terminal_ids.get(kind, n_terminals)
+                if not 0 <= kind < n_terminals:
+                    raise SyntaxError(f"Token desconocido: {token}")
+                state = states[-1]
+                code = action[state * n_terminals + kind]
+
+                if ring is not None:
+                    if code < -1:
+                        size = rule_size[-code - 1]
+                        tracer.step('reduce', _ring_reduce, state, token, code,
+                                    states[len(states) - size:], symbols[len(symbols) - size:])
+                    else:
+                        tracer.step(_step_kind(code), _ring_step, state, token, code)
+                elif full:
+                    tracer.step(_step_kind(code), _format_step, self._trace_stack(states, symbols),
+                                input_window(tokens), code)
+                else:
+                    tracer.count(_step_kind(code))
+
+                if code > 0:
+                    stack.push(code - 1, token[0])
+                    token = advance()
+
+                elif code < -1:
+                    rule = -code - 1
+                    stack.pop(rule_size[rule])
+                    head = rule_head[rule]
+                    state = states[-1]
+                    next_state = goto[state * n_nonterminals + head]
+                    chain = ()
+                    if next_state < -1:
+                        chain = units.rules(next_state, kind)
+                        next_state = units.target[-2 - next_state + kind]
+                        head = rule_head[chain[-1]] if chain else head
+                    elif next_state < 0:
+                        raise SyntaxError(f"No hay transición para {table.nonterminals[head]} desde estado {state}")
+                    stack.push(next_state, table.nonterminals[head])
+                    if ring is not None:
+                        tracer.step(None, _ring_reduced, code, table.nonterminals[head], chain)
+                    elif full:
+                        tracer.step(None, _format_step, self._trace_stack(states, symbols),
+                                    input_window(tokens), code, table.nonterminals[head], chain)
+
+                elif code == -1:
+                    print("✅ Cadena aceptada")
+                    return True
+
+                else:
+                    raise SyntaxError(f"Token inesperado: {token}")
+        except SyntaxError:
+            if ring:
+                _expand_ring(ring, states, symbols, tokens.window(TRACE_LOOKAHEAD + 1))
+            raise
+
+    def _parse_fast(self, tokens):
+        # Mismo autómata que parse(), sin traza: la pila son solo estados,
+        # la entrada se recorre directamente y cada token se desplaza tras
+        # las reducciones que provoca
+        table = self.table
+        action, goto = table.action, self._goto()
+        chain_target = self.units.target if self.units else None
+        n_terminals, n_nonterminals = table.n_terminals, table.n_nonterminals
+        rule_size, rule_head = table.rule_size, table.rule_head
+        terminal_ids = table.terminal_ids
+        states = [0]
+        push = states.append
+        state = 0
+
+        for token in tokens:
+            kind = token[0]
+            if kind.__class__ is not int:
+                kind = terminal_ids.get(kind, n_terminals)
+            if not 0 <= kind < n_terminals:
+                raise SyntaxError(f"Token desconocido: {token}")
+            while True:
+                code = action[state * n_terminals + kind]
+                if code > 0:
+                    state = code - 1
+                    push(state)
+                    break
+                if code < -1:
+                    rule = -code - 1
+                    size = rule_size[rule]
+                    if size:
+                        del states[-size:]
+                    head = rule_head[rule]
+                    state = goto[states[-1] * n_nonterminals + head]
+                    if state < 0:
+                        if state == -1:
+                            raise SyntaxError(f"No hay transición para {table.nonterminals[head]} desde estado {states[-1]}")
+                        # Cadena de reducciones unitarias: directo al estado final
+                        state = chain_target[-2 - state + kind]
+                    push(state)
+                elif code == -1:
+                    print("✅ Cadena aceptada")
+                    return True
+                else:
+                    raise SyntaxError(f"Token inesperado: {token}")
+        raise SyntaxError("Fin de entrada inesperado")
+
+    def _goto(self):
+        return self.units.goto if self.units else self.table.goto
 
-    def parse(self, tokens):
-        stack = [0]
-        idx = 0
-
-        while True:
-            state = stack[-1]
-            current_token = tokens[idx][0]
-            action = self.table.loc[str(state), current_token]
-
-            print_stack(stack, tokens[idx:], action)
-
-            if not action:
-                raise SyntaxError(f"Token inesperado: {tokens[idx]}")
-
-            if action.startswith('s'):
-                next_state = int(action[1:])
-                stack.extend([current_token, next_state])
-                idx += 1
-
-            elif action.startswith('r'):
-                rule_num = int(action[1:])
-                size, head = self.rules[rule_num]
-                for _ in range(size * 2):
-                    stack.pop()
-                state = stack[-1]
-                goto = self.table.loc[str(state), head]
-                if goto == '':
-                    raise SyntaxError(f"No hay transición para {head} desde estado {state}")
-                stack.extend([head, int(goto)])
-                print_stack(stack, tokens[idx:], action, rule=f"{head} ← ...")
-
-            elif action == 'acc':
-                print("✅ Cadena aceptada")
-                break
+    @staticmethod
+    def _trace_stack(states, symbols):
+        # Pila como se mostraba antes: estado, símbolo, estado, ...
+        stack = [states[0]]
+        for symbol, state in zip(symbols, states[1:]):
+            stack.extend((symbol, state))
+        return stack
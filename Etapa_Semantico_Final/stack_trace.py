@@ -1,4 +1,4 @@
-def print_stack(stack, tokens, action, rule=None):
+def format_stack(stack, tokens, action, rule=None):
     stack_str = ' '.join(str(s) for s in stack)
     token_str = ' '.join(tok[1] for tok in tokens)
     if action.startswith('s'):
@@ -9,4 +9,7 @@ def print_stack(stack, tokens, action, rule=None):
         action_str = 'Accept'
     else:
         action_str = action
-    print(f"PILA: [{stack_str}] | Entrada: [{token_str}] | Acción: {action_str} {f'-> {rule}' if rule else ''}")
+    return f"PILA: [{stack_str}] | Entrada: [{token_str}] | Acción: {action_str} {f'-> {rule}' if rule else ''}"
+
+def print_stack(stack, tokens, action, rule=None):
+    print(format_stack(stack, tokens, action, rule))
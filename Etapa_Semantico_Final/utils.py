@@ -1,6 +1,6 @@
-import pandas as pd
-
 def load_lr_table(path):
+    # pandas solo se carga si se usa la tabla como DataFrame
+    import pandas as pd
     return pd.read_csv(path, index_col=0).fillna('')
 
 def load_grammar(path):
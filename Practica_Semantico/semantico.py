@@ -4,15 +4,48 @@
 import re
 import sys
 import csv
-from tabulate import tabulate  # Para generar tablas bonitas en la salida
+import argparse
+import contextlib
+import io
+import json
+import os
+import time
+from array import array
+
+# Los módulos que comparten las etapas están en ../comun
+_RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _RAIZ not in sys.path:
+    sys.path.append(_RAIZ)
+
+from comun import table_cache
+from comun.lr_runtime import LRStack
+from comun.name_table import NameTable
+from comun.packed_table import PackedTable
+from comun.dfa_lexer import compile_spec
+from comun.incremental_lexer import relex as _relex
+from comun.parallel_lexer import MIN_SHARD_SIZE, tokenize_parallel
+from comun.token_buffer import TokenBuffer
+from comun.token_stream import TokenStream
+from comun.tracer import make_tracer
 
 # --- Token Class ---
 class Token:
-    def __init__(self, tipo, valor, linea, columna):
+    def __init__(self, tipo, valor, linea, columna, nombre_id=None):
         self.tipo = tipo
         self.valor = valor
         self.linea = linea
         self.columna = columna
+        # Id del nombre en la NameTable del lexer (solo los ID)
+        self.nombre_id = nombre_id
+
+    # Nombres que usa el parser LR (Parser)
+    @property
+    def type(self):
+        return self.tipo
+
+    @property
+    def value(self):
+        return self.valor
 
     def __str__(self):
         return f"Token({self.tipo}, '{self.valor}', {self.linea}, {self.columna})"
@@ -22,12 +55,19 @@ class Token:
 
 # --- Lexer Class ---
 class AnalizadorLexico:
-    def __init__(self, codigo_fuente):
+    def __init__(self, codigo_fuente, nombres=None, linea_inicial=1, backend='re'):
         self.codigo_fuente = codigo_fuente
+        # 're' (expresión maestra) o 'dfa' (AFD de comun.dfa_lexer, mismos tokens)
+        self.backend = backend
+        # Tabla de nombres de la compilación; los identificadores se internan aquí
+        self.nombres = nombres if nombres is not None else NameTable()
+        # Línea donde empieza el código (mayor que 1 si es un fragmento)
+        self.linea_inicial = linea_inicial
         self.posicion = 0
-        self.linea = 1
+        self.linea = linea_inicial
         self.columna = 1
         self.tokens = []
+        self.errores = [] # Mensajes de error léxico, además de imprimirse
         self.palabras_reservadas = {
             'int': 'TIPO_DATO',
             'char': 'TIPO_DATO',
@@ -50,8 +90,8 @@ class AnalizadorLexico:
             (r'[a-zA-Z_][a-zA-Z0-9_]*', 'ID'),
             (r'\d+\.\d+', 'NUM_FLOAT'),
             (r'\d+', 'NUM_INT'),
-            (r'"[^"]*"', 'CADENA'), # Strings
-            (r"'([^'\\]|\\.)'", 'CARACTER'), # Caracteres (incluyendo escapes)
+            (r'"[^"\n]*"', 'CADENA'), # Strings (de una sola línea)
+            (r"'([^'\\\n]|\\.)'", 'CARACTER'), # Caracteres (incluyendo escapes)
             (r'<=', 'OP_RELAC'),
             (r'>=', 'OP_RELAC'),
             (r'==', 'OP_IGUALDAD'),
@@ -72,62 +112,202 @@ class AnalizadorLexico:
             # Agregar otros operadores o puntuación según la gramática si son necesarios
         ]
 
-    def analizar(self):
-        """Realiza el análisis léxico y devuelve la lista de tokens."""
-        lineas = self.codigo_fuente.splitlines()
-        self.codigo_fuente = self.codigo_fuente + '\n' # Asegurar que termina con newline para comentarios
-
-        for self.linea, linea_texto in enumerate(lineas, 1):
-            self.columna = 1
-            linea_texto = linea_texto + '\n' # Procesar línea por línea
-
-            while self.columna -1 < len(linea_texto): # -1 porque columna es 1-based
-
-                found_match = False
-                for pattern in self.patrones:
-                    regex = re.compile(pattern[0])
-                    match = regex.match(linea_texto, self.columna -1) # Match desde la columna actual
-
-                    if match:
-                        found_match = True
-                        valor = match.group(0)
-                        token_type_def = pattern[1]
-                        flags = pattern[2] if len(pattern) > 2 else 0
-
-                        if token_type_def is not None: # No es espacio o comentario
-                            tipo = None
-                            if isinstance(token_type_def, str):
-                                tipo = token_type_def
-                            elif callable(token_type_def):
-                                tipo = token_type_def(valor)
-
-                            # Manejo de palabras reservadas que no están en la lista directa
-                            if tipo == 'ID' and valor in self.palabras_reservadas:
-                                tipo = self.palabras_reservadas[valor]
-
-                            self.tokens.append(Token(tipo, valor, self.linea, self.columna))
-
-                        # Actualizar posición y columna
-                        chars_consumed = len(valor)
-                        self.columna += chars_consumed
-                        self.posicion += chars_consumed # Mantener posición global si es necesario, aunque no se usa mucho
-
-                        # Si el patrón era para toda la línea (como comentarios de línea), salir del inner loop
-                        if flags == re.DOTALL and valor.endswith('\n'):
-                             break
-
-                        break # Pasar al siguiente carácter de la línea actual
-
-                if not found_match:
-                     # Carácter no reconocido en la línea actual
-                    error_char = linea_texto[self.columna -1]
-                    print(f"Error léxico: Carácter inesperado '{error_char}' en línea {self.linea}, columna {self.columna}", file=sys.stderr)
-                    self.columna += 1 # Avanzar para intentar encontrar más errores
-                    # En un compilador real, podrías querer salir o intentar recuperarte
+    def analizar(self, flujo=False, eof=True):
+        """
+        Realiza el análisis léxico y devuelve la lista de tokens. Con
+        flujo=True devuelve un TokenStream (tokens guardados por columnas).
+        Con eof=False no se agrega el token EOF (fragmentos intermedios).
+        """
+        if not flujo:
+            tokens = self.tokens
+            tokens.extend(self.iterar())
+            if not eof:
+                tokens.pop()
+            return tokens
+
+        codigo = self.codigo_fuente
+        canonico = self.nombres.canonical
+        tokens = self.tokens = TokenStream(codigo, Token)
+        agregar = tokens.add
+        for tipo, inicio, fin, linea, columna in self.escanear(codigo):
+            if tipo == 'ID':
+                canonico(codigo[inicio:fin])
+            agregar(tipo, inicio, fin, linea, columna)
+        self.linea, self.columna = self.posicion_eof(codigo, self.linea)
+        if eof:
+            tokens.add('EOF', len(codigo), len(codigo), self.linea, self.columna)
+        return tokens
+
+    def iterar(self):
+        """
+        Genera los Token uno por uno (con el EOF al final), a medida que se
+        piden, para que el parser no espere a que termine el análisis léxico.
+        """
+        codigo = self.codigo_fuente
+        internar = self.nombres.intern
+        nombres = self.nombres.names
+        for tipo, inicio, fin, linea, columna in self.escanear(codigo):
+            if tipo == 'ID':
+                # El id queda en el token; la tabla de símbolos lo usa como clave
+                nombre_id = internar(codigo[inicio:fin])
+                yield Token(tipo, nombres[nombre_id], linea, columna, nombre_id)
+            else:
+                yield Token(tipo, codigo[inicio:fin], linea, columna)
+        self.linea, self.columna = self.posicion_eof(codigo, self.linea)
+        yield Token('EOF', '', self.linea, self.columna)
+
+    def escanear(self, codigo, pos=0, linea=None, inicio_linea=0):
+        r"""
+        Genera (tipo, inicio, fin, línea, columna) por cada token de `codigo`
+        desde `pos`, que debe ser el inicio de un token; `linea` es su línea
+        e `inicio_linea` la posición donde esta empieza. Al terminar deja en
+        self.linea la última línea del código.
+
+        Las líneas terminan solo en '\n' ('\r\n' incluido), como en el
+        resto de los lexers del proyecto. El análisis anterior, línea por
+        línea con splitlines(), también cortaba en un '\r' suelto, '\v',
+        '\f', '\x1c'-'\x1e', '\x85', '\u2028' y '\u2029'; ahora son
+        espacios, así que no cambian de línea y un comentario // llega
+        hasta el siguiente '\n'. Además, un comentario /* */ puede ocupar
+        varias líneas.
+        """
+        regex = compilar_patrones(self.patrones, self.backend)
+        # Tipo de token por número de grupo: str, callable o None (se ignora)
+        tipos = [None] + [patron[1] for patron in self.patrones]
+        reservadas = self.palabras_reservadas
+        if linea is None:
+            linea = self.linea_inicial
+
+        for match in regex.finditer(codigo, pos):
+            inicio, fin = match.span()
+            if inicio != pos:
+                # Caracteres no reconocidos (finditer los salta de uno en uno)
+                self.reportar_errores(codigo, pos, inicio, linea, inicio_linea)
+            tipo = tipos[match.lastindex]
+
+            if tipo is not None: # No es espacio o comentario
+                if callable(tipo):
+                    tipo = tipo(match.group())
+                # Manejo de palabras reservadas que no están en la lista directa
+                elif tipo == 'ID':
+                    tipo = reservadas.get(match.group(), 'ID')
+                yield tipo, inicio, fin, linea, inicio - inicio_linea + 1
+            else:
+                # Espacios y comentarios (incluso /* */ de varias líneas) pueden cruzar líneas
+                ultimo = codigo.rfind('\n', inicio, fin)
+                if ultimo >= 0:
+                    linea += codigo.count('\n', inicio, fin)
+                    inicio_linea = ultimo + 1
+            pos = fin
+        if pos != len(codigo):
+            self.reportar_errores(codigo, pos, len(codigo), linea, inicio_linea)
+        self.posicion = len(codigo)
+        self.linea = linea
 
-        # Agregar token de fin de archivo
-        self.tokens.append(Token('EOF', '', self.linea, self.columna))
-        return self.tokens
+    def posicion_eof(self, codigo, ultima_linea):
+        """
+        Línea y columna del token EOF, que va después de la última línea como
+        si terminara en salto de línea. `ultima_linea` es la línea del final
+        del código.
+        """
+        if not codigo:
+            return self.linea_inicial, 1
+        fin = len(codigo)
+        for salto in ('\r\n', '\n', '\r'):
+            if codigo.endswith(salto):
+                fin -= len(salto)
+                if '\n' in salto:
+                    ultima_linea -= 1
+                break
+        return ultima_linea, fin - codigo.rfind('\n', 0, fin) + 1
+
+    def reportar_errores(self, codigo, inicio, fin, linea, inicio_linea):
+        for pos in range(inicio, fin):
+            self.linea = linea
+            self.columna = pos - inicio_linea + 1
+            mensaje = f"Error léxico: Carácter inesperado '{codigo[pos]}' en línea {self.linea}, columna {self.columna}"
+            self.errores.append(mensaje)
+            print(mensaje, file=sys.stderr)
+
+
+# Construcciones que pueden contener saltos de línea o delimitadores de
+# comentario; los cortes para el análisis en paralelo las evitan
+PATRON_PROTEGIDO = re.compile(r'//[^\n]*|(?s:/\*.*?\*/)|"[^"\n]*"|\'(?:[^\'\\\n]|\\.)\'')
+
+
+def analizar_fragmento(fragmento, linea_inicial=1, ultimo=True):
+    """Analiza un fragmento que empieza en `linea_inicial` (para tokenize_parallel)."""
+    lexer = AnalizadorLexico(fragmento, linea_inicial=linea_inicial)
+    return lexer.analizar(flujo=True, eof=ultimo)
+
+
+def analizar_en_paralelo(codigo, procesos=None, min_shard_size=MIN_SHARD_SIZE):
+    """
+    Igual que AnalizadorLexico(codigo).analizar(flujo=True), repartiendo el
+    código entre `procesos` procesos, con fragmentos de al menos
+    `min_shard_size` caracteres. Los cortes se hacen en saltos de línea
+    fuera de comentarios de bloque; los errores léxicos se imprimen en el
+    mismo orden que en el análisis secuencial.
+    """
+    return tokenize_parallel(codigo, analizar_fragmento, procesos, PATRON_PROTEGIDO,
+                             min_shard_size, eof=True)
+
+
+def relex(tokens, edit_offset, deleted_len, inserted_text, linea_inicial=1):
+    """
+    Actualiza el TokenStream de analizar(flujo=True) tras reemplazar
+    `deleted_len` caracteres en `edit_offset` por `inserted_text`. Solo se
+    vuelve a analizar alrededor de la edición (ver incremental_lexer.relex);
+    los errores léxicos de esa zona se imprimen de nuevo.
+    """
+    def escanear(codigo, pos, linea, inicio_linea):
+        lexer = AnalizadorLexico(codigo, linea_inicial=linea_inicial)
+        yield from lexer.escanear(codigo, pos, linea, inicio_linea)
+        linea, columna = lexer.posicion_eof(codigo, lexer.linea)
+        yield 'EOF', len(codigo), len(codigo), linea, columna
+
+    resultado = _relex(tokens, edit_offset, deleted_len, inserted_text, escanear,
+                       ('/*', '*/'), linea_inicial)
+    # La columna del EOF depende de la última línea aunque esta no se haya
+    # vuelto a analizar (de posicion_eof solo se usa la columna)
+    ultimo = len(tokens) - 1
+    lexer = AnalizadorLexico(tokens.code, linea_inicial=linea_inicial)
+    tokens.columns[ultimo] = lexer.posicion_eof(tokens.code, tokens.line(ultimo))[1]
+    return resultado
+
+
+# Expresiones maestras ya compiladas, una por lista de patrones
+_patrones_compilados = {}
+_FLAGS_EN_LINEA = {re.DOTALL: 's', re.IGNORECASE: 'i', re.MULTILINE: 'm'}
+
+def _sin_capturas(patron):
+    """Convierte los grupos '(' de un patrón en '(?:'."""
+    return re.sub(r'(?<!\\)((?:\\\\)*)\((?!\?)', r'\1(?:', patron)
+
+def compilar_patrones(patrones, backend='re'):
+    """
+    Une la lista de patrones en una sola expresión con un grupo por patrón
+    (P0..Pn), respetando el orden: el primero que coincide gana, igual que
+    probarlos uno por uno. Los grupos internos de cada patrón se vuelven no
+    capturantes, así `lastindex` es el número del patrón más uno.
+    Las flags de cada patrón se aplican solo a su grupo.
+    Con backend='dfa' devuelve el AFD de comun.dfa_lexer para los mismos
+    patrones, que da las mismas coincidencias con el mismo `lastindex`.
+    """
+    clave = tuple((p[0], p[2] if len(p) > 2 else 0) for p in patrones)
+    if backend == 'dfa':
+        return compile_spec([(f'P{i}', patron, flags) for i, (patron, flags) in enumerate(clave)])
+    compilado = _patrones_compilados.get(clave)
+    if compilado is None:
+        partes = []
+        for i, (patron, flags) in enumerate(clave):
+            letras = ''.join(letra for flag, letra in _FLAGS_EN_LINEA.items() if flags & flag)
+            if letras:
+                patron = f'(?{letras}:{patron})'
+            partes.append(f'(?P<P{i}>{_sin_capturas(patron)})')
+        compilado = re.compile('|'.join(partes))
+        _patrones_compilados[clave] = compilado
+    return compilado
 
 
 # --- AST Node Class ---
@@ -168,10 +348,12 @@ class NodoAST:
 
 # --- Symbol Table Class ---
 class TablaSimbolo:
-    def __init__(self, errores_list):
+    def __init__(self, errores_list, nombres=None):
         # Usando un stack para manejar ámbitos anidados
         self.ambitos = [{}] # El primer dict es el ámbito global
         self.errores_list = errores_list # Lista compartida de errores
+        # Los ámbitos usan como clave el id del nombre en la NameTable
+        self.nombres = nombres if nombres is not None else NameTable()
 
     def entrar_ambito(self, nombre_ambito="local"):
         """Crea un nuevo ámbito en el stack."""
@@ -187,15 +369,17 @@ class TablaSimbolo:
             # print("Advertencia: Intentando salir del ámbito global.") # Debugging
 
 
-    def insertar(self, nombre, tipo, categoria, token=None):
+    def insertar(self, nombre_id, tipo, categoria, token=None):
         """
-        Inserta un símbolo en el ámbito actual.
+        Inserta un símbolo en el ámbito actual. `nombre_id` es el id del
+        nombre en self.nombres (el que el lexer dejó en el token).
         Retorna True si la inserción fue exitosa (no redeclaración), False en caso contrario.
         """
         ambito_actual = self.ambitos[-1]
         nivel_actual = len(self.ambitos) - 1
+        nombre = self.nombres.names[nombre_id]
 
-        if nombre in ambito_actual:
+        if nombre_id in ambito_actual:
             # Error: Redeclaración en el ámbito actual
             error_msg = f"Error semántico: Redeclaración de '{nombre}' en el ámbito actual."
             if token:
@@ -204,7 +388,7 @@ class TablaSimbolo:
             # print(error_msg) # Debugging
             return False
         else:
-            ambito_actual[nombre] = {
+            ambito_actual[nombre_id] = {
                 "nombre": nombre,
                 "tipo": tipo, # Tipo de dato ('int', 'float', etc.)
                 "categoria": categoria, # 'variable', 'funcion', 'parametro'
@@ -214,22 +398,22 @@ class TablaSimbolo:
             # print(f"Insertado: {nombre} ({categoria}: {tipo}) en nivel {nivel_actual}") # Debugging
             return True
 
-    def buscar(self, nombre):
+    def buscar(self, nombre_id):
         """
-        Busca un símbolo desde el ámbito actual hacia arriba (global).
+        Busca un símbolo (por el id de su nombre) desde el ámbito actual hacia arriba (global).
         Retorna el diccionario del símbolo si lo encuentra, None en caso contrario.
         """
-        for i in range(len(self.ambitos) -1, -1, -1):
-            if nombre in self.ambitos[i]:
-                # print(f"Encontrado: {nombre} en nivel {i}") # Debugging
-                return self.ambitos[i][nombre]
+        for ambito in reversed(self.ambitos):
+            simbolo = ambito.get(nombre_id)
+            if simbolo is not None:
+                return simbolo
         # print(f"No encontrado: {nombre}") # Debugging
         return None
 
-    def buscar_en_ambito_actual(self, nombre):
-        """Busca un símbolo solo en el ámbito actual."""
+    def buscar_en_ambito_actual(self, nombre_id):
+        """Busca un símbolo (por el id de su nombre) solo en el ámbito actual."""
         ambito_actual = self.ambitos[-1]
-        return ambito_actual.get(nombre)
+        return ambito_actual.get(nombre_id)
 
 
     def muestra(self):
@@ -240,8 +424,8 @@ class TablaSimbolo:
             if not ambito:
                 print("  (Vacío)")
             else:
-                for nombre, simbolo in ambito.items():
-                    print(f"  {nombre}: {simbolo}")
+                for simbolo in ambito.values():
+                    print(f"  {simbolo['nombre']}: {simbolo}")
         print("--------------------")
 
 
@@ -281,7 +465,7 @@ class NodoDeclaracionVariable(NodoAST):
         # No validar id_nodo aquí, solo se usa su valor
 
         tipo_str = self.hijos[0].valor # 'int', 'float', etc.
-        id_nombre = self.hijos[1].valor # Nombre de la variable
+        id_nombre = self.hijos[1].nombre_id # Id del nombre de la variable
         id_token = getattr(self.hijos[1], 'token', None) # Obtener token original si está guardado
 
         # Insertar en la tabla de símbolos del ámbito actual
@@ -294,6 +478,7 @@ class NodoDeclaracionFuncion(NodoAST):
         self.agregar_hijo(tipo_nodo)      # hijo[0] = tipo retorno
         # No agregamos id_nodo como hijo directo del AST para no duplicar
         self.id_nombre = id_nodo.valor
+        self.nombre_id = id_nodo.nombre_id
         self.agregar_hijo(parametros_nodo) # hijo[1] = parametros
         self.agregar_hijo(bloque_nodo)     # hijo[2] = bloque
         self.return_type_str = tipo_nodo.valor # Guardar el tipo de retorno
@@ -305,7 +490,7 @@ class NodoDeclaracionFuncion(NodoAST):
 
         # Verificar si la función ya está declarada en el ámbito global
         # Asumimos que las funciones se declaran en el ámbito global
-        simbolo_existente = tabla_simbolos.buscar(self.id_nombre)
+        simbolo_existente = tabla_simbolos.buscar(self.nombre_id)
         if simbolo_existente and simbolo_existente['nivel'] == 0: # Nivel 0 es global
              errores.append(f"Error semántico: La función '{self.id_nombre}' ya está definida.")
              # No insertar si ya existe para evitar conflictos, pero continuar análisis
@@ -315,7 +500,7 @@ class NodoDeclaracionFuncion(NodoAST):
         # Nota: Esto solo inserta la función, no sus parámetros o variables locales aún.
         # La inserción debe ocurrir ANTES de entrar al ámbito de la función.
         if not simbolo_existente or simbolo_existente['nivel'] != 0: # Insertar solo si no estaba definida globalmente
-             tabla_simbolos.insertar(self.id_nombre, self.return_type_str, 'funcion') # Guardar tipo de retorno string
+             tabla_simbolos.insertar(self.nombre_id, self.return_type_str, 'funcion') # Guardar tipo de retorno string
 
         # Entrar al ámbito de la función
         tabla_simbolos.entrar_ambito(self.id_nombre)
@@ -342,7 +527,7 @@ class NodoFuncionMain(NodoDeclaracionFuncion): # main es un tipo especial de fun
 
          # Insertar 'main' en la tabla de símbolos (ámbito global)
          # main no debería tener redeclaración si la gramática es correcta
-         tabla_simbolos.insertar('main', self.return_type_str, 'funcion') # Guardar tipo de retorno string
+         tabla_simbolos.insertar(self.nombre_id, self.return_type_str, 'funcion') # Guardar tipo de retorno string
 
          # Entrar al ámbito de main
          tabla_simbolos.entrar_ambito('main')
@@ -379,7 +564,7 @@ class NodoParametro(NodoAST):
          # No validar id_nodo
 
          tipo_str = self.hijos[0].valor
-         id_nombre = self.hijos[1].valor
+         id_nombre = self.hijos[1].nombre_id
          id_token = getattr(self.hijos[1], 'token', None) # Obtener token original
 
          # Insertar en la tabla de símbolos del ámbito actual (que debería ser el de la función)
@@ -438,7 +623,7 @@ class NodoAsignacion(NodoAST):
          var_token = getattr(id_nodo, 'token', None)
 
          # Buscar la variable en la tabla de símbolos (en cualquier ámbito visible)
-         simbolo_var = tabla_simbolos.buscar(var_nombre)
+         simbolo_var = tabla_simbolos.buscar(id_nodo.nombre_id)
 
          if not simbolo_var:
              errores.append(f"Error semántico: Uso de variable no declarada '{var_nombre}'.")
@@ -471,6 +656,7 @@ class NodoLlamadaFuncion(NodoAST): # Para sentencias como func();
          super().__init__('llamada_funcion', id_nodo.valor) # Valor es el nombre de la función
          self.agregar_hijo(argumentos_nodo) # hijo[0] = argumentos
          self.function_name = id_nodo.valor
+         self.nombre_id = id_nodo.nombre_id
          self.name_token = getattr(id_nodo, 'token', None)
 
      def validaTipos(self, tabla_simbolos, errores):
@@ -478,7 +664,7 @@ class NodoLlamadaFuncion(NodoAST): # Para sentencias como func();
          self.hijos[0].validaTipos(tabla_simbolos, errores) # Valida nodo 'argumentos'
 
          # Buscar la función en la tabla de símbolos
-         simbolo_func = tabla_simbolos.buscar(self.function_name)
+         simbolo_func = tabla_simbolos.buscar(self.nombre_id)
 
          if not simbolo_func or simbolo_func.get('categoria') != 'funcion':
              errores.append(f"Error semántico: Llamada a identificador no declarado o que no es función '{self.function_name}'.")
@@ -527,14 +713,14 @@ class NodoRetorno(NodoAST):
 
          enclosing_func_name = None
          for i in range(len(tabla_simbolos.ambitos) -1, -1, -1):
-             for name, simbolo in tabla_simbolos.ambitos[i].items():
+             for enclosing_func_id, simbolo in tabla_simbolos.ambitos[i].items():
                   if simbolo.get('categoria') == 'funcion':
-                       enclosing_func_name = name
+                       enclosing_func_name = simbolo['nombre']
                        break
              if enclosing_func_name: break # Encontró la función contenedora
 
          if enclosing_func_name:
-             func_symbol = tabla_simbolos.buscar(enclosing_func_name) # Buscar para obtener el tipo
+             func_symbol = tabla_simbolos.buscar(enclosing_func_id) # Buscar para obtener el tipo
              if func_symbol:
                  expected_return_type_str = func_symbol['tipo']
                  expected_return_type_char = get_char_tipo(expected_return_type_str)
@@ -703,13 +889,14 @@ class NodoExpresionUnaria(NodoAST): # opSuma (unario), opResta (unario), opNot
 
 
 class NodoId(NodoAST):
-     def __init__(self, valor, token=None):
+     def __init__(self, valor, token=None, nombre_id=None):
          super().__init__('id', valor)
          self.token = token # Guardar el token original para errores
+         self.nombre_id = nombre_id # Id del nombre en la NameTable (clave en la tabla de símbolos)
 
      def validaTipos(self, tabla_simbolos, errores):
          # Buscar el identificador en la tabla de símbolos
-         simbolo = tabla_simbolos.buscar(self.valor)
+         simbolo = tabla_simbolos.buscar(self.nombre_id)
 
          if not simbolo:
              errores.append(f"Error semántico: Uso de identificador no declarado '{self.valor}'.")
@@ -778,17 +965,19 @@ class NodoLlamadaFuncionExpr(NodoLlamadaFuncion): # Para llamadas dentro de expr
 
 class AnalizadorSintactico:
     def __init__(self, tokens):
-        self.tokens = tokens
+        # Lista o iterable de tokens; se piden al lexer a medida que se necesitan
+        self.tokens = TokenBuffer(tokens)
         self.posicion = 0
-        self.token_actual = self.tokens[0]
+        self.token_actual = self.tokens.peek()
         self.pila = [] # Para registro de la pila
         self.registro_pila = []
         self.contador_paso = 0
 
     def avanzar(self):
         self.posicion += 1
-        if self.posicion < len(self.tokens):
-            self.token_actual = self.tokens[self.posicion]
+        siguiente = self.tokens.advance()
+        if siguiente is not None:
+            self.token_actual = siguiente
         else:
              self.token_actual = Token('EOF', '', self.token_actual.linea, self.token_actual.columna + 1) # Asegurar EOF al final
         return self.token_actual
@@ -853,27 +1042,113 @@ class AnalizadorSintactico:
 # --- Parser Class (Based on the first implementation, LR) ---
 # Need to reintegrate the LR parser logic and add AST node creation during reductions.
 
+# Tipo de paso para la traza según la primera letra de la acción
+STEP_KINDS = {'d': 'shift', 'r': 'reduce', 'a': 'accept'}
+
+
 class Parser:
     def __init__(self, lexer, grammar, parsing_table):
         self.lexer = lexer
         self.grammar = grammar
         self.parsing_table = parsing_table
-        self.symbol_table = TablaSimbolo(errores_list=[]) # Symbol table for semantic analysis
+        self.symbol_table = TablaSimbolo(errores_list=[], nombres=lexer.nombres) # Symbol table for semantic analysis
         self.errors = self.symbol_table.errores_list # Use the same error list
-        self.stack = [0] # Stack of states for LR parsing
-        self.symbol_stack = [] # Stack to hold symbols (tokens or AST nodes) for AST building
-        self.tokens = [] # To be filled by lexer
+        # Pilas paralelas: estados del análisis LR y símbolos (tokens o nodos del AST)
+        self.stacks = LRStack()
+        self.stack = self.stacks.states # Stack of states for LR parsing
+        self.symbol_stack = self.stacks.values # Stack to hold symbols (tokens or AST nodes) for AST building
+        self.tokens = None # TokenBuffer sobre los tokens del lexer
         self.token_index = 0
         self.current_token = None # Current lookahead token
         self.ast_root = None # Root of the generated AST
 
-    def parse(self):
+    def parse(self, trace=True, tokens=None, semantic=True):
+        """
+        Análisis LR con construcción del AST. `trace` es un tracer.Tracer,
+        un nivel ('off', 'summary', 'full') o un bool (True = 'full').
+        `tokens` son los tokens ya obtenidos del lexer (por omisión se le
+        piden a medida que se necesitan). Con semantic=False no se hace el
+        análisis semántico al aceptar; queda para perform_semantic_analysis.
+        """
         print("Starting LR parsing...")
-        print(f"{'Stack (States)':<20} | {'Stack (Symbols)':<30} | {'Input':<30} | Action")
+        tracer = make_tracer(trace)
+        tracer.start(f"{'Stack (States)':<20} | {'Stack (Symbols)':<30} | {'Input':<30} | Action")
+        ok = False
+        try:
+            ok = self._parse(tracer, tokens, semantic)
+        finally:
+            if not ok and tracer.ring:
+                self._expand_ring(tracer.ring)
+            tracer.finish(ok)
+        return ok
+
+    def _format_step(self, states, symbols, window, action):
+        stack_state_str = ' '.join(map(str, states))
+        stack_symbol_str = ' '.join(map(str, symbols)) # Show symbols on stack
+        # Solo se muestran 30 caracteres de la entrada: bastan 15 tokens
+        input_str = ' '.join([t.value for t in window])
+        return f"{stack_state_str:<20} | {stack_symbol_str:<30.30} | {input_str:<30.30} | {self._action_text(action)}"
+
+    # Con `ring`, cada paso se guarda como (símbolos en la pila, token,
+    # acción); una reducción guarda además los estados y símbolos que va a
+    # sacar. La pila y la entrada se reconstruyen solo si se imprimen.
+
+    def _ring_step(self, depth, token, action):
+        return f"Pila: {depth} símbolo(s) | Token: {token.value} | {self._action_text(action)}"
+
+    def _ring_reduce(self, depth, token, action, states, symbols):
+        return (f"{self._ring_step(depth, token, action)} | Saca: {' '.join(map(str, states))} "
+                f"({' '.join(map(str, symbols))})")
+
+    def _expand_ring(self, ring):
+        """
+        Cambia los pasos guardados en `ring` por los mismos pasos de la
+        traza full. Se recorren del último al primero deshaciendo cada uno
+        sobre una copia de la pila y de la entrada que quedan; el último
+        puede haberse hecho a medias (p. ej. una reducción sin goto).
+        """
+        states, symbols = list(self.stack), list(self.symbol_stack)
+        window = self.tokens.window(15)
+        steps = []
+        for fmt, args in reversed(ring):
+            if fmt == self._ring_reduce:
+                depth, token, action, popped_states, popped_symbols = args
+            else:
+                depth, token, action = args
+                popped_states = popped_symbols = ()
+                if action is not None and action.startswith('d') and len(symbols) > depth:
+                    window = [token] + window[:14]
+            # Antes del paso la pila tenía `depth` símbolos, los de abajo
+            # más los que el paso sacó
+            keep = depth - len(popped_symbols)
+            del states[keep + 1:], symbols[keep:]
+            states.extend(popped_states)
+            symbols.extend(popped_symbols)
+            steps.append((self._format_step, (tuple(states), tuple(symbols), window, action)))
+        ring.clear()
+        ring.extend(reversed(steps))
+
+    def _action_text(self, action):
+        if action == 'acc':
+            return "Accept"
+        if action is not None and action.startswith('d'):
+            return f"Shift {action[1:]}"
+        if action is not None and action.startswith('r'):
+            rule = self.grammar.get_rule(int(action[1:]))
+            if rule is not None:
+                lhs, rhs = rule
+                return f"Reduce R{action[1:]}: <{lhs}> ::= {' '.join(rhs)}"
+        return ""
+
+    def _parse(self, tracer, tokens, semantic):
+        ring = tracer.ring
+        full = tracer.full and ring is None
+        counting = tracer.enabled and not tracer.full
 
         try:
-            self.tokens = self.lexer.tokenize()
-            self.current_token = self.tokens[self.token_index]
+            # Los tokens se piden al lexer a medida que el parser avanza
+            self.tokens = TokenBuffer(self.lexer.iterar() if tokens is None else tokens)
+            self.current_token = self.tokens.peek()
         except Exception as e:
              print(f"Lexical analysis failed: {e}", file=sys.stderr)
              return False # Stop if lexing fails
@@ -883,24 +1158,36 @@ class Parser:
             current_state = self.stack[-1]
             token_type = self.current_token.type
 
-            # Print current stack and input
-            stack_state_str = ' '.join(map(str, self.stack))
-            stack_symbol_str = ' '.join(map(str, self.symbol_stack)) # Show symbols on stack
-            input_str = ' '.join([t.value for t in self.tokens[self.token_index:]])
-            print(f"{stack_state_str:<20} | {stack_symbol_str:<30.30} | {input_str:<30.30} | ", end="") # Adjusted spacing
-
-
             action = self.parsing_table.get_action(current_state, token_type)
 
+            # Traza del paso: en full se imprime ya; con anillo solo se
+            # guarda lo necesario para reconstruirlo (ver _expand_ring)
+            if ring is not None:
+                kind = STEP_KINDS.get(action and action[0], 'error')
+                depth = len(self.symbol_stack)
+                rule = self.grammar.get_rule(int(action[1:])) if kind == 'reduce' else None
+                if rule is not None:
+                    size = min(len(rule[1]), depth)
+                    tracer.step(kind, self._ring_reduce, depth, self.current_token, action,
+                                self.stack[depth + 1 - size:], self.symbol_stack[depth - size:])
+                else:
+                    tracer.step(kind, self._ring_step, depth, self.current_token, action)
+            elif full:
+                tracer.step(STEP_KINDS.get(action and action[0], 'error'), self._format_step,
+                            self.stack, self.symbol_stack, self.tokens.window(15), action)
+            elif counting:
+                tracer.count(STEP_KINDS.get(action and action[0], 'error'))
+
             if action is None:
                 self.report_error(f"Syntax error: No action defined for state {current_state} and token {token_type} ('{self.current_token.value}')")
                 return False # Error
             elif action == 'acc':
-                print("Accept")
                 print("Parsing successful!")
                 # The root of the AST should be the single symbol left on the symbol stack
                 if len(self.symbol_stack) == 1:
                     self.ast_root = self.symbol_stack[0]
+                    if not semantic:
+                        return True
                     print("\nAST built. Starting semantic analysis...")
                     self.perform_semantic_analysis() # Perform semantic analysis after successful parse
                     return not self.errors # Return True if no semantic errors
@@ -910,12 +1197,11 @@ class Parser:
 
             elif action.startswith('d'):
                 state_to_push = int(action[1:])
-                print(f"Shift {state_to_push}")
-                self.stack.append(state_to_push) # Push state
-                self.symbol_stack.append(self.current_token) # Push token object onto symbol stack
+                self.stacks.push(state_to_push, self.current_token) # Push state and token object
                 self.token_index += 1 # Move to next token
-                if self.token_index < len(self.tokens):
-                    self.current_token = self.tokens[self.token_index]
+                siguiente = self.tokens.advance()
+                if siguiente is not None:
+                    self.current_token = siguiente
                 # else: current_token remains EOF
 
             elif action.startswith('r'):
@@ -928,21 +1214,12 @@ class Parser:
                 lhs, rhs = rule
                 len_rhs = len(rhs)
 
-                print(f"Reduce R{rule_number}: <{lhs}> ::= {' '.join(rhs)}")
-
-                # Pop 2 * len(rhs) elements from state stack
-                if len(self.stack) < 2 * len_rhs:
-                     self.report_error(f"Parser error: State stack underflow during reduction R{rule_number}.")
-                     return False
-                for _ in range(2 * len_rhs):
-                    self.stack.pop()
-
-                # Pop len(rhs) elements from symbol stack
-                if len(self.symbol_stack) < len_rhs:
-                     self.report_error(f"Parser error: Symbol stack underflow during reduction R{rule_number}.")
+                if len(self.stacks) < len_rhs:
+                     self.report_error(f"Parser error: Stack underflow during reduction R{rule_number}.")
                      return False
-                # Get the symbols/nodes that are being reduced
-                reduced_symbols = [self.symbol_stack.pop() for _ in range(len_rhs)][::-1] # Pop in reverse, then reverse back to correct order
+                # Get the symbols/nodes that are being reduced, in RHS order
+                # (the states and symbols go together; empty rules pop nothing)
+                reduced_symbols = self.stacks.pop(len_rhs)
 
                 # *** AST Node Creation and Semantic Actions During Reduction ***
                 new_node = self.create_ast_node_and_semantic_action(rule_number, lhs, reduced_symbols)
@@ -955,8 +1232,7 @@ class Parser:
                      self.report_error(f"Parsing error: No goto defined for state {new_current_state} and non-terminal <{lhs}>")
                      return False
 
-                self.stack.append(goto_state) # Push goto state
-                self.symbol_stack.append(new_node) # Push the new AST node onto the symbol stack
+                self.stacks.push(goto_state, new_node) # Push goto state and the new AST node
 
 
             else:
@@ -974,6 +1250,14 @@ class Parser:
         self.errors.append(error_message)
 
 
+    def _nodo_id(self, token):
+        # El lexer dejó el id del nombre en el token; los tokens que no
+        # vienen de iterar() (p. ej. de un TokenStream) se internan aquí
+        nombre_id = getattr(token, 'nombre_id', None)
+        if nombre_id is None:
+            nombre_id = self.symbol_table.nombres.intern(token.value)
+        return NodoId(token.value, token, nombre_id)
+
     def create_ast_node_and_semantic_action(self, rule_number, lhs, reduced_symbols):
         """
         Creates AST node for the reduction and performs associated semantic actions (like symbol table insertion).
@@ -1035,7 +1319,7 @@ class Parser:
              id_token = reduced_symbols[1]
              # ListaVar_node = reduced_symbols[2] # Can contain more ids if R8 is used
              # Create a node for variable declaration
-             new_node = NodoDeclaracionVariable(NodoTipoDato(tipo_token.value, tipo_token), NodoId(id_token.value, id_token))
+             new_node = NodoDeclaracionVariable(NodoTipoDato(tipo_token.value, tipo_token), self._nodo_id(id_token))
              # Note: Handling multiple variables from ListaVar in R8 reduction is needed if supported.
 
         elif rule_number == 9: # R9 <DefFunc> ::= tipo identificador ( <Parametros> ) <BloqFunc>
@@ -1046,9 +1330,9 @@ class Parser:
              bloqfunc_node = reduced_symbols[5] # This is likely the NodoBloque
              # Check if this is the main function
              if id_token.value == 'main':
-                 new_node = NodoFuncionMain(NodoTipoDato(tipo_token.value, tipo_token), NodoId(id_token.value, id_token), parametros_node, bloqfunc_node)
+                 new_node = NodoFuncionMain(NodoTipoDato(tipo_token.value, tipo_token), self._nodo_id(id_token), parametros_node, bloqfunc_node)
              else:
-                 new_node = NodoDeclaracionFuncion(NodoTipoDato(tipo_token.value, tipo_token), NodoId(id_token.value, id_token), parametros_node, bloqfunc_node)
+                 new_node = NodoDeclaracionFuncion(NodoTipoDato(tipo_token.value, tipo_token), self._nodo_id(id_token), parametros_node, bloqfunc_node)
 
         elif rule_number == 11: # R11 <Parametros> ::= tipo identificador <ListaParam>
              # This rule starts the parameters list. Need to collect params from ListaParam reductions.
@@ -1059,7 +1343,7 @@ class Parser:
              id_token = reduced_symbols[1]
              lista_param_node = reduced_symbols[2] # Can be NodoAST('<ListaParam>')
 
-             param_node = NodoParametro(NodoTipoDato(tipo_token.value, tipo_token), NodoId(id_token.value, id_token))
+             param_node = NodoParametro(NodoTipoDato(tipo_token.value, tipo_token), self._nodo_id(id_token))
 
              # How to add this parameter to the <Parametros> node?
              # The <Parametros> node is created by R9. The structure implies R11 reduces to <Parametros>.
@@ -1088,7 +1372,7 @@ class Parser:
                   id_token = reduced_symbols[2]
                   lista_param_rec_nodes = reduced_symbols[3] # This is the list from recursive <ListaParam>
 
-                  current_param_node = NodoParametro(NodoTipoDato(tipo_token.value, tipo_token), NodoId(id_token.value, id_token))
+                  current_param_node = NodoParametro(NodoTipoDato(tipo_token.value, tipo_token), self._nodo_id(id_token))
                   new_node = [current_param_node] + lista_param_rec_nodes # Combine lists
 
 
@@ -1099,7 +1383,7 @@ class Parser:
                   id_token = reduced_symbols[1]
                   lista_param_nodes = reduced_symbols[2] # This is the list from <ListaParam> reduction
 
-                  first_param_node = NodoParametro(NodoTipoDato(tipo_token.value, tipo_token), NodoId(id_token.value, id_token))
+                  first_param_node = NodoParametro(NodoTipoDato(tipo_token.value, tipo_token), self._nodo_id(id_token))
                   new_node = NodoParametros([first_param_node] + lista_param_nodes) # Create the Parametros node with collected params
 
              # R14 <BloqFunc> ::= { <DefLocales> }
@@ -1153,7 +1437,7 @@ class Parser:
                  # reduced_symbols: [id_token, assign_token, Expresion_node, semi_token]
                  id_token = reduced_symbols[0]
                  expresion_node = reduced_symbols[2]
-                 new_node = NodoAsignacion(NodoId(id_token.value, id_token), expresion_node)
+                 new_node = NodoAsignacion(self._nodo_id(id_token), expresion_node)
 
              # R22 <Sentencia> ::= if ( <Expresion> ) <SentenciaBloque> <Otro>
              # Assuming <Otro> reduces to the else block node (or None)
@@ -1263,7 +1547,7 @@ class Parser:
                  # Or, create a specific node type if the grammar structure guarantees it.
                  # Let's create a generic NodoLlamada for now, and maybe differentiate later if needed.
                  # Given R35, this rule *is* for a call used in an expression context.
-                 new_node = NodoLlamadaFuncionExpr(NodoId(id_token.value, id_token), argumentos_node)
+                 new_node = NodoLlamadaFuncionExpr(self._nodo_id(id_token), argumentos_node)
 
 
              # R41 <SentenciaBloque> ::= <Sentencia>
@@ -1359,7 +1643,7 @@ class Parser:
              elif rule_number == 36:
                  # reduced_symbols: [id_token]
                  id_token = reduced_symbols[0]
-                 new_node = NodoId(id_token.value, id_token) # Create Id node
+                 new_node = self._nodo_id(id_token) # Create Id node
 
              # R37 <Termino> ::= entero
              elif rule_number == 37:
@@ -1455,11 +1739,23 @@ class Parser:
 # --- Grammar Class ---
 # (Keep the same as before)
 class Grammar:
-    def __init__(self, inf_filepath):
+    def __init__(self, inf_filepath, cache_path=None):
         self.rules = {} # {rule_number: (lhs_non_terminal, [rhs_symbols])}
         self.token_map = {} # {token_name: token_id}
         self.id_to_token_map = {} # {token_id: token_name}
+        # La gramática leída se guarda en inf_filepath + '.cache' y se
+        # reutiliza mientras el .inf no cambie (ver table_cache)
+        meta, _ = table_cache.cached(cache_path or inf_filepath + '.cache', [inf_filepath],
+                                     lambda: self._compile(inf_filepath))
+        self.token_map = meta['token_map']
+        self.id_to_token_map = {token_id: name for name, token_id in self.token_map.items()}
+        self.rules = {number: (lhs, rhs) for number, lhs, rhs in meta['rules']}
+
+    def _compile(self, inf_filepath):
         self._load_grammar(inf_filepath)
+        meta = {'token_map': self.token_map,
+                'rules': [[number, lhs, rhs] for number, (lhs, rhs) in self.rules.items()]}
+        return meta, {}
 
     def _load_grammar(self, inf_filepath):
         with open(inf_filepath, 'r') as f:
@@ -1518,12 +1814,54 @@ class Grammar:
 # --- ParsingTable Class ---
 # (Keep the same as before)
 class ParsingTable:
-    def __init__(self, csv_filepath):
-        self.action_table = {} # {(state, terminal_name): action_string}
-        self.goto_table = {} # {(state, non_terminal_name): next_state}
+    def __init__(self, csv_filepath, cache_path=None, packed=False):
+        """
+        Con `packed` la tabla se guarda comprimida (ver
+        packed_table.PackedTable) en lugar de en matrices completas.
+        """
         self.symbol_to_col = {} # {symbol_name: column_index}
         self.col_to_symbol = {} # {column_index: symbol_name}
+        # Las matrices de acciones y transiciones se guardan en
+        # csv_filepath + '.cache' y se reutilizan mientras el CSV no cambie
+        meta, arrays = table_cache.cached(cache_path or csv_filepath + '.cache', [csv_filepath],
+                                          lambda: self._compile(csv_filepath))
+        symbols = meta['symbols']
+        self.symbol_to_col = {symbol: i for i, symbol in enumerate(symbols)}
+        self.col_to_symbol = dict(enumerate(symbols))
+        self.width = len(symbols)
+        self.action = arrays['action'] # por estado y columna: 0 vacío, n > 0 'd<n-1>', n < 0 'r<-n-1>'
+        self.goto = arrays['goto'] # por estado y columna: -1 vacío
+        self.other_actions = {(state, symbol): cell for state, symbol, cell in meta['other_actions']}
+        self.packed = None
+        if packed:
+            self.packed = PackedTable(self.action, self.goto, len(self.action) // self.width,
+                                      self.width, self.width)
+            self.action = self.goto = None
+
+    def _compile(self, csv_filepath):
+        """Lee el CSV y lo empaca en las matrices action y goto."""
+        # Los diccionarios solo se usan mientras se lee el CSV
+        self.action_table = {} # {(state, terminal_name): action_string}
+        self.goto_table = {} # {(state, non_terminal_name): next_state}
         self._load_table(csv_filepath)
+        symbols = [self.col_to_symbol[i] for i in range(len(self.col_to_symbol))]
+        states = [state for state, _ in self.action_table] + [state for state, _ in self.goto_table]
+        width = len(symbols)
+        size = (max(states) + 1 if states else 0) * width
+        action = array('i', bytes(4 * size))
+        goto = array('i', [-1]) * size
+        other = []
+        for (state, symbol), cell in self.action_table.items():
+            index = state * width + self.symbol_to_col[symbol]
+            if re.fullmatch(r'[dr]\d+', cell):
+                number = int(cell[1:]) + 1
+                action[index] = number if cell[0] == 'd' else -number
+            else:
+                other.append([state, symbol, cell])
+        for (state, symbol), next_state in self.goto_table.items():
+            goto[state * width + self.symbol_to_col[symbol]] = next_state
+        del self.action_table, self.goto_table
+        return {'symbols': symbols, 'other_actions': other}, {'action': action, 'goto': goto}
 
     def _load_table(self, csv_filepath):
         with open(csv_filepath, 'r') as f:
@@ -1564,16 +1902,44 @@ class ParsingTable:
                             except ValueError:
                                 print(f"Warning: Skipping non-integer goto value '{cell}' for state {state}, symbol {symbol}.", file=sys.stderr)
 
+    def _index(self, state, symbol):
+        col = self.symbol_to_col.get(symbol)
+        index = state * self.width + col if col is not None and state >= 0 else len(self.action)
+        return index if index < len(self.action) else None
+
+    def _packed_column(self, state, symbol):
+        col = self.symbol_to_col.get(symbol)
+        return col if col is not None and 0 <= state < self.packed.n_states else None
+
     def get_action(self, state, terminal_name):
-        return self.action_table.get((state, terminal_name))
+        if self.packed is not None:
+            col = self._packed_column(state, terminal_name)
+            code = self.packed.action(state, col) if col is not None else 0
+        else:
+            index = self._index(state, terminal_name)
+            code = self.action[index] if index is not None else 0
+        if code > 0:
+            return f"d{code - 1}"
+        if code < 0:
+            return f"r{-code - 1}"
+        return self.other_actions.get((state, terminal_name))
 
     def get_goto(self, state, non_terminal_name):
-        return self.goto_table.get((state, non_terminal_name))
+        if self.packed is not None:
+            col = self._packed_column(state, non_terminal_name)
+            next_state = self.packed.goto(state, col) if col is not None else -1
+        else:
+            index = self._index(state, non_terminal_name)
+            next_state = self.goto[index] if index is not None else -1
+        return next_state if next_state >= 0 else None
 
 
 # --- Main Function ---
-def compilar(codigo_fuente, inf_filepath, csv_filepath):
-    """Realiza todo el proceso de compilación."""
+def compilar(codigo_fuente, inf_filepath, csv_filepath, trace=True):
+    """
+    Realiza todo el proceso de compilación. `trace` es el nivel de traza
+    del parser (ver Parser.parse).
+    """
     print("--- Iniciando Proceso de Compilación ---")
 
     try:
@@ -1595,7 +1961,7 @@ def compilar(codigo_fuente, inf_filepath, csv_filepath):
         parsing_table = ParsingTable(csv_filepath)
         parser = Parser(lexer, grammar, parsing_table)
         # The parser.parse() method now builds the AST and performs semantic analysis
-        syntax_success = parser.parse() # parse() now returns True if syntax & semantic pass
+        syntax_success = parser.parse(trace) # parse() now returns True if syntax & semantic pass
 
         # Display final errors if any occurred during parsing or semantic analysis
         if parser.errors:
@@ -1620,12 +1986,181 @@ def compilar(codigo_fuente, inf_filepath, csv_filepath):
         return False
 
 
+class _Silencio(io.TextIOBase):
+    """Salida que descarta todo lo que se le escribe."""
+    def write(self, texto):
+        return len(texto)
+
+
+_SILENCIO = _Silencio()
+
+
+def compilar_fuente(codigo_fuente, grammar, parsing_table):
+    """
+    Compila `codigo_fuente` sin imprimir nada, con la gramática y la tabla
+    ya cargadas. Devuelve {'accepted', 'diagnostics', 'timings'}: si se
+    aceptó sin errores, los mensajes de error léxicos, sintácticos y
+    semánticos, y los milisegundos de cada fase (lex, parse, semantic,
+    total).
+    """
+    diagnosticos = []
+    tiempos = {}
+    aceptado = False
+    inicio = time.perf_counter()
+    with contextlib.redirect_stdout(_SILENCIO), contextlib.redirect_stderr(_SILENCIO):
+        try:
+            lexer = AnalizadorLexico(codigo_fuente)
+            tokens = lexer.analizar()
+            fin_lex = time.perf_counter()
+            tiempos['lex'] = round((fin_lex - inicio) * 1000, 3)
+            diagnosticos.extend(lexer.errores)
+
+            parser = Parser(lexer, grammar, parsing_table)
+            aceptado = parser.parse(trace=False, tokens=tokens, semantic=False)
+            fin_parse = time.perf_counter()
+            tiempos['parse'] = round((fin_parse - fin_lex) * 1000, 3)
+            if aceptado:
+                parser.perform_semantic_analysis()
+                tiempos['semantic'] = round((time.perf_counter() - fin_parse) * 1000, 3)
+            diagnosticos.extend(parser.errors)
+            aceptado = aceptado and not parser.errors and not lexer.errores
+        except Exception as e:
+            # Igual que compilar(): un error inesperado rechaza el código
+            diagnosticos.append(f"Ocurrió un error inesperado durante el análisis: {e}")
+            aceptado = False
+    tiempos['total'] = round((time.perf_counter() - inicio) * 1000, 3)
+    return {'accepted': aceptado, 'diagnostics': diagnosticos, 'timings': tiempos}
+
+
+def compilar_lote(entrada, salida, inf_filepath='compilador.inf', csv_filepath='compilador.csv'):
+    """
+    Compila los registros JSONL {"id": ..., "source": "..."} de `entrada`
+    (un archivo o cualquier iterable de líneas) y escribe en `salida` una
+    línea JSON por registro, en el mismo orden:
+    {"id", "accepted", "diagnostics", "timings"}. La gramática y la tabla
+    se cargan una sola vez y cada resultado se escribe en cuanto está
+    listo. Un registro inválido produce un resultado rechazado con el
+    motivo. Devuelve (registros, aceptados).
+    """
+    grammar = Grammar(inf_filepath)
+    parsing_table = ParsingTable(csv_filepath)
+    registros = aceptados = 0
+    for numero, linea in enumerate(entrada, 1):
+        if not linea.strip():
+            continue
+        registros += 1
+        registro = None
+        try:
+            registro = json.loads(linea)
+            fuente = registro['source']
+            if not isinstance(fuente, str):
+                raise TypeError("'source' debe ser una cadena")
+        except (ValueError, KeyError, TypeError) as e:
+            identificador = registro.get('id') if isinstance(registro, dict) else None
+            resultado = {'id': identificador, 'accepted': False,
+                         'diagnostics': [f"Registro inválido en la línea {numero}: {e!r}"], 'timings': {}}
+        else:
+            resultado = {'id': registro.get('id'), **compilar_fuente(fuente, grammar, parsing_table)}
+        aceptados += resultado['accepted']
+        salida.write(json.dumps(resultado, ensure_ascii=False) + '\n')
+    salida.flush()
+    return registros, aceptados
+
+
+# Gramática y tabla de los procesos de compile_many; con fork los procesos
+# las heredan del padre sin copiarlas (copy-on-write)
+_TABLAS = None
+
+
+def _iniciar_tablas(inf_filepath, csv_filepath):
+    global _TABLAS
+    if _TABLAS is None:
+        # Sin fork (spawn): cada proceso las carga de la caché binaria
+        _TABLAS = (Grammar(inf_filepath), ParsingTable(csv_filepath))
+
+
+def _compilar_archivo(ruta):
+    grammar, parsing_table = _TABLAS
+    try:
+        with open(ruta, encoding='utf-8') as f:
+            codigo_fuente = f.read()
+    except (OSError, UnicodeDecodeError) as e:
+        return {'path': ruta, 'accepted': False,
+                'diagnostics': [f"No se pudo leer el archivo: {e}"], 'timings': {}}
+    return {'path': ruta, **compilar_fuente(codigo_fuente, grammar, parsing_table)}
+
+
+def compile_many(paths, workers=None, inf_filepath='compilador.inf', csv_filepath='compilador.csv'):
+    """
+    Compila los archivos `paths` con `workers` procesos (por omisión, uno
+    por CPU) y devuelve un resultado por archivo, en el orden de entrada:
+    {'path', 'accepted', 'diagnostics', 'timings'} (ver compilar_fuente).
+    La gramática y la tabla se cargan una sola vez en este proceso; donde
+    hay fork, los procesos hijos las comparten sin volver a leerlas.
+    """
+    global _TABLAS
+    paths = list(paths)
+    if workers is None:
+        workers = os.cpu_count() or 1
+    _TABLAS = (Grammar(inf_filepath), ParsingTable(csv_filepath))
+    workers = min(workers, len(paths))
+    if workers <= 1:
+        return [_compilar_archivo(ruta) for ruta in paths]
+
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+    contexto = (multiprocessing.get_context('fork')
+                if 'fork' in multiprocessing.get_all_start_methods() else None)
+    # Varios archivos por envío para no pagar la comunicación en cada uno
+    chunksize = max(1, len(paths) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers, mp_context=contexto, initializer=_iniciar_tablas,
+                             initargs=(inf_filepath, csv_filepath)) as pool:
+        return list(pool.map(_compilar_archivo, paths, chunksize=chunksize))
+
+
 def main():
     # Define paths to your grammar files
     inf_filepath = 'compilador.inf'
     csv_filepath = 'compilador.csv'
     # lr_filepath = 'your_grammar.lr' # Not used in this LR implementation
 
+    cli = argparse.ArgumentParser(description="Compilador con análisis semántico. "
+                                              "Sin opciones compila el código de ejemplo.")
+    modo = cli.add_mutually_exclusive_group()
+    modo.add_argument('--lote', nargs='?', const='-', metavar='REGISTROS',
+                      help="compilar registros JSONL {id, source} (sin archivo o '-': entrada estándar)")
+    modo.add_argument('--archivos', nargs='+', metavar='ARCHIVO', help="compilar estos archivos")
+    cli.add_argument('-j', '--procesos', type=int,
+                     help="procesos para --archivos (por omisión, uno por CPU)")
+    args = cli.parse_args()
+
+    if args.archivos:
+        inicio = time.perf_counter()
+        resultados = compile_many(args.archivos, args.procesos, inf_filepath, csv_filepath)
+        segundos = time.perf_counter() - inicio
+        for r in resultados:
+            estado = 'aceptado' if r['accepted'] else 'rechazado'
+            print(f"{r['path']}: {estado} ({r['timings'].get('total', 0):.2f} ms)")
+            for diagnostico in r['diagnostics']:
+                print(f"  {diagnostico}")
+        aceptados = sum(r['accepted'] for r in resultados)
+        print(f"{len(resultados)} archivos, {aceptados} aceptados en {segundos:.2f} s", file=sys.stderr)
+        return
+
+    # Modo por lotes: python semantico.py --lote [registros.jsonl]
+    if args.lote:
+        nombre = args.lote
+        entrada = sys.stdin if nombre == '-' else open(nombre, encoding='utf-8')
+        try:
+            inicio = time.perf_counter()
+            registros, aceptados = compilar_lote(entrada, sys.stdout, inf_filepath, csv_filepath)
+            segundos = time.perf_counter() - inicio
+        finally:
+            if entrada is not sys.stdin:
+                entrada.close()
+        print(f"{registros} registros, {aceptados} aceptados en {segundos:.2f} s", file=sys.stderr)
+        return
+
     # Example code snippets
     example1 = """
 int main(){
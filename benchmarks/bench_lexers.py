@@ -0,0 +1,193 @@
+"""
+Benchmark de los cinco lexers del repositorio sobre código sintético.
+
+Uso:
+    python benchmarks/bench_lexers.py [--lexers a,b] [--shapes a,b]
+                                      [--sizes 1K,10K,100K,1M] [--json salida.json]
+
+Lexers: lexer (Etapa_Semantico_Final/lexer.tokenize), compiler
+(compiler.LexicalAnalyzer), compilador2 (compilador2.AnalizadorLexico),
+semantico (Practica_Semantico/semantico.AnalizadorLexico) y avances
+(Avances-Traductor Lexer). Formas: las de corpus.py. Los tamaños aceptan
+sufijos K, M y G; --sizes 1K,10K,100K,1M,10M,100M cubre el rango
+completo, pero los lexers que crean un objeto por token necesitan varios
+GB de memoria con 100M.
+
+Cada medición corre en un proceso nuevo, así los lexers no comparten
+módulos ni memoria. Se reporta el mejor tiempo de varias repeticiones
+(al menos --min-time segundos en total), tokens/s, MB/s y el pico de
+memoria asignada durante una pasada aparte con tracemalloc. Con --json
+se guardan los resultados para comparar entre commits.
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+
+BENCH = os.path.dirname(os.path.abspath(__file__))
+RAIZ = os.path.dirname(BENCH)
+
+# lexer -> (directorio, función que prepara el lexer y devuelve tokenizar(código))
+LEXERS = ('lexer', 'compiler', 'compilador2', 'semantico', 'avances')
+DIRECTORIOS = {
+    'lexer': 'Etapa_Semantico_Final',
+    'compiler': 'Etapa_Semantico_Final',
+    'compilador2': 'Etapa_Semantico_Final',
+    'semantico': 'Practica_Semantico',
+    'avances': 'Avances-Traductor',
+}
+
+
+def cargar_lexer(nombre):
+    """Importa el lexer pedido y devuelve una función código -> tokens."""
+    sys.path.insert(0, os.path.join(RAIZ, DIRECTORIOS[nombre]))
+    if nombre == 'lexer':
+        import lexer
+        return lexer.tokenize
+    if nombre == 'compiler':
+        import compiler
+        return lambda codigo: compiler.LexicalAnalyzer().tokenize(codigo)
+    if nombre == 'compilador2':
+        import compilador2
+        return lambda codigo: compilador2.AnalizadorLexico(codigo).analizar()
+    if nombre == 'semantico':
+        import semantico
+        return lambda codigo: semantico.AnalizadorLexico(codigo).analizar()
+    import analizador_lexico
+    return lambda codigo: analizador_lexico.Lexer(codigo).tokenize()
+
+
+def medir(nombre, forma, tamano, tiempo_minimo, memoria):
+    """Mide un lexer sobre un corpus; se ejecuta en el proceso hijo."""
+    sys.path.insert(0, BENCH)
+    from corpus import generar
+
+    tokenizar = cargar_lexer(nombre)
+    codigo = generar(forma, tamano)
+    mb = len(codigo) / 1_000_000
+
+    tiempos = []
+    total = 0.0
+    while not tiempos or (total < tiempo_minimo and len(tiempos) < 1000):
+        inicio = time.perf_counter()
+        tokens = tokenizar(codigo)
+        tiempos.append(time.perf_counter() - inicio)
+        total += tiempos[-1]
+        cantidad = len(tokens)
+        del tokens
+    mejor = min(tiempos)
+
+    pico = None
+    if memoria:
+        tracemalloc.start()
+        tokens = tokenizar(codigo)
+        pico = tracemalloc.get_traced_memory()[1] / 1_000_000
+        tracemalloc.stop()
+        del tokens
+
+    return {
+        'lexer': nombre,
+        'shape': forma,
+        'size_bytes': len(codigo),
+        'tokens': cantidad,
+        'runs': len(tiempos),
+        'seconds': mejor,
+        'tokens_per_sec': cantidad / mejor if mejor else None,
+        'mb_per_sec': mb / mejor if mejor else None,
+        'peak_mem_mb': pico,
+        'error': None,
+    }
+
+
+def ejecutar(nombre, forma, tamano, args):
+    """Lanza la medición en un proceso nuevo y devuelve su resultado."""
+    comando = [sys.executable, os.path.abspath(__file__), '--run', nombre, forma, str(tamano),
+               '--min-time', str(args.min_time)]
+    if args.no_memory:
+        comando.append('--no-memory')
+    try:
+        proceso = subprocess.run(comando, capture_output=True, text=True, timeout=args.timeout)
+    except subprocess.TimeoutExpired:
+        return {'lexer': nombre, 'shape': forma, 'size_bytes': tamano,
+                'error': f'timeout ({args.timeout} s)'}
+    if proceso.returncode != 0:
+        ultima = (proceso.stderr.strip().splitlines() or ['error desconocido'])[-1]
+        return {'lexer': nombre, 'shape': forma, 'size_bytes': tamano, 'error': ultima}
+    return json.loads(proceso.stdout.strip().splitlines()[-1])
+
+
+def commit_actual():
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=RAIZ, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def lista(texto, validos=None):
+    elementos = [e.strip() for e in texto.split(',') if e.strip()]
+    if validos is not None:
+        for e in elementos:
+            if e not in validos:
+                raise argparse.ArgumentTypeError(f"'{e}' no es uno de: {', '.join(validos)}")
+    return elementos
+
+
+def main():
+    sys.path.insert(0, BENCH)
+    from corpus import FORMAS, parse_size
+
+    parser = argparse.ArgumentParser(description="Benchmark de los lexers del repositorio.")
+    parser.add_argument('--lexers', type=lambda t: lista(t, LEXERS), default=list(LEXERS))
+    parser.add_argument('--shapes', type=lambda t: lista(t, FORMAS), default=list(FORMAS))
+    parser.add_argument('--sizes', type=lista, default=['1K', '10K', '100K', '1M'])
+    parser.add_argument('--min-time', type=float, default=0.2,
+                        help="segundos mínimos de repeticiones por medición")
+    parser.add_argument('--timeout', type=float, default=None, help="segundos por medición")
+    parser.add_argument('--no-memory', action='store_true', help="omitir la pasada con tracemalloc")
+    parser.add_argument('--json', help="archivo donde guardar los resultados")
+    parser.add_argument('--run', nargs=3, metavar=('LEXER', 'SHAPE', 'SIZE'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run:
+        nombre, forma, tamano = args.run
+        print(json.dumps(medir(nombre, forma, int(tamano), args.min_time, not args.no_memory)))
+        return
+
+    resultados = []
+    print(f"{'lexer':<12} {'forma':<16} {'tamaño':>10} {'tokens':>10} "
+          f"{'tokens/s':>12} {'MB/s':>8} {'pico MB':>9}")
+    for tamano in map(parse_size, args.sizes):
+        for forma in args.shapes:
+            for nombre in args.lexers:
+                r = ejecutar(nombre, forma, tamano, args)
+                resultados.append(r)
+                if r['error']:
+                    print(f"{nombre:<12} {forma:<16} {tamano:>10} error: {r['error']}")
+                    continue
+                pico = '-' if r['peak_mem_mb'] is None else f"{r['peak_mem_mb']:.1f}"
+                print(f"{nombre:<12} {forma:<16} {r['size_bytes']:>10} {r['tokens']:>10} "
+                      f"{r['tokens_per_sec']:>12,.0f} {r['mb_per_sec']:>8.2f} {pico:>9}")
+
+    if args.json:
+        salida = {
+            'meta': {
+                'commit': commit_actual(),
+                'python': platform.python_version(),
+                'platform': platform.platform(),
+                'date': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                'min_time': args.min_time,
+            },
+            'results': resultados,
+        }
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(salida, f, indent=2)
+        print(f"\nResultados guardados en {args.json}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,168 @@
+"""
+Generador de código sintético (subconjunto de C) para los benchmarks.
+
+Uso:
+    python benchmarks/corpus.py --shape identificadores --size 10M -o salida.c
+
+El código usa identificadores, palabras reservadas (int, float, if,
+else, while, return), enteros, reales, + - * / = < > <= >= == != ; ( ) { }
+y comentarios // y /* */ con palabras. Cada forma carga el texto hacia un
+tipo de token distinto:
+
+    identificadores  expresiones largas con nombres repetidos y nuevos
+    comentarios      la mayor parte del texto son comentarios
+    literales        expresiones llenas de enteros y reales
+    anidado          bloques if/while y paréntesis profundamente anidados
+
+Ningún lexer se detiene con estas formas, pero no todos leen lo mismo:
+
+    lexer.py      no tiene comentarios: // y /* */ salen como opMul, y
+                  != como opNot seguido de '='
+    compiler.py   solo reconoce //; /* */ sale como DIVIDE y MULTIPLY, y
+                  < > ! se saltan sin token
+    avances       solo reconoce // (y #); /* */ sale como DIV y MULT
+    compilador2,
+    semantico     reconocen todo
+
+Así, la forma comentarios mide comentarios solo en compilador2 y
+semantico. El parser LR de Etapa_Semantico_Final (sobre lexer.py) acepta
+identificadores y literales; en comentarios se detiene en el primer '/'
+y en anidado en el primer '!'.
+
+Los sufijos de tamaño son decimales (1K = 1000), como en cadenas.py y
+como los MB/s de los benchmarks.
+"""
+import argparse
+import random
+import sys
+
+FORMAS = ('identificadores', 'comentarios', 'literales', 'anidado')
+
+PALABRAS = ('contador', 'indice', 'total', 'valor', 'suma', 'factor', 'limite',
+            'resultado', 'temporal', 'elemento', 'posicion', 'acumulado')
+OPERADORES = ('+', '-', '*', '/')
+RELACIONALES = ('<', '>', '<=', '>=', '==', '!=')
+
+
+def _nombre(rng):
+    # Mezcla nombres muy repetidos con algunos únicos
+    nombre = rng.choice(PALABRAS)
+    if rng.random() < 0.5:
+        nombre += '_' + rng.choice(PALABRAS)
+    if rng.random() < 0.2:
+        nombre += str(rng.randrange(1000))
+    return nombre
+
+
+def _literal(rng):
+    if rng.random() < 0.5:
+        return str(rng.randrange(1, 10 ** rng.randint(1, 9)))
+    return f"{rng.randrange(10 ** rng.randint(1, 6))}.{rng.randrange(10 ** rng.randint(1, 6))}"
+
+
+def _expresion(rng, operando, terminos):
+    partes = [operando(rng)]
+    for _ in range(terminos - 1):
+        partes.append(rng.choice(OPERADORES))
+        partes.append(operando(rng))
+    return ' '.join(partes)
+
+
+def _comentario(rng):
+    texto = ' '.join(rng.choice(PALABRAS) for _ in range(rng.randint(4, 14)))
+    if rng.random() < 0.6:
+        return f"// {texto}"
+    lineas = [' '.join(rng.choice(PALABRAS) for _ in range(rng.randint(3, 10)))
+              for _ in range(rng.randint(1, 4))]
+    return "/* " + "\n   ".join(lineas) + " */"
+
+
+def _cuerpo(rng, forma, sangria):
+    """Líneas de una sentencia según la forma pedida."""
+    if forma == 'identificadores':
+        return [f"{sangria}{_nombre(rng)} = {_expresion(rng, _nombre, rng.randint(4, 12))};"]
+    if forma == 'literales':
+        return [f"{sangria}{_nombre(rng)} = {_expresion(rng, _literal, rng.randint(4, 12))};"]
+    if forma == 'comentarios':
+        lineas = [sangria + _comentario(rng) for _ in range(rng.randint(2, 5))]
+        lineas.append(f"{sangria}{_nombre(rng)} = {_expresion(rng, _nombre, 2)};")
+        return lineas
+    # anidado: una cadena de bloques y una expresión con paréntesis profundos
+    profundidad = rng.randint(8, 24)
+    lineas = []
+    for nivel in range(profundidad):
+        palabra = rng.choice(('if', 'while'))
+        condicion = f"{_nombre(rng)} {rng.choice(RELACIONALES)} {_literal(rng)}"
+        lineas.append(f"{sangria}{'    ' * nivel}{palabra} ({condicion}) {{")
+    expresion = _nombre(rng)
+    for _ in range(rng.randint(8, 24)):
+        expresion = f"({expresion} {rng.choice(OPERADORES)} {_nombre(rng)})"
+    lineas.append(f"{sangria}{'    ' * profundidad}{_nombre(rng)} = {expresion};")
+    for nivel in range(profundidad - 1, -1, -1):
+        lineas.append(f"{sangria}{'    ' * nivel}}}")
+    return lineas
+
+
+def generar(forma, tamano, semilla=0):
+    """
+    Devuelve código de la forma dada con exactamente `tamano` caracteres
+    (ASCII, así que también bytes). Se agregan funciones mientras quepan,
+    la última con las sentencias que alcancen, y el resto se rellena con
+    saltos de línea, que todos los lexers aceptan. El resultado es
+    determinista para cada (forma, tamano, semilla).
+    """
+    if forma not in FORMAS:
+        raise ValueError(f"Forma desconocida: {forma}")
+    rng = random.Random(f"{forma}:{semilla}")
+    partes = []
+    total = 0
+    funcion = 0
+    while True:
+        tipo = rng.choice(('int', 'float'))
+        cabecera = f"{tipo} funcion_{funcion}() {{\n"
+        sentencias = ['\n'.join(_cuerpo(rng, forma, '    ')) + '\n'
+                      for _ in range(rng.randint(3, 10))]
+        cierre = f"    return {_nombre(rng)};\n}}\n\n"
+        texto = cabecera + ''.join(sentencias) + cierre
+        if total + len(texto) > tamano:
+            # La última función lleva solo las sentencias que caben
+            while sentencias and total + len(texto) > tamano:
+                texto = texto[:-len(cierre) - len(sentencias.pop())] + cierre
+            if total + len(texto) <= tamano:
+                partes.append(texto)
+                total += len(texto)
+            break
+        partes.append(texto)
+        total += len(texto)
+        funcion += 1
+    partes.append('\n' * (tamano - total))
+    return ''.join(partes)
+
+
+def parse_size(texto):
+    """'1K', '10M', '2G' (1K = 1000) o un número de bytes."""
+    texto = texto.strip().upper()
+    for sufijo, factor in (('K', 10 ** 3), ('M', 10 ** 6), ('G', 10 ** 9)):
+        if texto.endswith(sufijo):
+            return int(float(texto[:-1]) * factor)
+    return int(texto)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Genera código sintético para benchmarks.")
+    parser.add_argument('--shape', choices=FORMAS, default='identificadores')
+    parser.add_argument('--size', default='1M', help="tamaño en bytes (p. ej. 1K, 10M)")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('-o', '--output', help="archivo de salida (por defecto stdout)")
+    args = parser.parse_args()
+
+    codigo = generar(args.shape, parse_size(args.size), args.seed)
+    if args.output:
+        with open(args.output, 'w', encoding='ascii', newline='\n') as f:
+            f.write(codigo)
+    else:
+        sys.stdout.write(codigo)
+
+
+if __name__ == '__main__':
+    main()
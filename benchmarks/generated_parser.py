@@ -0,0 +1,146 @@
+"""
+Parser generado por parser_gen.py frente a LRParser sin traza.
+
+Uso:
+    python benchmarks/generated_parser.py [--shapes a,b] [--size 200K] [--json salida.json]
+
+Se mide lo mismo que hace main.py con y sin --generado:
+
+    lineas     cada línea de Etapa_Semantico_Final/codigo.txt como una
+               entrada aparte (muchas llamadas cortas)
+    <forma>    el código de corpus.py de esa forma en una sola entrada
+
+Los tokens se calculan antes de medir, así que solo cuenta el parser. Los
+dos imprimen "✅ Cadena aceptada" al aceptar, como en main.py; la salida
+se descarta. Se reporta el mejor tiempo de varias repeticiones (al menos
+--min-time segundos). Los dos deben aceptar o fallar con el mismo
+mensaje; termina con código 1 si no es así.
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from itertools import chain
+
+BENCH = os.path.dirname(os.path.abspath(__file__))
+RAIZ = os.path.dirname(BENCH)
+ETAPA = os.path.join(RAIZ, 'Etapa_Semantico_Final')
+sys.path.insert(0, BENCH)
+sys.path.insert(0, ETAPA)
+sys.path.append(RAIZ)
+
+from corpus import generar, parse_size
+from table_memory import commit_actual, lista
+
+# Las formas que la gramática acepta completas (ver corpus.py)
+ENTRADAS = ('lineas', 'identificadores', 'literales')
+
+
+def resultado(analizar, entradas):
+    """True o el mensaje de error de cada entrada."""
+    salida = []
+    for tokens in entradas:
+        try:
+            analizar(tokens)
+            salida.append(True)
+        except SyntaxError as e:
+            salida.append(str(e))
+    return salida
+
+
+def medir(analizar, entradas, tiempo_minimo):
+    """Mejor tiempo en segundos de analizar todas las entradas."""
+    tiempos = []
+    total = 0.0
+    while not tiempos or total < tiempo_minimo:
+        inicio = time.perf_counter()
+        resultado(analizar, entradas)
+        tiempos.append(time.perf_counter() - inicio)
+        total += tiempos[-1]
+    return min(tiempos)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Parser generado frente a LRParser.")
+    parser.add_argument('--shapes', type=lambda t: lista(t, ENTRADAS), default=list(ENTRADAS))
+    parser.add_argument('--size', default='200K', help="tamaño del código por forma (p. ej. 50K, 1M)")
+    parser.add_argument('--min-time', type=float, default=1.0,
+                        help="segundos mínimos de repeticiones por parser")
+    parser.add_argument('--json', help="archivo donde guardar los resultados")
+    args = parser.parse_args()
+
+    # Las tablas se leen desde el directorio de la etapa; el módulo se
+    # genera aparte para no depender de un parser_tabla.py viejo
+    os.chdir(ETAPA)
+    import parser_gen
+    from lexer import token_map, tokenize_iter
+    from parser_lr import DenseTable, LRParser
+    tabla, reglas = DenseTable.load('compilador.csv', 'compilador.inf')
+    lr = LRParser(tabla, reglas)
+    with tempfile.TemporaryDirectory() as directorio:
+        generado = parser_gen.load('compilador.csv', 'compilador.inf',
+                                   os.path.join(directorio, 'parser_tabla.py'))
+
+    def con_lr(tokens):
+        lr.parse(tokens, False)
+
+    def con_generado(tokens):
+        generado.parse(tokens)
+        print("✅ Cadena aceptada")
+
+    def tokens_de(codigo):
+        return list(chain(tokenize_iter(codigo), [(token_map['$'], '$')]))
+
+    resultados = []
+    fallas = 0
+    print(f"{'entrada':<16} {'llamadas':>9} {'tokens':>9} {'LRParser ms':>12} "
+          f"{'generado ms':>12} {'mejora':>7}")
+    for forma in args.shapes:
+        if forma == 'lineas':
+            with open('codigo.txt', encoding='utf-8') as f:
+                entradas = [tokens_de(linea.strip()) for linea in f if linea.strip()]
+        else:
+            entradas = [tokens_de(generar(forma, parse_size(args.size)))]
+        with contextlib.redirect_stdout(io.StringIO()):
+            distinto = resultado(con_lr, entradas) != resultado(con_generado, entradas)
+            segundos_lr = medir(con_lr, entradas, args.min_time)
+            segundos_gen = medir(con_generado, entradas, args.min_time)
+        fallas += distinto
+        tokens = sum(map(len, entradas))
+        resultados.append({
+            'input': forma,
+            'calls': len(entradas),
+            'tokens': tokens,
+            'lrparser_s': segundos_lr,
+            'generated_s': segundos_gen,
+            'mismatch': distinto,
+        })
+        print(f"{forma:<16} {len(entradas):>9,} {tokens:>9,} {segundos_lr * 1e3:>12.3f} "
+              f"{segundos_gen * 1e3:>12.3f} {1 - segundos_gen / segundos_lr:>7.1%}"
+              + ("  (resultados distintos)" if distinto else ""))
+
+    if args.json:
+        salida = {
+            'meta': {
+                'commit': commit_actual(),
+                'python': platform.python_version(),
+                'platform': platform.platform(),
+                'date': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                'size': parse_size(args.size),
+            },
+            'results': resultados,
+        }
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(salida, f, indent=2)
+        print(f"\nResultados guardados en {args.json}")
+
+    sys.exit(1 if fallas else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,185 @@
+"""
+Tiempo de arranque de los programas del repositorio, medido con
+`python -X importtime`.
+
+Uso:
+    python benchmarks/import_time.py [--entries a,b] [--repeat 5]
+                                     [--budget main=20,semantico=30] [--json salida.json]
+
+Entradas: main (Etapa_Semantico_Final/main.py), compilador2, semantico
+(Practica_Semantico/semantico.py), compiler y avances
+(Avances-Traductor/main.py). Cada una se importa --repeat veces en un
+proceso nuevo desde su directorio y se toma el menor tiempo acumulado
+del módulo. Se reportan además las tres importaciones directas más
+lentas y los módulos pesados (pandas, tabulate, multiprocessing, ...)
+que se hayan cargado: esos solo deben importarse al usar la función que
+los necesita.
+
+Termina con código 1 si alguna entrada supera su presupuesto (en ms) o
+carga un módulo pesado, así sirve como verificación antes de un commit.
+Los presupuestos por omisión dejan margen sobre lo medido en una máquina
+de desarrollo; en máquinas más lentas se ajustan con --budget.
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+
+BENCH = os.path.dirname(os.path.abspath(__file__))
+RAIZ = os.path.dirname(BENCH)
+
+# entrada -> (directorio, módulo)
+ENTRADAS = {
+    'main': ('Etapa_Semantico_Final', 'main'),
+    'compilador2': ('Etapa_Semantico_Final', 'compilador2'),
+    'semantico': ('Practica_Semantico', 'semantico'),
+    'compiler': ('Etapa_Semantico_Final', 'compiler'),
+    'avances': ('Avances-Traductor', 'main'),
+}
+
+# Milisegundos de importación permitidos por entrada
+PRESUPUESTOS = {
+    'main': 20.0,
+    'compilador2': 15.0,
+    'semantico': 30.0,
+    'compiler': 15.0,
+    'avances': 15.0,
+}
+
+PESADOS = ('pandas', 'numpy', 'tabulate', 'concurrent.futures', 'multiprocessing')
+
+
+def importar(directorio, modulo):
+    """
+    Importa `modulo` en un proceso nuevo y devuelve las filas de
+    -X importtime: (µs propios, µs acumulados, profundidad, nombre).
+    """
+    proceso = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {modulo}'],
+                             cwd=os.path.join(RAIZ, directorio), capture_output=True, text=True)
+    if proceso.returncode != 0:
+        ultima = (proceso.stderr.strip().splitlines() or ['error desconocido'])[-1]
+        raise RuntimeError(ultima)
+    filas = []
+    for linea in proceso.stderr.splitlines():
+        if not linea.startswith('import time:'):
+            continue
+        propio, acumulado, nombre = linea[len('import time:'):].split('|')
+        if not propio.strip().isdigit():
+            continue  # encabezado
+        profundidad = (len(nombre) - len(nombre.lstrip()) - 1) // 2
+        filas.append((int(propio), int(acumulado), profundidad, nombre.strip()))
+    return filas
+
+
+def medir(entrada, repeticiones):
+    directorio, modulo = ENTRADAS[entrada]
+    mejor = None
+    for _ in range(repeticiones):
+        filas = importar(directorio, modulo)
+        total = next(acumulado for _, acumulado, profundidad, nombre in filas
+                     if profundidad == 0 and nombre == modulo)
+        if mejor is None or total < mejor[0]:
+            mejor = (total, filas)
+    total, filas = mejor
+
+    # Las importaciones directas del módulo son las de profundidad 1
+    # inmediatamente antes de su fila (importtime las lista en postorden)
+    fin = max(i for i, fila in enumerate(filas) if fila[2] == 0 and fila[3] == modulo)
+    inicio = max((i for i, fila in enumerate(filas[:fin]) if fila[2] == 0), default=-1) + 1
+    directas = sorted(((acumulado, nombre) for _, acumulado, profundidad, nombre
+                       in filas[inicio:fin] if profundidad == 1), reverse=True)
+    cargados = {nombre for *_, nombre in filas}
+    pesados = [p for p in PESADOS if p in cargados]
+    return {
+        'entry': entrada,
+        'module': f'{directorio}/{modulo}.py',
+        'import_ms': total / 1000,
+        'slowest': [[nombre, acumulado / 1000] for acumulado, nombre in directas[:3]],
+        'heavy': pesados,
+        'error': None,
+    }
+
+
+def commit_actual():
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=RAIZ, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def lista(texto, validos=None):
+    elementos = [e.strip() for e in texto.split(',') if e.strip()]
+    if validos is not None:
+        for e in elementos:
+            if e not in validos:
+                raise argparse.ArgumentTypeError(f"'{e}' no es uno de: {', '.join(validos)}")
+    return elementos
+
+
+def presupuestos(texto):
+    resultado = {}
+    for elemento in lista(texto):
+        entrada, _, ms = elemento.partition('=')
+        if entrada not in ENTRADAS or not ms:
+            raise argparse.ArgumentTypeError(f"se esperaba entrada=ms, no '{elemento}'")
+        resultado[entrada] = float(ms)
+    return resultado
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tiempo de importación de los programas del repositorio.")
+    parser.add_argument('--entries', type=lambda t: lista(t, ENTRADAS), default=list(ENTRADAS))
+    parser.add_argument('--repeat', type=int, default=5, help="importaciones por entrada")
+    parser.add_argument('--budget', type=presupuestos, default={},
+                        help="presupuestos en ms, p. ej. main=20,semantico=30")
+    parser.add_argument('--json', help="archivo donde guardar los resultados")
+    args = parser.parse_args()
+
+    limites = dict(PRESUPUESTOS, **args.budget)
+    resultados = []
+    fallas = 0
+    print(f"{'entrada':<12} {'ms':>8} {'límite':>8}  más lentas")
+    for entrada in args.entries:
+        try:
+            r = medir(entrada, max(1, args.repeat))
+        except RuntimeError as e:
+            r = {'entry': entrada, 'error': str(e)}
+        r['budget_ms'] = limites[entrada]
+        resultados.append(r)
+        if r['error']:
+            fallas += 1
+            print(f"{entrada:<12} error: {r['error']}")
+            continue
+        lentas = ', '.join(f"{nombre} {ms:.1f}" for nombre, ms in r['slowest'])
+        estado = ''
+        if r['import_ms'] > r['budget_ms']:
+            estado += '  EXCEDE'
+        if r['heavy']:
+            estado += f"  carga {', '.join(r['heavy'])}"
+        fallas += bool(estado)
+        print(f"{entrada:<12} {r['import_ms']:>8.1f} {r['budget_ms']:>8.1f}  {lentas}{estado}")
+
+    if args.json:
+        salida = {
+            'meta': {
+                'commit': commit_actual(),
+                'python': platform.python_version(),
+                'platform': platform.platform(),
+                'date': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                'repeat': args.repeat,
+            },
+            'results': resultados,
+        }
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(salida, f, indent=2)
+        print(f"\nResultados guardados en {args.json}")
+
+    sys.exit(1 if fallas else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+"""
+Escalamiento del análisis léxico en paralelo (1..N procesos).
+
+Uso:
+    python benchmarks/parallel_scaling.py [--lexer avances|semantico]
+                                          [--shape FORMA] [--size MB] [--workers N]
+                                          [--min-shard-size CARACTERES]
+
+Genera código sintético con corpus.py (por defecto con comentarios de
+bloque, que obligan a elegir bien los cortes), lo tokeniza con
+1, 2, 4, ... hasta N procesos y muestra tiempo, MB/s y aceleración
+respecto a un proceso. Cada resultado se compara con el de un proceso.
+Con --min-shard-size se cambia el tamaño mínimo de cada fragmento (con
+código chico, un valor menor obliga a usar varios procesos).
+"""
+import argparse
+import os
+import sys
+import time
+
+BENCH = os.path.dirname(os.path.abspath(__file__))
+RAIZ = os.path.dirname(BENCH)
+sys.path.insert(0, BENCH)
+sys.path.append(RAIZ)
+
+from comun.parallel_lexer import MIN_SHARD_SIZE
+from corpus import FORMAS, generar
+
+LEXERS = ('avances', 'semantico')
+
+
+def cargar(lexer):
+    """Devuelve la función tokenizar(código, procesos) del lexer elegido."""
+    if lexer == 'avances':
+        sys.path.insert(0, os.path.join(RAIZ, 'Avances-Traductor'))
+        from analizador_lexico import tokenize_parallel_stream
+        return tokenize_parallel_stream
+    sys.path.insert(0, os.path.join(RAIZ, 'Practica_Semantico'))
+    from semantico import analizar_en_paralelo
+    return analizar_en_paralelo
+
+
+def columnas(stream):
+    tipos = [stream.kind_names[k] for k in stream.kinds]
+    return tipos, stream.starts, stream.ends, stream.lines, stream.columns, stream.values
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--lexer', choices=LEXERS, default='avances')
+    parser.add_argument('--shape', choices=FORMAS, default='comentarios')
+    parser.add_argument('--size', type=float, default=8, help='tamaño del código en MB')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--min-shard-size', type=int, default=MIN_SHARD_SIZE,
+                        help='caracteres mínimos por fragmento')
+    args = parser.parse_args()
+
+    tokenizar = cargar(args.lexer)
+    codigo = generar(args.shape, int(args.size * 1_000_000))
+    mb = len(codigo.encode('utf-8')) / 1_000_000
+
+    procesos = [1]
+    while procesos[-1] * 2 <= args.workers:
+        procesos.append(procesos[-1] * 2)
+    if procesos[-1] != args.workers:
+        procesos.append(args.workers)
+
+    print(f"lexer={args.lexer} forma={args.shape} tamaño={mb:.1f} MB cpus={os.cpu_count()}")
+    print(f"{'procesos':>8} {'segundos':>9} {'MB/s':>8} {'aceleración':>11} {'tokens':>10}")
+    referencia = base = None
+    for n in procesos:
+        inicio = time.perf_counter()
+        stream = tokenizar(codigo, n, min_shard_size=args.min_shard_size)
+        segundos = time.perf_counter() - inicio
+        if referencia is None:
+            referencia, base = columnas(stream), segundos
+        elif columnas(stream) != referencia:
+            sys.exit(f"El resultado con {n} procesos difiere del secuencial")
+        print(f"{n:>8} {segundos:>9.3f} {mb / segundos:>8.2f} {base / segundos:>10.2f}x {len(stream):>10}")
+
+
+if __name__ == '__main__':
+    main()
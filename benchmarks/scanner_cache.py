@@ -0,0 +1,158 @@
+"""
+Costo de armar la expresión maestra del lexer en cada llamada frente al
+escáner compilado una sola vez (lexer.compile_scanner).
+
+Uso:
+    python benchmarks/scanner_cache.py [--lines 210K] [--modes a,b] [--json salida.json]
+
+Se repite Etapa_Semantico_Final/codigo.txt hasta --lines líneas y se
+tokeniza de tres formas:
+
+    reconstruir  línea por línea, como main.py, con el tokenize() anterior
+                 a compile_scanner: arma la alternativa de patrones y la
+                 compila (re.compile, con su caché interna) en cada
+                 llamada; los grupos se nombran T0..Tn porque los nombres
+                 de la especificación no son nombres de grupo válidos
+    cache        línea por línea con lexer.tokenize(), que reutiliza el
+                 escáner compilado
+    completo     todo el texto en una sola llamada a lexer.tokenize_iter()
+
+Se reporta el mejor tiempo de varias repeticiones (al menos --min-time
+segundos) y tokens/s. Las tres formas deben dar los mismos tokens;
+termina con código 1 si no es así.
+"""
+import argparse
+import json
+import os
+import platform
+import re
+import sys
+import time
+
+BENCH = os.path.dirname(os.path.abspath(__file__))
+RAIZ = os.path.dirname(BENCH)
+ETAPA = os.path.join(RAIZ, 'Etapa_Semantico_Final')
+sys.path.insert(0, BENCH)
+sys.path.insert(0, ETAPA)
+
+from corpus import parse_size
+from table_memory import commit_actual, lista
+
+import lexer
+
+MODOS = ('reconstruir', 'cache', 'completo')
+
+# Nombre de la especificación por grupo ('\\(' -> '('); el código anterior
+# usaba los nombres como grupos, así que esto no cuenta como parte del costo
+NOMBRES = {f'T{i}': re.sub(r'\\(.)', r'\1', name)
+           for i, (name, pattern) in enumerate(lexer.token_specification)}
+
+
+def tokenize_reconstruir(code):
+    """El tokenize() anterior: arma y compila la expresión en cada llamada."""
+    spec = lexer.token_specification
+    tok_regex = '|'.join(f'(?P<T{i}>{pattern})' for i, (name, pattern) in enumerate(spec))
+    get_token = re.compile(tok_regex).match
+    pos = 0
+    tokens = []
+    while pos < len(code):
+        match = get_token(code, pos)
+        if not match:
+            raise RuntimeError(f'Error de tokenización en la posición {pos}')
+        kind = NOMBRES[match.lastgroup]
+        value = match.group()
+        if kind == 'SKIP' or kind == 'NEWLINE':
+            pass
+        elif kind == 'MISMATCH':
+            raise RuntimeError(f'Token inesperado: {value!r}')
+        else:
+            tokens.append((lexer.token_map.get(kind, kind), value))
+        pos = match.end()
+    return tokens
+
+
+def por_lineas(tokenizar):
+    def tokenizar_lineas(lineas, texto):
+        tokens = []
+        for linea in lineas:
+            tokens.extend(tokenizar(linea))
+        return tokens
+    return tokenizar_lineas
+
+
+TOKENIZAR = {
+    'reconstruir': por_lineas(tokenize_reconstruir),
+    'cache': por_lineas(lexer.tokenize),
+    'completo': lambda lineas, texto: list(lexer.tokenize_iter(texto)),
+}
+
+
+def medir(modo, lineas, texto, tiempo_minimo):
+    """(mejor tiempo en segundos, tokens) de una forma de tokenizar."""
+    tokenizar = TOKENIZAR[modo]
+    tiempos = []
+    total = 0.0
+    while not tiempos or total < tiempo_minimo:
+        inicio = time.perf_counter()
+        tokens = tokenizar(lineas, texto)
+        tiempos.append(time.perf_counter() - inicio)
+        total += tiempos[-1]
+    return min(tiempos), tokens
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Escáner del lexer compilado por llamada o una sola vez.")
+    parser.add_argument('--lines', default='210K', help="líneas de código (p. ej. 50K, 1M)")
+    parser.add_argument('--modes', type=lambda t: lista(t, MODOS), default=list(MODOS))
+    parser.add_argument('--min-time', type=float, default=1.0,
+                        help="segundos mínimos de repeticiones por forma")
+    parser.add_argument('--json', help="archivo donde guardar los resultados")
+    args = parser.parse_args()
+
+    with open(os.path.join(ETAPA, 'codigo.txt'), encoding='utf-8') as f:
+        base = f.read().splitlines()
+    cantidad = parse_size(args.lines)
+    lineas = (base * (cantidad // len(base) + 1))[:cantidad]
+    texto = '\n'.join(lineas) + '\n'
+
+    resultados = []
+    referencia = None
+    fallas = 0
+    print(f"{'forma':<12} {'líneas':>9} {'tokens':>10} {'segundos':>9} {'tokens/s':>12}")
+    for modo in args.modes:
+        segundos, tokens = medir(modo, lineas, texto, args.min_time)
+        if referencia is None:
+            referencia = tokens
+        distinto = tokens != referencia
+        fallas += distinto
+        resultados.append({
+            'mode': modo,
+            'lines': len(lineas),
+            'tokens': len(tokens),
+            'seconds': segundos,
+            'tokens_per_sec': len(tokens) / segundos if segundos else None,
+            'mismatch': distinto,
+        })
+        print(f"{modo:<12} {len(lineas):>9,} {len(tokens):>10,} {segundos:>9.3f} "
+              f"{len(tokens) / segundos:>12,.0f}" + ("  (tokens distintos)" if distinto else ""))
+
+    if args.json:
+        salida = {
+            'meta': {
+                'commit': commit_actual(),
+                'python': platform.python_version(),
+                'platform': platform.platform(),
+                'date': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                'lines': len(lineas),
+            },
+            'results': resultados,
+        }
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(salida, f, indent=2)
+        print(f"\nResultados guardados en {args.json}")
+
+    sys.exit(1 if fallas else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,268 @@
+"""
+Memoria de las formas de la tabla LR de compilador.csv.
+
+Uso:
+    python benchmarks/table_memory.py [--forms a,b] [--json salida.json]
+
+Formas:
+    dataframe     DataFrame de textos (Etapa_Semantico_Final/utils.load_lr_table)
+    dicts         diccionarios {(estado, símbolo): celda} con los que
+                  semantico.ParsingTable lee el CSV
+    matrices      semantico.ParsingTable: matrices completas de enteros
+    packed        semantico.ParsingTable(packed=True): reducción por
+                  omisión + vector peine (packed_table.PackedTable)
+    dense         parser_lr.DenseTable
+    dense-packed  DenseTable.pack()
+
+Cada forma se mide en un proceso nuevo: bytes de los objetos que la
+componen (contando una vez cada objeto), casillas guardadas y el tiempo
+medio de una consulta de acción sobre todas las combinaciones de estado y
+terminal. Las formas comprimidas se comparan además casilla por casilla
+con su forma completa: deben dar la misma acción en toda casilla no
+vacía (en las vacías pueden dar la reducción por omisión) y la misma
+transición en toda combinación de estado y no terminal, exista o no.
+Termina con código 1 si alguna no coincide.
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from array import array
+
+BENCH = os.path.dirname(os.path.abspath(__file__))
+RAIZ = os.path.dirname(BENCH)
+
+# forma -> directorio donde se carga
+FORMAS = {
+    'dataframe': 'Etapa_Semantico_Final',
+    'dicts': 'Practica_Semantico',
+    'matrices': 'Practica_Semantico',
+    'packed': 'Practica_Semantico',
+    'dense': 'Etapa_Semantico_Final',
+    'dense-packed': 'Etapa_Semantico_Final',
+}
+
+
+def tamano(objeto, vistos=None):
+    """Bytes de `objeto` y de lo que contiene, contando cada objeto una vez."""
+    if vistos is None:
+        vistos = set()
+    if id(objeto) in vistos:
+        return 0
+    vistos.add(id(objeto))
+    total = sys.getsizeof(objeto)
+    if isinstance(objeto, dict):
+        total += sum(tamano(k, vistos) + tamano(v, vistos) for k, v in objeto.items())
+    elif isinstance(objeto, (list, tuple, set)):
+        total += sum(tamano(e, vistos) for e in objeto)
+    elif hasattr(objeto, '__dict__') and not isinstance(objeto, (type, array)):
+        total += tamano(vars(objeto), vistos)
+    return total
+
+
+def por_consulta(consultar, casillas, tiempo_minimo=0.1):
+    """Nanosegundos medios de consultar(estado, símbolo) sobre `casillas`."""
+    consultas = 0
+    inicio = time.perf_counter()
+    while True:
+        for estado, simbolo in casillas:
+            consultar(estado, simbolo)
+        consultas += len(casillas)
+        segundos = time.perf_counter() - inicio
+        if segundos >= tiempo_minimo:
+            return segundos / consultas * 1e9
+
+
+def comparar(completa, comprimida, casillas, transiciones):
+    """Casillas en que la forma comprimida no coincide con la completa."""
+    diferencias = 0
+    for estado, simbolo in casillas:
+        esperada = completa.action(estado, simbolo)
+        obtenida = comprimida.action(estado, simbolo)
+        if esperada != obtenida and not (esperada == 0 and obtenida < -1):
+            diferencias += 1
+    for estado, simbolo in transiciones:
+        destino = completa.goto(estado, simbolo)
+        if destino != comprimida.goto(estado, simbolo):
+            diferencias += 1
+    return diferencias
+
+
+class _Semantico:
+    # Acciones y transiciones de semantico.ParsingTable como códigos enteros
+    def __init__(self, tabla):
+        self.tabla = tabla
+
+    def action(self, estado, simbolo):
+        celda = self.tabla.get_action(estado, simbolo)
+        if not celda:
+            return 0
+        numero = int(celda[1:]) + 1
+        return numero if celda[0] == 'd' else -numero
+
+    def goto(self, estado, simbolo):
+        destino = self.tabla.get_goto(estado, simbolo)
+        return -1 if destino is None else destino
+
+
+class _Denso:
+    def __init__(self, tabla):
+        self.tabla = tabla
+
+    def action(self, estado, terminal):
+        return self.tabla.action[estado * self.tabla.n_terminals + terminal]
+
+    def goto(self, estado, no_terminal):
+        return self.tabla.goto[estado * self.tabla.n_nonterminals + no_terminal]
+
+
+def medir(forma):
+    """Mide una forma; se ejecuta en el proceso hijo, desde su directorio."""
+    directorio = os.path.join(RAIZ, FORMAS[forma])
+    os.chdir(directorio)
+    sys.path.insert(0, directorio)
+    diferencias = None
+
+    if forma == 'dataframe':
+        from utils import load_lr_table
+        tabla = load_lr_table('compilador.csv')
+        fin = list(tabla.columns).index('$') + 1
+        terminales = list(tabla.columns[:fin])
+        casillas = [(estado, t) for estado in tabla.index for t in terminales]
+        bytes_ = int(tabla.memory_usage(deep=True).sum())
+        guardadas = tabla.size
+        ns = por_consulta(lambda estado, t: tabla.at[estado, t], casillas)
+
+    elif forma in ('dicts', 'matrices', 'packed'):
+        from semantico import ParsingTable
+        if forma == 'dicts':
+            tabla = ParsingTable.__new__(ParsingTable)
+            tabla.symbol_to_col, tabla.col_to_symbol = {}, {}
+            tabla.action_table, tabla.goto_table = {}, {}
+            tabla._load_table('compilador.csv')
+            terminales = sorted({s for _, s in tabla.action_table}, key=tabla.symbol_to_col.get)
+            estados = sorted({e for e, _ in tabla.action_table})
+            casillas = [(e, t) for e in estados for t in terminales]
+            bytes_ = tamano(tabla.action_table) + tamano(tabla.goto_table)
+            guardadas = len(tabla.action_table) + len(tabla.goto_table)
+            ns = por_consulta(lambda estado, t: tabla.action_table.get((estado, t)), casillas)
+        else:
+            completa = ParsingTable('compilador.csv')
+            tabla = ParsingTable('compilador.csv', packed=forma == 'packed')
+            fin = completa.symbol_to_col['$'] + 1
+            terminales = [completa.col_to_symbol[c] for c in range(1, fin)]
+            no_terminales = [completa.col_to_symbol[c] for c in range(fin, completa.width)]
+            estados = range(len(completa.action) // completa.width)
+            casillas = [(e, t) for e in estados for t in terminales]
+            if forma == 'packed':
+                bytes_ = tamano(tabla.packed.arrays()) + tamano(tabla.other_actions)
+                guardadas = len(tabla.packed.action_values) + len(tabla.packed.goto_values)
+                diferencias = comparar(_Semantico(completa), _Semantico(tabla), casillas,
+                                       [(e, n) for e in estados for n in no_terminales])
+            else:
+                bytes_ = tamano(tabla.action) + tamano(tabla.goto) + tamano(tabla.other_actions)
+                guardadas = len(tabla.action) + len(tabla.goto)
+            ns = por_consulta(tabla.get_action, casillas)
+
+    else:
+        from parser_lr import DenseTable
+        completa, _ = DenseTable.load('compilador.csv', 'compilador.inf')
+        casillas = [(e, t) for e in range(completa.n_states) for t in range(completa.n_terminals)]
+        if forma == 'dense':
+            bytes_ = tamano(completa.action) + tamano(completa.goto)
+            guardadas = len(completa.action) + len(completa.goto)
+            ns = por_consulta(_Denso(completa).action, casillas)
+        else:
+            tabla = completa.pack()
+            bytes_ = tamano(tabla.arrays())
+            guardadas = len(tabla.action_values) + len(tabla.goto_values)
+            diferencias = comparar(_Denso(completa), tabla, casillas,
+                                   [(e, n) for e in range(completa.n_states)
+                                    for n in range(completa.n_nonterminals)])
+            ns = por_consulta(tabla.action, casillas)
+
+    return {
+        'form': forma,
+        'bytes': bytes_,
+        'cells': guardadas,
+        'lookup_ns': ns,
+        'mismatches': diferencias,
+        'error': None,
+    }
+
+
+def ejecutar(forma):
+    """Lanza la medición en un proceso nuevo y devuelve su resultado."""
+    proceso = subprocess.run([sys.executable, os.path.abspath(__file__), '--run', forma],
+                             capture_output=True, text=True)
+    if proceso.returncode != 0:
+        ultima = (proceso.stderr.strip().splitlines() or ['error desconocido'])[-1]
+        return {'form': forma, 'error': ultima}
+    return json.loads(proceso.stdout.strip().splitlines()[-1])
+
+
+def commit_actual():
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=RAIZ, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def lista(texto, validos=None):
+    elementos = [e.strip() for e in texto.split(',') if e.strip()]
+    if validos is not None:
+        for e in elementos:
+            if e not in validos:
+                raise argparse.ArgumentTypeError(f"'{e}' no es uno de: {', '.join(validos)}")
+    return elementos
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Memoria de las formas de la tabla LR.")
+    parser.add_argument('--forms', type=lambda t: lista(t, FORMAS), default=list(FORMAS))
+    parser.add_argument('--json', help="archivo donde guardar los resultados")
+    parser.add_argument('--run', choices=FORMAS, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run:
+        print(json.dumps(medir(args.run)))
+        return
+
+    resultados = []
+    fallas = 0
+    print(f"{'forma':<14} {'bytes':>10} {'casillas':>9} {'ns/consulta':>12}")
+    for forma in args.forms:
+        r = ejecutar(forma)
+        resultados.append(r)
+        if r['error']:
+            print(f"{forma:<14} error: {r['error']}")
+            continue
+        estado = ''
+        if r['mismatches']:
+            estado = f"  {r['mismatches']} casillas distintas"
+            fallas += 1
+        print(f"{forma:<14} {r['bytes']:>10,} {r['cells']:>9,} {r['lookup_ns']:>12.0f}{estado}")
+
+    if args.json:
+        salida = {
+            'meta': {
+                'commit': commit_actual(),
+                'python': platform.python_version(),
+                'platform': platform.platform(),
+                'date': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            },
+            'results': resultados,
+        }
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(salida, f, indent=2)
+        print(f"\nResultados guardados en {args.json}")
+
+    sys.exit(1 if fallas else 0)
+
+
+if __name__ == '__main__':
+    main()
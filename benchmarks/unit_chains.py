@@ -0,0 +1,135 @@
+"""
+Pasos del parser LR con y sin el colapso de cadenas de reducciones
+unitarias (parser_lr.UnitChains).
+
+Uso:
+    python benchmarks/unit_chains.py [--shapes a,b] [--size 200K] [--json salida.json]
+
+Para cada forma de corpus.py se genera el código, se tokeniza con el
+lexer de Etapa_Semantico_Final y se analiza con LRParser dos veces: sin
+colapsar y con `collapse_units=True`. Se cuentan los pasos con la traza
+en nivel summary (desplazamientos, reducciones y aceptación; una cadena
+colapsada cuenta como un solo paso) y se mide el camino sin traza. Las
+formas que la gramática no acepta cuentan los pasos hasta el error; en
+los dos modos debe detenerse en el mismo punto. Termina con código 1 si
+algún resultado no coincide.
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import sys
+import time
+from itertools import chain
+
+BENCH = os.path.dirname(os.path.abspath(__file__))
+RAIZ = os.path.dirname(BENCH)
+ETAPA = os.path.join(RAIZ, 'Etapa_Semantico_Final')
+sys.path.insert(0, BENCH)
+sys.path.insert(0, ETAPA)
+sys.path.append(RAIZ)
+
+from corpus import FORMAS, generar, parse_size
+from table_memory import commit_actual, lista
+
+
+def analizar(parser, tokens, traza):
+    """(aceptada, error, pasos) de un análisis; la salida del parser se descarta."""
+    from comun.tracer import SUMMARY, Tracer
+    tracer = Tracer(SUMMARY, out=io.StringIO()) if traza else False
+    with contextlib.redirect_stdout(io.StringIO()):
+        try:
+            parser.parse(tokens, tracer)
+            aceptada, error = True, None
+        except SyntaxError as e:
+            aceptada, error = False, str(e)
+    return aceptada, error, tracer.steps if traza else None
+
+
+def por_analisis(parser, tokens, tiempo_minimo=0.2):
+    """Segundos medios de un análisis sin traza."""
+    veces = 0
+    inicio = time.perf_counter()
+    while True:
+        analizar(parser, tokens, False)
+        veces += 1
+        segundos = time.perf_counter() - inicio
+        if segundos >= tiempo_minimo:
+            return segundos / veces
+
+
+def medir(forma, tamano, normal, colapsado):
+    from lexer import token_map, tokenize_iter
+    tokens = list(chain(tokenize_iter(generar(forma, tamano)), [(token_map['$'], '$')]))
+    aceptada, error, pasos = analizar(normal, tokens, True)
+    aceptada_c, error_c, pasos_c = analizar(colapsado, tokens, True)
+    return {
+        'shape': forma,
+        'tokens': len(tokens),
+        'accepted': aceptada,
+        'error': error,
+        'steps': pasos,
+        'steps_collapsed': pasos_c,
+        'parse_s': por_analisis(normal, tokens),
+        'parse_collapsed_s': por_analisis(colapsado, tokens),
+        'mismatch': (aceptada, error) != (aceptada_c, error_c),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pasos del parser LR con cadenas unitarias colapsadas.")
+    parser.add_argument('--shapes', type=lambda t: lista(t, FORMAS), default=list(FORMAS))
+    parser.add_argument('--size', default='200K', help="tamaño del código por forma (p. ej. 50K, 1M)")
+    parser.add_argument('--json', help="archivo donde guardar los resultados")
+    args = parser.parse_args()
+
+    # Las tablas se leen desde el directorio de la etapa
+    os.chdir(ETAPA)
+    from parser_lr import DenseTable, LRParser
+    tabla, reglas = DenseTable.load('compilador.csv', 'compilador.inf')
+    normal = LRParser(tabla, reglas)
+    colapsado = LRParser(tabla, reglas, collapse_units=True)
+    print(f"Cadenas unitarias distintas: {len(colapsado.units.chains) - 1}\n")
+
+    resultados = []
+    fallas = 0
+    total = total_c = 0
+    print(f"{'forma':<16} {'tokens':>9} {'pasos':>10} {'colapsado':>10} {'menos':>7} "
+          f"{'ms':>8} {'ms col.':>8}  resultado")
+    for forma in args.shapes:
+        r = medir(forma, parse_size(args.size), normal, colapsado)
+        resultados.append(r)
+        total += r['steps']
+        total_c += r['steps_collapsed']
+        menos = 1 - r['steps_collapsed'] / r['steps']
+        resultado = 'aceptada' if r['accepted'] else f"error: {r['error']}"
+        if r['mismatch']:
+            resultado += "  (los dos modos no coinciden)"
+            fallas += 1
+        print(f"{forma:<16} {r['tokens']:>9,} {r['steps']:>10,} {r['steps_collapsed']:>10,} "
+              f"{menos:>7.1%} {r['parse_s'] * 1e3:>8.1f} {r['parse_collapsed_s'] * 1e3:>8.1f}  {resultado}")
+    if total:
+        print(f"{'total':<16} {'':>9} {total:>10,} {total_c:>10,} {1 - total_c / total:>7.1%}")
+
+    if args.json:
+        salida = {
+            'meta': {
+                'commit': commit_actual(),
+                'python': platform.python_version(),
+                'platform': platform.platform(),
+                'date': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                'size': parse_size(args.size),
+            },
+            'results': resultados,
+        }
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(salida, f, indent=2)
+        print(f"\nResultados guardados en {args.json}")
+
+    sys.exit(1 if fallas else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,7 @@
+"""
+Módulos que usan varias etapas del compilador: flujos y búferes de
+tokens, índice de líneas, tabla de nombres, lexer paralelo e
+incremental, tablas LR (caché, forma comprimida, pila) y la traza del
+parser. Cada etapa agrega la raíz del repositorio a sys.path e importa
+desde `comun`.
+"""
@@ -0,0 +1,755 @@
+"""
+Generador de lexers basados en un AFD mínimo con tablas de transición.
+
+Recibe una especificación de tokens en el mismo formato que usan los demás
+lexers del proyecto, una lista de (nombre, patrón) o (nombre, patrón, flags),
+y construye:
+
+    patrón -> AFN (Thompson) -> AFD (subconjuntos) -> AFD mínimo (Moore)
+
+El AFD se guarda en arreglos planos (`array('H')`) y se recorre con un solo
+ciclo: una búsqueda en la tabla por carácter de entrada. Las coincidencias
+son las de la expresión maestra `(?P<a>...)|(?P<b>...)|...` de `re`: gana el
+primer patrón de la especificación que coincide en la posición, aunque uno
+posterior dé un lexema más largo, y de ese patrón se toma su coincidencia
+más larga. El AFD deja de leer en cuanto ningún patrón anterior al
+encontrado puede coincidir.
+
+`DFAScanner` imita la parte de la API de `re.Pattern` que usan los lexers
+(`match`, `finditer`, y `lastgroup`/`lastindex`/`group`/`start`/`end` en el
+resultado), así que sirve de reemplazo directo, por ejemplo:
+
+    COMPILED_REGEX = DFAScanner(TOKEN_SPECIFICATION)
+
+Subconjunto de expresiones soportado: literales, escapes, `.`, clases
+`[...]`/`[^...]` con rangos, `\\d \\w \\s` (y sus negaciones), grupos `(...)`,
+`(?:...)` y `(?P<n>...)`, alternativa `|` y los cuantificadores `* + ?`
+(también perezosos). `\\b` solo se admite al principio o al final de un
+patrón (el uso de todas las especificaciones del proyecto); en otro lugar
+es un error. Un patrón con cuantificador perezoso (p. ej. `/\\*.*?\\*/`)
+acepta su coincidencia más corta, igual que `re`. Dentro de un patrón se
+toma la coincidencia más larga: difiere de `re` solo si una alternativa
+interna es prefijo de otra posterior (`(a|ab)`), cosa que no ocurre en las
+especificaciones del proyecto. Los patrones que aceptan la cadena vacía se
+rechazan.
+"""
+
+import re
+from array import array
+
+# Alfabeto: los 128 caracteres ASCII más cuatro pseudo-caracteres que
+# representan a todos los caracteres no ASCII: dígitos, otros caracteres
+# de palabra, espacios y el resto (así \d, \w y \s coinciden con lo que
+# aceptan en `re`).
+NA_DIGIT = 128
+NA_WORD = 129
+NA_SPACE = 130
+NA_OTHER = 131
+ALPHABET = 132
+ALL = (1 << ALPHABET) - 1
+
+
+def _mask(chars):
+    mask = 0
+    for c in chars:
+        mask |= 1 << ord(c)
+    return mask
+
+
+def _range(lo, hi):
+    return ((1 << (hi + 1)) - 1) ^ ((1 << lo) - 1)
+
+
+DIGIT = _range(ord('0'), ord('9')) | (1 << NA_DIGIT)
+WORD = DIGIT | _range(ord('a'), ord('z')) | _range(ord('A'), ord('Z')) | _mask('_') | (1 << NA_WORD)
+SPACE = _mask(c for c in map(chr, range(128)) if c.isspace()) | (1 << NA_SPACE)
+NEWLINE = _mask('\n')
+
+ESCAPES = {
+    'd': DIGIT, 'D': ALL ^ DIGIT,
+    'w': WORD, 'W': ALL ^ WORD,
+    's': SPACE, 'S': ALL ^ SPACE,
+    'n': _mask('\n'), 't': _mask('\t'), 'r': _mask('\r'),
+    'f': _mask('\f'), 'v': _mask('\v'),
+}
+
+# Código de "ningún patrón" en las tablas de aceptación (los patrones se
+# guardan como índice + 1)
+NONE = 0xFFFF
+
+
+class RegexSyntaxError(ValueError):
+    pass
+
+
+def _boundaries(pattern):
+    """
+    Quita el `\\b` del principio y del final del patrón. Devuelve
+    (patrón, al_principio, al_final); los `\\b` que queden los rechaza el
+    analizador del patrón.
+    """
+    lead = pattern.startswith(r'\b')
+    if lead:
+        pattern = pattern[2:]
+    # El \b final no cuenta si su barra está escapada (p. ej. r'\\b')
+    backslashes = len(pattern[:-1]) - len(pattern[:-1].rstrip('\\'))
+    trail = pattern.endswith('b') and backslashes % 2 == 1
+    if trail:
+        pattern = pattern[:-2]
+    return pattern, lead, trail
+
+
+class _NFA:
+    """AFN de Thompson: transiciones épsilon y transiciones por máscara."""
+
+    def __init__(self):
+        self.eps = []
+        self.edges = []
+        self.masks = set()
+
+    def new_state(self):
+        self.eps.append([])
+        self.edges.append([])
+        return len(self.eps) - 1
+
+
+class _RegexParser:
+    """Analizador descendente del subconjunto de expresiones regulares."""
+
+    def __init__(self, pattern, nfa, dotall=False):
+        self.pattern = pattern
+        self.pos = 0
+        self.nfa = nfa
+        self.dot = ALL if dotall else ALL ^ NEWLINE
+        self.lazy = False
+
+    def error(self, msg):
+        raise RegexSyntaxError(f"{msg} en la posición {self.pos} de {self.pattern!r}")
+
+    def peek(self):
+        return self.pattern[self.pos] if self.pos < len(self.pattern) else None
+
+    def parse(self):
+        frag = self.alternation()
+        if self.pos != len(self.pattern):
+            self.error("Paréntesis sin abrir")
+        return frag
+
+    # Cada fragmento es un par (inicio, fin) de estados del AFN
+    def alternation(self):
+        frags = [self.concatenation()]
+        while self.peek() == '|':
+            self.pos += 1
+            frags.append(self.concatenation())
+        if len(frags) == 1:
+            return frags[0]
+        start, end = self.nfa.new_state(), self.nfa.new_state()
+        for s, e in frags:
+            self.nfa.eps[start].append(s)
+            self.nfa.eps[e].append(end)
+        return start, end
+
+    def concatenation(self):
+        start = end = self.nfa.new_state()
+        while self.peek() not in (None, '|', ')'):
+            s, e = self.repetition()
+            self.nfa.eps[end].append(s)
+            end = e
+        return start, end
+
+    def repetition(self):
+        s, e = self.atom()
+        op = self.peek()
+        if op not in ('*', '+', '?'):
+            return s, e
+        self.pos += 1
+        if self.peek() == '?':
+            self.pos += 1
+            self.lazy = True
+        start, end = self.nfa.new_state(), self.nfa.new_state()
+        self.nfa.eps[start].append(s)
+        self.nfa.eps[e].append(end)
+        if op in ('*', '?'):
+            self.nfa.eps[start].append(end)
+        if op in ('*', '+'):
+            self.nfa.eps[e].append(s)
+        return start, end
+
+    def char(self, mask):
+        if mask >> ALPHABET:
+            self.error("Carácter no ASCII")
+        s, e = self.nfa.new_state(), self.nfa.new_state()
+        self.nfa.edges[s].append((mask, e))
+        self.nfa.masks.add(mask)
+        return s, e
+
+    def atom(self):
+        c = self.peek()
+        self.pos += 1
+        if c == '(':
+            if self.pattern.startswith('?:', self.pos):
+                self.pos += 2
+            elif self.pattern.startswith('?P<', self.pos):
+                self.pos = self.pattern.index('>', self.pos) + 1
+            elif self.peek() == '?':
+                self.error("Grupo no soportado")
+            frag = self.alternation()
+            if self.peek() != ')':
+                self.error("Falta ')'")
+            self.pos += 1
+            return frag
+        if c == '[':
+            return self.char(self.char_class())
+        if c == '.':
+            return self.char(self.dot)
+        if c == '\\':
+            esc = self.peek()
+            if esc is None:
+                self.error("Escape incompleto")
+            self.pos += 1
+            if esc == 'b':
+                self.error("\\b solo se admite al principio o al final del patrón")
+            return self.char(ESCAPES.get(esc, _mask(esc)))
+        if c in ('*', '+', '?'):
+            self.error("Cuantificador sin operando")
+        if c in ('^', '$'):
+            self.error(f"Ancla '{c}' no soportada")
+        return self.char(_mask(c))
+
+    def char_class(self):
+        negate = self.peek() == '^'
+        if negate:
+            self.pos += 1
+        mask = 0
+        first = True
+        while True:
+            c = self.peek()
+            if c is None:
+                self.error("Falta ']'")
+            if c == ']' and not first:
+                self.pos += 1
+                break
+            first = False
+            self.pos += 1
+            if c == '\\':
+                esc = self.peek()
+                self.pos += 1
+                if esc in ESCAPES and esc not in 'ntrfv':
+                    mask |= ESCAPES[esc]
+                    continue
+                lo = ESCAPES[esc] if esc in 'ntrfv' else _mask(esc)
+                lo = lo.bit_length() - 1
+            else:
+                lo = ord(c)
+            if self.peek() == '-' and self.pos + 1 < len(self.pattern) and self.pattern[self.pos + 1] != ']':
+                self.pos += 1
+                hi = self.peek()
+                self.pos += 1
+                if hi == '\\':
+                    hi = self.peek()
+                    self.pos += 1
+                mask |= _range(lo, ord(hi))
+            else:
+                mask |= 1 << lo
+        if negate:
+            mask = ALL ^ mask
+        return mask
+
+
+class _ClassTable(dict):
+    """Tabla para `str.translate`: carácter -> clase de equivalencia.
+
+    Los caracteres ASCII están precargados; los demás se resuelven la
+    primera vez que aparecen.
+    """
+
+    def __init__(self, classes, digit_class, word_class, space_class, other_class):
+        super().__init__((c, chr(k)) for c, k in enumerate(classes))
+        self.digit = chr(digit_class)
+        self.word = chr(word_class)
+        self.space = chr(space_class)
+        self.other = chr(other_class)
+
+    def __missing__(self, code):
+        ch = chr(code)
+        if ch.isdecimal():
+            value = self.digit
+        elif ch.isalnum() or ch == '_':
+            value = self.word
+        elif ch.isspace():
+            value = self.space
+        else:
+            value = self.other
+        self[code] = value
+        return value
+
+
+class DFAMatch:
+    """Resultado de una coincidencia, compatible con el uso que se hace de `re.Match`."""
+
+    __slots__ = ('string', 'lastgroup', 'lastindex', '_start', '_end')
+
+    def __init__(self, string, lastgroup, lastindex, start, end):
+        self.string = string
+        self.lastgroup = lastgroup
+        self.lastindex = lastindex  # número del patrón + 1, como el grupo en la expresión maestra
+        self._start = start
+        self._end = end
+
+    def group(self, name=0):
+        if name == 0 or name == self.lastgroup:
+            return self.string[self._start:self._end]
+        return None
+
+    def start(self):
+        return self._start
+
+    def end(self):
+        return self._end
+
+    def span(self):
+        return self._start, self._end
+
+
+class DFAScanner:
+    def __init__(self, spec):
+        self.names = [entry[0] for entry in spec]
+        if len(spec) >= NONE:
+            raise RegexSyntaxError(f"Demasiados patrones: {len(spec)}")
+        self._build(spec)
+        self._classified = (None, b'')
+
+    def _build(self, spec):
+        nfa = _NFA()
+        # Dos estados iniciales: con todos los patrones, para cuando hay un
+        # límite de palabra antes del token, y sin los que empiezan con \b
+        start = nfa.new_state()
+        start_plain = nfa.new_state()
+        accepts = {}
+        owner = {}
+        lazy = set()
+        trailing = set()
+        boundaries = False
+
+        def closure(states):
+            stack = list(states)
+            seen = set(states)
+            while stack:
+                for t in nfa.eps[stack.pop()]:
+                    if t not in seen:
+                        seen.add(t)
+                        stack.append(t)
+            return seen
+
+        for index, entry in enumerate(spec):
+            flags = entry[2] if len(entry) > 2 else 0
+            if flags & ~re.DOTALL:
+                raise RegexSyntaxError(f"Flags no soportadas en el patrón de {entry[0]!r}")
+            pattern, lead, trail = _boundaries(entry[1])
+            first = len(nfa.eps)
+            parser = _RegexParser(pattern, nfa, dotall=bool(flags & re.DOTALL))
+            s, e = parser.parse()
+            if e in closure([s]):
+                raise RegexSyntaxError(f"El patrón de {entry[0]!r} acepta la cadena vacía")
+            nfa.eps[start].append(s)
+            if not lead:
+                nfa.eps[start_plain].append(s)
+            accepts[e] = index
+            for state in range(first, len(nfa.eps)):
+                owner[state] = index
+            if parser.lazy:
+                lazy.add(index)
+            if trail:
+                trailing.add(index)
+            boundaries = boundaries or lead or trail
+        if boundaries:
+            # Las clases de caracteres deben separar los de palabra del resto
+            nfa.masks.add(WORD)
+
+        # Clases de equivalencia del alfabeto: caracteres que ninguna máscara distingue
+        masks = sorted(nfa.masks)
+        signatures = {}
+        symbol_class = []
+        for sym in range(ALPHABET):
+            sig = tuple((m >> sym) & 1 for m in masks)
+            symbol_class.append(signatures.setdefault(sig, len(signatures)))
+        ncls = len(signatures)
+        class_masks = [0] * ncls
+        for sym, k in enumerate(symbol_class):
+            class_masks[k] |= 1 << sym
+
+        def accept_of(states):
+            # (patrón aceptado sin condición, patrón que exige \b al final)
+            plain = [accepts[s] for s in states if s in accepts and accepts[s] not in trailing]
+            bounded = [accepts[s] for s in states if s in accepts and accepts[s] in trailing]
+            return (min(plain) if plain else None, min(bounded) if bounded else None)
+
+        # Construcción por subconjuntos; el estado 0 es el estado muerto
+        initials = [frozenset(closure([start])), frozenset(closure([start_plain]))]
+        index_of = {frozenset(): 0}
+        dtrans = [[0] * ncls]
+        daccept = [(None, None)]
+        pending = []
+        for initial in initials:
+            if initial not in index_of:
+                index_of[initial] = len(dtrans)
+                dtrans.append(None)
+                daccept.append(None)
+                pending.append(initial)
+        while pending:
+            current = pending.pop()
+            active = current
+            for tok in lazy:
+                if any(accepts.get(s) == tok for s in current):
+                    # Patrón perezoso: su coincidencia termina en cuanto acepta
+                    active = [s for s in active if owner.get(s) != tok]
+            row = [0] * ncls
+            for k in range(ncls):
+                bit = class_masks[k]
+                moved = [t for s in active for m, t in nfa.edges[s] if m & bit]
+                if not moved:
+                    continue
+                target = frozenset(closure(moved))
+                if target not in index_of:
+                    index_of[target] = len(dtrans)
+                    dtrans.append(None)
+                    daccept.append(None)
+                    pending.append(target)
+                row[k] = index_of[target]
+            i = index_of[current]
+            dtrans[i] = row
+            daccept[i] = accept_of(current)
+
+        trans, accept, starts = self._minimize(dtrans, daccept, [index_of[s] for s in initials])
+        word = [bool(class_masks[k] & WORD) for k in range(ncls)]
+        self._pack(trans, accept, starts, ncls, symbol_class, word)
+
+    @staticmethod
+    def _minimize(dtrans, daccept, starts):
+        """Refinamiento de particiones (Moore) hasta que no haya cambios."""
+        n = len(dtrans)
+        kinds = {}
+        block = [kinds.setdefault(daccept[s], len(kinds)) for s in range(n)]
+        count = len(kinds)
+        while True:
+            # El estado muerto se recorre primero, así su bloque es siempre el 0
+            sigs = {}
+            block = [sigs.setdefault((block[s],) + tuple(block[t] for t in dtrans[s]), len(sigs))
+                     for s in range(n)]
+            if len(sigs) == count:
+                break
+            count = len(sigs)
+        trans = [None] * count
+        accept = [None] * count
+        for s in range(n):
+            b = block[s]
+            if trans[b] is None:
+                trans[b] = [block[t] for t in dtrans[s]]
+                accept[b] = daccept[s]
+        return trans, accept, [block[s] for s in starts]
+
+    def _pack(self, trans, accept, starts, ncls, symbol_class, word):
+        nstates = len(trans)
+        typecode = 'H' if nstates * ncls < 1 << 16 else 'I'
+        # Las transiciones guardan el desplazamiento de la fila destino
+        # (estado * ncls), así el ciclo solo suma la clase del carácter.
+        self._trans = array(typecode, [0]) * (nstates * ncls)
+        # Aceptación por fila: patrón sin condición + 1 en los 16 bits bajos
+        # y patrón con \b final + 1 en los altos (0 = ninguno)
+        self._accept = array('I', [0]) * (nstates * ncls)
+        for s, row in enumerate(trans):
+            base = s * ncls
+            for k, t in enumerate(row):
+                self._trans[base + k] = t * ncls
+            plain, bounded = accept[s]
+            self._accept[base] = ((plain + 1 if plain is not None else 0)
+                                  | (bounded + 1 if bounded is not None else 0) << 16)
+
+        # Patrones que todavía pueden aceptar desde cada estado: `reach` con
+        # el estado mismo, `live` (el de menor índice + 1) leyendo al menos
+        # un carácter más
+        reach = [0] * nstates
+        for s in range(nstates):
+            for index in accept[s]:
+                if index is not None:
+                    reach[s] |= 1 << index
+        changed = True
+        while changed:
+            changed = False
+            for s in range(1, nstates):
+                bits = reach[s]
+                for t in trans[s]:
+                    bits |= reach[t]
+                if bits != reach[s]:
+                    reach[s] = bits
+                    changed = True
+        self._live = array('H', [NONE]) * (nstates * ncls)
+        for s in range(1, nstates):
+            bits = 0
+            for t in trans[s]:
+                bits |= reach[t]
+            if bits:
+                self._live[s * ncls] = (bits & -bits).bit_length()
+        self._reach = {s * ncls: bits for s, bits in enumerate(reach)}
+
+        self._start = starts[0] * ncls
+        self._start_plain = starts[1] * ncls
+        self._word = bytes(word)
+        self.num_states = nstates
+        self.num_classes = ncls
+        self._class_table = _ClassTable(symbol_class[:128], symbol_class[NA_DIGIT], symbol_class[NA_WORD],
+                                        symbol_class[NA_SPACE], symbol_class[NA_OTHER])
+
+    def classify(self, string):
+        """Convierte el texto en un `bytes` con la clase de cada carácter."""
+        if self._classified[0] is not string:
+            self._classified = (string, string.translate(self._class_table).encode('latin-1'))
+        return self._classified[1]
+
+    def _first_state(self, classes, pos):
+        # Estado inicial según haya o no un límite de palabra antes de `pos`
+        if self._start == self._start_plain:
+            return self._start
+        word = self._word
+        before = word[classes[pos - 1]] if pos else 0
+        return self._start if before != word[classes[pos]] else self._start_plain
+
+    def _run(self, classes, i, limit, state, best, end):
+        """
+        Avanza el AFD desde `state` leyendo classes[i:limit]. `best` es el
+        patrón elegido hasta ahora (+ 1, o NONE) y `end` el fin de su
+        coincidencia; el carácter de `limit`, si existe, solo se mira para
+        el \b final. Devuelve (estado, i, best, end): el estado es 0 si el
+        token terminó (el AFD murió o ningún patrón anterior a `best`
+        puede aceptar ya) y distinto de 0 si se acabó la entrada leída.
+        """
+        trans = self._trans
+        accept = self._accept
+        live = self._live
+        word = self._word
+        n = len(classes)
+        while i < limit:
+            c = classes[i]
+            state = trans[state + c]
+            if not state:
+                return 0, i, best, end
+            i += 1
+            k = accept[state]
+            if k:
+                if k > 0xFFFF:
+                    # Patrón con \b final: acepta si el siguiente carácter
+                    # es de otro tipo (palabra / no palabra)
+                    bounded = k >> 16
+                    k &= 0xFFFF
+                    if (not k or bounded < k) and word[c] != (word[classes[i]] if i < n else 0):
+                        k = bounded
+                if k and k <= best:
+                    best = k
+                    end = i
+                    if best < live[state]:
+                        return 0, i, best, end
+        return state, i, best, end
+
+    def longest(self, classes, pos):
+        """Índice del patrón (o -1) y fin de la coincidencia en `pos`."""
+        if pos >= len(classes):
+            return -1, pos
+        _, _, best, end = self._run(classes, pos, len(classes), self._first_state(classes, pos), NONE, pos)
+        return (best - 1, end) if best != NONE else (-1, pos)
+
+    def _scan(self, string, pos):
+        # Como scan(), con el índice del patrón (-1 si no hay) en vez del
+        # nombre. Es el ciclo de _run(), repetido aquí para no pagar una
+        # llamada por token.
+        classes = self.classify(string)
+        trans = self._trans
+        accept = self._accept
+        live = self._live
+        word = self._word
+        start, start_plain = self._start, self._start_plain
+        n = len(classes)
+        while pos < n:
+            state = start
+            if start != start_plain and (word[classes[pos - 1]] if pos else 0) == word[classes[pos]]:
+                state = start_plain
+            best = NONE
+            end = i = pos
+            while i < n:
+                c = classes[i]
+                state = trans[state + c]
+                if not state:
+                    break
+                i += 1
+                k = accept[state]
+                if k:
+                    if k > 0xFFFF:
+                        bounded = k >> 16
+                        k &= 0xFFFF
+                        if (not k or bounded < k) and word[c] != (word[classes[i]] if i < n else 0):
+                            k = bounded
+                    if k and k <= best:
+                        best = k
+                        end = i
+                        if best < live[state]:
+                            break
+            if best != NONE:
+                yield best - 1, pos, end
+                pos = end
+            else:
+                yield -1, pos, pos + 1
+                pos += 1
+
+    def scan(self, string, pos=0):
+        """
+        Genera (nombre, inicio, fin) para todo el texto desde `pos`.
+        Un carácter que no inicia ningún token se reporta como (None, i, i + 1).
+        """
+        names = self.names
+        for index, start, end in self._scan(string, pos):
+            yield (names[index] if index >= 0 else None), start, end
+
+    def scan_chunks(self, chunks, skip=()):
+        """
+        Como scan(), pero sobre un iterable de fragmentos de texto; genera
+        (nombre, lexema, línea, columna), con línea y columna del inicio
+        del token a partir de 1. Para los tokens cuyo nombre está en
+        `skip` el lexema es None. Un carácter que no inicia ningún token
+        se genera como (None, carácter, línea, columna) y ahí termina el
+        análisis.
+
+        Un token que llega vivo al final de un fragmento (identificador,
+        `3.` de un real, comentario sin cerrar, ...) sigue en el siguiente
+        desde el estado del AFD en que quedó, sin volver a leerlo. Del
+        texto ya leído solo se guarda lo que todavía puede hacer falta: el
+        lexema si el token puede terminar siendo uno que se genera, y lo
+        que sigue a una coincidencia más corta ya encontrada mientras un
+        patrón anterior pueda aceptar una más larga (si este no acepta,
+        ese resto se vuelve a analizar). Un comentario de `skip` que nada
+        más puede reemplazar ocupa memoria constante.
+        """
+        names = self.names
+        run = self._run
+        live = self._live
+        reach = self._reach
+        word = self._word
+        table = self._class_table
+        emitted = 0
+        for index, name in enumerate(names):
+            if name not in skip:
+                emitted |= 1 << index
+        chunks = iter(chunks)
+
+        text, classes, base = '', b'', 0  # ventana actual; text[0] está en `base`
+        saved, saved_from = [], 0         # texto anterior a la ventana que aún hace falta
+        counted, line, line_start = 0, 1, 0  # saltos de línea contados hasta `counted`
+        before = 0                        # ¿el carácter anterior al token es de palabra?
+        state = i = pos = end = 0
+        best = NONE
+        first = ''
+        token_line = token_column = 1
+
+        def text_between(a, b):
+            if a >= base:
+                return text[a - base:b - base]
+            return (''.join(saved) + text[:max(b - base, 0)])[a - saved_from:b - saved_from]
+
+        eof = False
+        while not eof:
+            chunk = next(chunks, None)
+            if chunk is None:
+                eof, chunk = True, ''
+            text = text[i - base:] + chunk
+            base = i
+            classes = self.classify(text)
+            n = len(text)
+            # Sin el último carácter: hace falta como siguiente para el \b final
+            limit = n if eof else n - 1
+            while True:
+                if not state:
+                    if i - base >= limit:
+                        break
+                    pos = end = i
+                    best = NONE
+                    first = text[i - base]
+                    token_line, token_column = line, pos - line_start + 1
+                    state = self._start if before != word[classes[i - base]] else self._start_plain
+                state, j, best, e = run(classes, i - base, limit, state, best, end - base)
+                i, end = j + base, e + base
+                if state and not eof and best >= live[state]:
+                    # El token puede seguir en el próximo fragmento: guardar
+                    # solo el texto que todavía puede hacer falta
+                    if (reach[state] | (1 << best - 1 if best != NONE else 0)) & emitted:
+                        keep = pos
+                    else:
+                        keep = end - 1 if best != NONE else i
+                    if keep > counted:
+                        skipped = text_between(counted, keep)
+                        newlines = skipped.count('\n')
+                        if newlines:
+                            line += newlines
+                            line_start = counted + skipped.rfind('\n') + 1
+                        counted = keep
+                    if keep >= base:
+                        saved = [text[keep - base:i - base]]
+                    else:
+                        if keep > saved_from:
+                            saved = [''.join(saved)[keep - saved_from:]]
+                        saved.append(text[:i - base])
+                    saved_from = keep
+                    break
+
+                # Token terminado
+                state = 0
+                if best == NONE:
+                    yield None, first, token_line, token_column
+                    return
+                lexeme = text_between(pos, end) if emitted >> best - 1 & 1 else None
+                rest = text_between(counted, end) if lexeme is None or counted != pos else lexeme
+                newlines = rest.count('\n')
+                if newlines:
+                    line += newlines
+                    line_start = counted + rest.rfind('\n') + 1
+                counted = end
+                yield names[best - 1], lexeme, token_line, token_column
+                if end > base:
+                    before = word[classes[end - 1 - base]]
+                else:
+                    before = word[ord(table[ord(text_between(end - 1, end))])]
+                if end < base:
+                    # El patrón más largo no aceptó: volver a analizar desde `end`
+                    text = text_between(end, base) + text
+                    base = end
+                    classes = self.classify(text)
+                    n = len(text)
+                    limit = n if eof else n - 1
+                saved = []
+                i = end
+
+    def match(self, string, pos=0):
+        index, end = self.longest(self.classify(string), pos)
+        if index < 0:
+            return None
+        return DFAMatch(string, self.names[index], index + 1, pos, end)
+
+    def finditer(self, string, pos=0):
+        names = self.names
+        for index, start, end in self._scan(string, pos):
+            if index >= 0:
+                yield DFAMatch(string, names[index], index + 1, start, end)
+
+    def table_size(self):
+        """Bytes ocupados por las tablas de transición y aceptación."""
+        return (len(self._trans) * self._trans.itemsize
+                + len(self._accept) * self._accept.itemsize
+                + len(self._live) * self._live.itemsize)
+
+
+# Un AFD por especificación; construirlo cuesta mucho más que usarlo
+_scanners = {}
+
+def compile_spec(spec):
+    key = tuple(tuple(entry) for entry in spec)
+    scanner = _scanners.get(key)
+    if scanner is None:
+        scanner = _scanners[key] = DFAScanner(spec)
+    return scanner
@@ -0,0 +1,97 @@
+# incremental_lexer.py
+from bisect import bisect_left
+
+
+def relex(tokens, edit_offset, deleted_len, inserted_text, scan, block_comment=None,
+          first_line=1):
+    """
+    Actualiza el TokenStream `tokens` tras reemplazar `deleted_len`
+    caracteres en `edit_offset` por `inserted_text`, sin volver a
+    tokenizar todo el código.
+
+    El análisis se reanuda en el último token que empieza antes de la
+    línea editada (los tokens y lo que el lexer mira más allá de ellos no
+    cruzan líneas) y se detiene en cuanto un token nuevo, ya pasada la
+    edición, empieza donde empezaba uno viejo desplazado: desde ahí el
+    texto es el mismo y el resultado también. La cola se desplaza de forma
+    perezosa (ver TokenStream.shift_tail).
+
+    `scan(código, pos, línea, inicio_línea)` genera (tipo, inicio, fin,
+    línea, columna) desde `pos`, el inicio de un token, cuya línea empieza
+    en `inicio_línea`. `block_comment` es el par (apertura, cierre) si el
+    lexer tiene comentarios de bloque: una apertura sin cierre lee hasta
+    el final, así que escribir un cierre después obliga a reanudar en ella.
+    `first_line` es la línea donde empieza el código.
+
+    Modifica `tokens` (también tokens.code) y devuelve (primero,
+    quitados, agregados): los índices reemplazados. Si `scan` lanza una
+    excepción, `tokens` queda sin cambios.
+    """
+    code = tokens.code
+    end_old = edit_offset + deleted_len
+    if not 0 <= edit_offset <= end_old <= len(code):
+        raise ValueError('edición fuera del código')
+    new_code = ''.join((code[:edit_offset], inserted_text, code[end_old:]))
+    end_new = edit_offset + len(inserted_text)
+    delta = len(inserted_text) - deleted_len
+    n = len(tokens)
+    start = tokens.start
+
+    # Punto de reanudación: último token que empieza antes de la línea editada
+    line_start = code.rfind('\n', 0, edit_offset) + 1
+    first = bisect_left(range(n), line_start, key=start) - 1
+
+    if block_comment is not None and first > 0:
+        opener, closer = block_comment
+        around = new_code[max(edit_offset - len(closer) + 1, 0):end_new + len(closer) - 1]
+        # Un cierre que empieza en `reach` o después cerraría cualquier
+        # apertura anterior al token de reanudación
+        reach = start(first) + len(opener) - 1
+        if closer in around and code.find(closer, reach) < 0:
+            # Las aperturas después del último cierre no tenían cierre
+            last_closer = code.rfind(closer, 0, reach + len(closer) - 1)
+            limit = max(last_closer - len(opener) + 1, 0)
+            for k in range(bisect_left(range(first), limit, key=start), first):
+                if code.startswith(opener, start(k)):
+                    first = k
+                    break
+
+    if first >= 0:
+        pos = start(first)
+        line = tokens.line(first)
+        line_begin = pos - tokens.columns[first] + 1
+    else:
+        first = pos = line_begin = 0
+        line = first_line
+
+    rows = []
+    j = bisect_left(range(n), end_old, lo=first, key=start)
+    for row in scan(new_code, pos, line, line_begin):
+        if row[1] > end_new:
+            old = row[1] - delta
+            while j < n and start(j) < old:
+                j += 1
+            if (j < n and start(j) == old and tokens.kind(j) == row[0]
+                    and tokens.span(j)[1] == row[2] - delta):
+                break
+        rows.append(row)
+    else:
+        j = n
+
+    # Los tokens de la cola que siguen en la línea editada cambian de columna
+    line_delta = inserted_text.count('\n') - code.count('\n', edit_offset, end_old)
+    column_delta = ((end_new - new_code.rfind('\n', 0, end_new) - 1)
+                    - (end_old - code.rfind('\n', 0, end_old) - 1))
+    if column_delta:
+        line_end = code.find('\n', end_old)
+        if line_end < 0:
+            line_end = len(code)
+        k = j
+        while k < n and start(k) < line_end:
+            tokens.columns[k] += column_delta
+            k += 1
+
+    tokens.shift_tail(j, delta, line_delta)
+    tokens.replace(first, j, rows)
+    tokens.code = new_code
+    return first, j - first, len(rows)
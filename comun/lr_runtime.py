@@ -0,0 +1,41 @@
+# lr_runtime.py
+
+
+class LRStack:
+    """
+    Pilas de un parser LR en dos listas paralelas: `states`, que empieza
+    con el estado inicial, y `values`, con el valor de cada símbolo de la
+    pila (el token desplazado o lo que devolvió la acción de la regla);
+    values[i] es el símbolo por el que se llegó a states[i + 1].
+
+    Una reducción saca sus n símbolos de las dos pilas con un
+    `del pila[-n:]` cada una, y las reglas vacías no tocan las pilas: el
+    costo en operaciones de Python no depende del largo de la regla.
+    """
+    __slots__ = ('states', 'values')
+
+    def __init__(self, state=0):
+        self.states = [state]
+        self.values = []
+
+    def __len__(self):
+        return len(self.values)
+
+    @property
+    def state(self):
+        """Estado en el tope de la pila."""
+        return self.states[-1]
+
+    def push(self, state, value):
+        """Apila `value` y el estado al que se llega con él."""
+        self.states.append(state)
+        self.values.append(value)
+
+    def pop(self, size):
+        """Saca `size` símbolos y devuelve sus valores en el orden de la regla."""
+        if not size:
+            return []
+        values = self.values[-size:]
+        del self.values[-size:]
+        del self.states[-size:]
+        return values
@@ -0,0 +1,40 @@
+# name_table.py
+
+
+class NameTable:
+    """
+    Tabla de nombres de una compilación.
+
+    Cada identificador distinto se guarda una sola vez y recibe un id
+    entero denso (0, 1, 2...). El lexer interna los lexemas al generarlos,
+    así todas las apariciones de un nombre comparten el mismo str, y las
+    tablas de símbolos usan los ids como claves en lugar de los nombres.
+    """
+    def __init__(self):
+        self.ids = {}    # nombre -> id
+        self.names = []  # id -> nombre
+
+    def intern(self, name):
+        """Id de `name`, agregándolo si es la primera vez que aparece."""
+        name_id = self.ids.get(name)
+        if name_id is None:
+            name_id = self.ids[name] = len(self.names)
+            self.names.append(name)
+        return name_id
+
+    def canonical(self, name):
+        """Objeto str compartido para `name`."""
+        return self.names[self.intern(name)]
+
+    def lookup(self, name):
+        """Id de `name` sin agregarlo; None si nunca se ha visto."""
+        return self.ids.get(name)
+
+    def name(self, name_id):
+        return self.names[name_id]
+
+    def __len__(self):
+        return len(self.names)
+
+    def __contains__(self, name):
+        return name in self.ids
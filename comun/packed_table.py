@@ -0,0 +1,110 @@
+# packed_table.py
+from array import array
+from collections import Counter
+
+
+def pack(rows, empty):
+    """
+    Empaca filas dispersas en un solo vector (vector peine): cada fila es
+    una lista de (columna, valor) y se coloca en el primer desplazamiento
+    en que sus columnas caen sobre casillas libres. Devuelve
+    (base, values, check): la casilla de (fila, columna) es
+    base[fila] + columna y le pertenece si check[casilla] == fila.
+    """
+    base = array('i', [0]) * len(rows)
+    values = array('i')
+    check = array('i')
+    # Las filas más llenas primero: las cortas rellenan los huecos
+    for row in sorted(range(len(rows)), key=lambda r: -len(rows[r])):
+        entries = rows[row]
+        if not entries:
+            continue
+        offset = -min(column for column, _ in entries)
+        while not all(_free(check, offset + column) for column, _ in entries):
+            offset += 1
+        base[row] = offset
+        last = max(offset + column for column, _ in entries)
+        if last >= len(values):
+            grow = last + 1 - len(values)
+            values.extend([empty] * grow)
+            check.extend([-1] * grow)
+        for column, value in entries:
+            values[offset + column] = value
+            check[offset + column] = row
+    return base, values, check
+
+
+def _free(check, slot):
+    return slot >= len(check) or check[slot] < 0
+
+
+class PackedTable:
+    """
+    Tabla LR comprimida. Usa los mismos códigos que las matrices densas
+    de las que se arma: acción 0 = error, n > 0 = desplazar al estado
+    n - 1, n < 0 = reducir por la regla -n - 1 (-1, la regla 0, es
+    aceptar); transición -1 = ninguna.
+
+    Acciones: cada estado tiene una reducción por omisión (la más
+    frecuente de su fila) y en el vector peine solo quedan las acciones
+    distintas de ella. Como en yacc, un estado con reducción por omisión
+    reduce también ante un token erróneo; el error se detecta en el
+    estado siguiente, siempre antes de desplazar ese token. Aceptar
+    nunca es la acción por omisión.
+
+    Transiciones: se empacan por símbolo (columna), todas las que existen,
+    sin valor por omisión: la comprobación de dueño dice si la transición
+    está en la tabla, así que una consulta por una que no existe da -1
+    como en la matriz densa.
+    """
+    def __init__(self, action, goto, n_states, action_width, goto_width):
+        """
+        `action` y `goto` son matrices densas por estado (índice
+        estado * ancho + columna) de `action_width` y `goto_width`
+        columnas.
+        """
+        self.n_states = n_states
+        self.action_width = action_width
+        self.goto_width = goto_width
+
+        rows = []
+        self.action_default = array('i', [0]) * n_states
+        for state in range(n_states):
+            cells = action[state * action_width:(state + 1) * action_width]
+            reductions = Counter(code for code in cells if code < -1)
+            default = reductions.most_common(1)[0][0] if reductions else 0
+            self.action_default[state] = default
+            rows.append([(column, code) for column, code in enumerate(cells)
+                         if code and code != default])
+        self.action_base, self.action_values, self.action_check = pack(rows, 0)
+
+        columns = []
+        for column in range(goto_width):
+            columns.append([(state, goto[state * goto_width + column]) for state in range(n_states)
+                            if goto[state * goto_width + column] >= 0])
+        self.goto_base, self.goto_values, self.goto_check = pack(columns, -1)
+
+    def action(self, state, column):
+        """Código de la acción de `state` con el terminal de la columna `column`."""
+        slot = self.action_base[state] + column
+        if 0 <= slot < len(self.action_check) and self.action_check[slot] == state:
+            return self.action_values[slot]
+        return self.action_default[state]
+
+    def goto(self, state, column):
+        """Estado destino desde `state` con el no terminal de la columna `column`, o -1."""
+        slot = self.goto_base[column] + state
+        if 0 <= slot < len(self.goto_check) and self.goto_check[slot] == column:
+            return self.goto_values[slot]
+        return -1
+
+    def arrays(self):
+        """Los arreglos de la tabla por nombre (para guardarla o medirla)."""
+        return {'action_default': self.action_default, 'action_base': self.action_base,
+                'action_values': self.action_values, 'action_check': self.action_check,
+                'goto_base': self.goto_base,
+                'goto_values': self.goto_values, 'goto_check': self.goto_check}
+
+    def nbytes(self):
+        """Bytes que ocupan los datos de los arreglos."""
+        return sum(len(values) * values.itemsize for values in self.arrays().values())
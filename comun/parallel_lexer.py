@@ -0,0 +1,136 @@
+# parallel_lexer.py
+import contextlib
+import io
+import os
+import sys
+from array import array
+from bisect import bisect_right
+
+from .token_stream import TokenStream
+
+# Tamaño mínimo de un fragmento: con menos código por proceso, arrancar
+# los procesos cuesta más de lo que se gana
+MIN_SHARD_SIZE = 1 << 18
+
+
+def split_points(code, parts, protected=None):
+    """
+    Elige hasta `parts - 1` puntos de corte para repartir `code`.
+
+    Cada corte queda justo después de un salto de línea, así ningún token
+    de una sola línea se parte. `protected` es una regex compilada con las
+    construcciones que pueden cruzar líneas (comentarios de bloque, y las
+    cadenas o comentarios de línea que podrían contener su delimitador);
+    los saltos de línea dentro de sus coincidencias no se usan como corte.
+    """
+    spans_start, spans_end = [], []
+    if protected is not None:
+        for match in protected.finditer(code):
+            start, end = match.span()
+            if code.find('\n', start, end) >= 0:
+                spans_start.append(start)
+                spans_end.append(end)
+
+    cuts = []
+    last = 0
+    for i in range(1, parts):
+        pos = max(len(code) * i // parts, last)
+        while True:
+            newline = code.find('\n', pos)
+            if newline < 0:
+                return cuts
+            k = bisect_right(spans_start, newline) - 1
+            if k >= 0 and newline < spans_end[k]:
+                # El salto está dentro de un comentario de bloque: seguir tras él
+                pos = spans_end[k]
+                continue
+            break
+        if newline + 1 < len(code):
+            cuts.append(newline + 1)
+            last = newline + 1
+    return cuts
+
+
+def _lex_shard(lex_shard, shard, first_line, is_last):
+    """
+    Ejecuta `lex_shard` en un proceso hijo y devuelve sus columnas.
+    `is_last` es None si `lex_shard` no lo recibe.
+    """
+    diagnostics = io.StringIO()
+    error = None
+    with contextlib.redirect_stderr(diagnostics):
+        try:
+            if is_last is None:
+                stream = lex_shard(shard, first_line)
+            else:
+                stream = lex_shard(shard, first_line, is_last)
+        except Exception as e:
+            stream, error = None, e
+    if stream is None:
+        return None, diagnostics.getvalue(), error
+    # El fragmento de código no se devuelve: el proceso padre ya lo tiene
+    columns = (stream.token_class, stream.kind_names, stream.kinds, stream.starts,
+               stream.ends, stream.lines, stream.columns, stream.values)
+    return columns, diagnostics.getvalue(), error
+
+
+def tokenize_parallel(code, lex_shard, workers=None, protected=None,
+                      min_shard_size=MIN_SHARD_SIZE, eof=False):
+    """
+    Tokeniza `code` en paralelo y devuelve un solo TokenStream.
+
+    `lex_shard(fragmento, primera_linea)` debe ser una función de módulo
+    (se envía a los procesos) que devuelva el TokenStream del fragmento.
+    Con `eof`, se llama como `lex_shard(fragmento, primera_linea,
+    es_ultimo)` para que solo el último fragmento agregue el token de fin.
+    Cada fragmento tiene al menos `min_shard_size` caracteres (salvo que
+    el código sea más corto). Los fragmentos se separan con split_points(); los
+    desplazamientos se corrigen al unirlos y los mensajes que los
+    lexers escriban en stderr se reproducen en orden. Si un fragmento
+    lanza una excepción, se relanza la del primer fragmento que falló.
+    El resultado es igual al de tokenizar `code` de una sola vez.
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    parts = max(1, min(workers, len(code) // min_shard_size))
+    bounds = [0] + split_points(code, parts, protected) + [len(code)]
+    shards = [code[bounds[i]:bounds[i + 1]] for i in range(len(bounds) - 1)]
+    first_lines = [1]
+    for i in range(1, len(shards)):
+        first_lines.append(first_lines[-1] + code.count('\n', bounds[i - 1], bounds[i]))
+    lasts = [False] * (len(shards) - 1) + [True] if eof else [None] * len(shards)
+
+    if len(shards) == 1:
+        results = [_lex_shard(lex_shard, shards[0], 1, lasts[0])]
+    else:
+        # Cargar concurrent.futures cuesta casi tanto como el resto del
+        # lexer, así que se importa solo cuando hay varios fragmentos
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=min(workers, len(shards))) as pool:
+            results = list(pool.map(_lex_shard, [lex_shard] * len(shards),
+                                    shards, first_lines, lasts))
+
+    stream = None
+    for base, (columns, diagnostics, error) in zip(bounds, results):
+        if diagnostics:
+            sys.stderr.write(diagnostics)
+        if error is not None:
+            raise error
+        token_class, kind_names, kinds, starts, ends, lines, cols, values = columns
+        if stream is None:
+            stream = TokenStream(code, token_class)
+        remap = [stream.kind_id(name) for name in kind_names]
+        if remap != list(range(len(remap))):
+            kinds = array('i', map(remap.__getitem__, kinds))
+        if base or starts.typecode != stream.starts.typecode:
+            starts = array(stream.starts.typecode, map(base.__add__, starts))
+            ends = array(stream.ends.typecode, map(base.__add__, ends))
+        offset = len(stream)
+        for i, value in values.items():
+            stream.values[offset + i] = value
+        stream.kinds.extend(kinds)
+        stream.starts.extend(starts)
+        stream.ends.extend(ends)
+        stream.lines.extend(lines)
+        stream.columns.extend(cols)
+    return stream
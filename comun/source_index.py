@@ -0,0 +1,46 @@
+# source_index.py
+from array import array
+from bisect import bisect_right
+
+
+class SourceIndex:
+    """
+    Índice de inicios de línea de un código fuente.
+
+    Se construye una sola vez (un str.find por línea) y convierte cualquier
+    desplazamiento del buffer en (línea, columna), ambas desde 1, mediante
+    búsqueda binaria. Así los tokens pueden guardar solo su desplazamiento
+    y resolver la posición cuando un diagnóstico la necesite.
+
+    `first_line` es el número de la primera línea de `code`, para cuando
+    el código es un fragmento de un archivo mayor.
+    """
+    def __init__(self, code, first_line=1):
+        self.code = code
+        self.first_line = first_line
+        starts = array('q', [0])
+        find = code.find
+        pos = find('\n')
+        while pos >= 0:
+            starts.append(pos + 1)
+            pos = find('\n', pos + 1)
+        self.line_starts = starts
+
+    def __len__(self):
+        """Número de líneas del código."""
+        return len(self.line_starts)
+
+    def line_of(self, offset):
+        """Línea que contiene el desplazamiento `offset`."""
+        return bisect_right(self.line_starts, offset) + self.first_line - 1
+
+    def position(self, offset):
+        """Devuelve (línea, columna) del desplazamiento `offset`."""
+        line = bisect_right(self.line_starts, offset)
+        return line + self.first_line - 1, offset - self.line_starts[line - 1] + 1
+
+    def line_text(self, line):
+        """Texto de la línea `line`, sin el salto de línea."""
+        start = self.line_starts[line - self.first_line]
+        end = self.code.find('\n', start)
+        return self.code[start:] if end < 0 else self.code[start:end]
@@ -0,0 +1,96 @@
+# table_cache.py
+import hashlib
+import json
+import os
+import struct
+import sys
+from array import array
+
+MAGIC = b'LRTC'
+VERSION = 1
+
+# Encabezado: firma, versión, hash de las fuentes y largo de los metadatos
+_HEADER = struct.Struct('<4sH32sI')
+
+
+def source_key(paths):
+    """Hash del contenido de `paths` (en orden) y del formato de la caché."""
+    digest = hashlib.sha256(f'{VERSION} {sys.byteorder}'.encode())
+    for path in paths:
+        with open(path, 'rb') as f:
+            data = f.read()
+        digest.update(struct.pack('<Q', len(data)))
+        digest.update(data)
+    return digest.digest()
+
+
+def save(path, key, meta, arrays):
+    """
+    Escribe la caché: el encabezado, `meta` (un dict serializable a JSON)
+    y los arreglos de `arrays` ({nombre: array}) tal como están en memoria.
+    La escritura pasa por un archivo temporal, así que un lector nunca ve
+    un archivo a medias.
+    """
+    names = list(arrays)
+    meta = dict(meta, _arrays=[[name, arrays[name].typecode, arrays[name].itemsize,
+                                len(arrays[name])] for name in names])
+    blob = json.dumps(meta, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    temp = f'{path}.{os.getpid()}.tmp'
+    try:
+        with open(temp, 'wb') as f:
+            f.write(_HEADER.pack(MAGIC, VERSION, key, len(blob)))
+            f.write(blob)
+            for name in names:
+                f.write(arrays[name].tobytes())
+        os.replace(temp, path)
+    finally:
+        if os.path.exists(temp):
+            os.remove(temp)
+
+
+def load(path, key):
+    """(meta, arrays) guardados en `path`, o None si no existe, está dañada o es de otras fuentes."""
+    try:
+        with open(path, 'rb') as f:
+            data = f.read()
+    except OSError:
+        return None
+    if len(data) < _HEADER.size:
+        return None
+    magic, version, stored_key, size = _HEADER.unpack_from(data)
+    if magic != MAGIC or version != VERSION or stored_key != key:
+        return None
+    pos = _HEADER.size + size
+    try:
+        meta = json.loads(data[_HEADER.size:pos])
+        layout = meta.pop('_arrays')
+    except (ValueError, KeyError):
+        return None
+    arrays = {}
+    for name, typecode, itemsize, count in layout:
+        values = array(typecode)
+        end = pos + itemsize * count
+        if values.itemsize != itemsize or end > len(data):
+            return None
+        values.frombytes(data[pos:end])
+        arrays[name] = values
+        pos = end
+    return meta, arrays
+
+
+def cached(path, sources, build):
+    """
+    Devuelve (meta, arrays) desde la caché `path` si fue generada a partir
+    del contenido actual de `sources`; si no, llama a `build()` y guarda
+    su resultado. Si no se puede escribir la caché se sigue sin ella.
+    """
+    key = source_key(sources)
+    hit = load(path, key)
+    if hit is not None:
+        return hit
+    meta, arrays = build()
+    try:
+        save(path, key, meta, arrays)
+    except OSError:
+        pass
+    return meta, arrays
@@ -0,0 +1,53 @@
+# token_buffer.py
+from collections import deque
+
+_END = object()
+
+
+class TokenBuffer:
+    """
+    Entrada de un parser que pide los tokens bajo demanda.
+
+    Envuelve cualquier iterable de tokens (una lista, un TokenStream o
+    un generador del lexer). Un token se pide al iterable solo cuando
+    el parser lo mira, y los ya consumidos se descartan; el búfer guarda
+    únicamente la anticipación que el parser usa. Así el análisis léxico
+    avanza a la par del sintáctico y se detiene con el primer error de
+    sintaxis. Los errores del lexer aparecen al llegar a ellos.
+    """
+    def __init__(self, tokens):
+        self._source = iter(tokens)
+        self._ahead = deque()
+        self.consumed = 0  # tokens ya consumidos con advance()
+
+    def _fill(self, n):
+        """Intenta tener `n` tokens en el búfer; devuelve cuántos hay."""
+        ahead = self._ahead
+        while len(ahead) < n:
+            token = next(self._source, _END)
+            if token is _END:
+                break
+            ahead.append(token)
+        return len(ahead)
+
+    def peek(self, k=0):
+        """Token `k` posiciones adelante del actual (k=0) o None al terminar."""
+        if len(self._ahead) > k or self._fill(k + 1) > k:
+            return self._ahead[k]
+        return None
+
+    def advance(self):
+        """Consume el token actual y devuelve el siguiente (o None)."""
+        if self._ahead or self._fill(1):
+            self._ahead.popleft()
+            self.consumed += 1
+        return self.peek()
+
+    def window(self, n):
+        """Lista con los próximos `n` tokens como máximo, sin consumirlos."""
+        self._fill(n)
+        return list(self._ahead)[:n]
+
+    def at_end(self):
+        """True si ya no quedan tokens."""
+        return not self._ahead and not self._fill(1)
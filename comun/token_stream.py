@@ -0,0 +1,190 @@
+# token_stream.py
+from array import array
+from collections.abc import Sequence
+
+
+class TokenStream(Sequence):
+    """
+    Secuencia de tokens guardada por columnas.
+
+    En vez de un objeto Token por token se guardan arreglos paralelos de
+    enteros (tipo, inicio, fin, línea y columna) junto con el código
+    fuente. El lexema y el Token solo se crean al acceder a un elemento,
+    así que los parsers pueden indexar e iterar el flujo como una lista.
+
+    `token_class` es la clase Token del analizador; se construye como
+    token_class(tipo, lexema, línea, columna).
+
+    `code` también puede ser bytes o un mmap; en ese caso se indica
+    `encoding` y los lexemas se decodifican solo al pedirlos.
+
+    Después de una edición (ver incremental_lexer.relex) la cola del flujo
+    se desplaza de forma perezosa: los tokens desde `shift_index` suman
+    `shift` a sus desplazamientos y `line_shift` a su línea al leerse. Los
+    arreglos solo tienen los valores finales después de flush().
+    """
+    def __init__(self, code, token_class, encoding=None):
+        self.code = code
+        self.token_class = token_class
+        self.encoding = encoding
+        self.kind_names = []  # id de tipo -> nombre
+        self.kind_ids = {}    # nombre -> id de tipo
+        # Desplazamientos de 64 bits solo si el buffer no cabe en 32
+        offset_type = 'q' if len(code) > 0x7fffffff else 'i'
+        self.kinds = array('i')
+        self.starts = array(offset_type)
+        self.ends = array(offset_type)
+        self.lines = array('i')
+        self.columns = array('i')
+        self.values = {}      # lexemas que no son un trozo del código (EOF, errores)
+        self.shift_index = 0
+        self.shift = 0
+        self.line_shift = 0
+
+    def kind_id(self, kind):
+        """Id entero del tipo `kind`, registrándolo si es nuevo."""
+        kind_id = self.kind_ids.get(kind)
+        if kind_id is None:
+            kind_id = self.kind_ids[kind] = len(self.kind_names)
+            self.kind_names.append(kind)
+        return kind_id
+
+    def add(self, kind, start, end, line, column, value=None):
+        """
+        Agrega un token; `value` solo si el lexema no es code[start:end].
+        Es para construir el flujo: no tiene en cuenta desplazamientos pendientes.
+        """
+        kind_id = self.kind_ids.get(kind)
+        if kind_id is None:
+            kind_id = self.kind_id(kind)
+        if value is not None:
+            self.values[len(self.kinds)] = value
+        self.kinds.append(kind_id)
+        self.starts.append(start)
+        self.ends.append(end)
+        self.lines.append(line)
+        self.columns.append(column)
+
+    def __len__(self):
+        return len(self.kinds)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self._token(j) for j in range(*i.indices(len(self.kinds)))]
+        if i < 0:
+            i += len(self.kinds)
+        if not 0 <= i < len(self.kinds):
+            raise IndexError('índice de token fuera de rango')
+        return self._token(i)
+
+    def __iter__(self):
+        for i in range(len(self.kinds)):
+            yield self._token(i)
+
+    def _token(self, i):
+        return self.token_class(self.kind_names[self.kinds[i]], self.lexeme(i),
+                                self.line(i), self.columns[i])
+
+    def kind(self, i):
+        """Nombre del tipo del token `i`, sin crear el Token."""
+        return self.kind_names[self.kinds[i]]
+
+    def lexeme(self, i):
+        """Lexema del token `i`, sin crear el Token."""
+        value = self.values.get(i)
+        if value is None:
+            start, end = self.span(i)
+            value = self.code[start:end]
+            if self.encoding is not None:
+                value = value.decode(self.encoding)
+        return value
+
+    def start(self, i):
+        """Inicio del token `i` en el código."""
+        if i >= self.shift_index:
+            return self.starts[i] + self.shift
+        return self.starts[i]
+
+    def span(self, i):
+        """(inicio, fin) del token `i` en el código."""
+        if i >= self.shift_index:
+            return self.starts[i] + self.shift, self.ends[i] + self.shift
+        return self.starts[i], self.ends[i]
+
+    def line(self, i):
+        """Línea del token `i`."""
+        if i >= self.shift_index:
+            return self.lines[i] + self.line_shift
+        return self.lines[i]
+
+    def view(self, i):
+        """memoryview del lexema `i` sin copiarlo (código en bytes o mmap)."""
+        start, end = self.span(i)
+        return memoryview(self.code)[start:end]
+
+    def _move_shift(self, index):
+        """
+        Mueve el inicio de la cola desplazada a `index`. Solo se tocan los
+        tokens entre la posición vieja y la nueva, así que ediciones
+        seguidas en el mismo lugar no recorren el flujo.
+        """
+        old = self.shift_index
+        if self.shift or self.line_shift:
+            if index > old:
+                low, high, sign = old, index, 1
+            else:
+                low, high, sign = index, old, -1
+            shift, line_shift = sign * self.shift, sign * self.line_shift
+            for column, delta in ((self.starts, shift), (self.ends, shift),
+                                  (self.lines, line_shift)):
+                if delta:
+                    column[low:high] = array(column.typecode,
+                                             map(delta.__add__, column[low:high]))
+        self.shift_index = index
+
+    def shift_tail(self, index, offset_delta, line_delta):
+        """Desplaza los tokens desde `index` en `offset_delta` posiciones y `line_delta` líneas."""
+        self._move_shift(index)
+        self.shift += offset_delta
+        self.line_shift += line_delta
+
+    def flush(self):
+        """Aplica a los arreglos el desplazamiento pendiente de la cola."""
+        self._move_shift(len(self.kinds))
+        self.shift = self.line_shift = 0
+
+    def replace(self, first, last, rows):
+        """
+        Reemplaza los tokens [first, last) por `rows`, tuplas
+        (tipo, inicio, fin, línea, columna) con posiciones finales.
+        """
+        if self.shift_index < last:
+            self._move_shift(last)
+        diff = len(rows) - (last - first)
+        if self.values:
+            self.values = {i + diff if i >= last else i: value
+                           for i, value in self.values.items() if not first <= i < last}
+        kinds = array('i')
+        starts = array(self.starts.typecode)
+        ends = array(self.ends.typecode)
+        lines = array('i')
+        columns = array('i')
+        kind_ids = self.kind_ids
+        for kind, start, end, line, column in rows:
+            kind_id = kind_ids.get(kind)
+            kinds.append(self.kind_id(kind) if kind_id is None else kind_id)
+            starts.append(start)
+            ends.append(end)
+            lines.append(line)
+            columns.append(column)
+        self.kinds[first:last] = kinds
+        self.starts[first:last] = starts
+        self.ends[first:last] = ends
+        self.lines[first:last] = lines
+        self.columns[first:last] = columns
+        self.shift_index += diff
+
+    def nbytes(self):
+        """Bytes ocupados por las columnas (sin contar el código fuente)."""
+        return sum(col.itemsize * len(col) for col in
+                   (self.kinds, self.starts, self.ends, self.lines, self.columns))
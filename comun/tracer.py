@@ -0,0 +1,100 @@
+# tracer.py
+from collections import Counter, deque
+
+OFF, SUMMARY, FULL = 'off', 'summary', 'full'
+LEVELS = (OFF, SUMMARY, FULL)
+
+
+class Tracer:
+    """
+    Traza de un parser LR, con tres niveles:
+
+        off      no se registra nada; los parsers usan su camino sin traza
+        summary  solo se cuentan los pasos por tipo; al terminar se
+                 imprime el resumen
+        full     se imprime cada paso
+
+    Un paso se registra con una función de formato y sus argumentos (una
+    copia de lo que hay que mostrar); el texto se arma solo para los
+    pasos que realmente se imprimen. Con `ring=N` (nivel full) se guardan
+    solo los últimos N pasos y se imprimen si el análisis termina con
+    error. `out` es el archivo de salida (sys.stdout por omisión).
+    """
+    def __init__(self, level=FULL, ring=None, out=None):
+        if level not in LEVELS:
+            raise ValueError(f"nivel de traza desconocido: {level!r} (se esperaba {', '.join(LEVELS)})")
+        self.level = level
+        self.enabled = level != OFF
+        self.full = level == FULL
+        self.ring = deque(maxlen=ring) if ring and self.full else None
+        self.out = out
+        self.header = None
+        self.steps = 0
+        self.counts = Counter()
+
+    def _write(self, text):
+        print(text, file=self.out)
+
+    def start(self, header=None):
+        """
+        Empieza la traza de un análisis. `header` es una línea de
+        encabezado: en nivel full se imprime ya, o antes de los pasos
+        guardados si se usa `ring`.
+        """
+        self.header = header
+        self.steps = 0
+        self.counts.clear()
+        if self.ring is not None:
+            self.ring.clear()
+        elif self.full and header is not None:
+            self._write(header)
+
+    def step(self, kind, format, *args):
+        """
+        Registra un paso de tipo `kind` ('shift', 'reduce', ...); el
+        texto es `format(*args)`. Con kind None es una línea extra del
+        paso anterior y no se cuenta.
+        """
+        if kind is not None:
+            self.steps += 1
+            self.counts[kind] += 1
+        if self.ring is not None:
+            self.ring.append((format, args))
+        elif self.full:
+            self._write(format(*args))
+
+    def count(self, kind):
+        """Cuenta un paso sin nada que mostrar (nivel summary)."""
+        self.steps += 1
+        self.counts[kind] += 1
+
+    def finish(self, ok):
+        """
+        Cierra la traza: si el análisis falló, imprime los pasos
+        guardados en el anillo; en nivel summary, imprime el resumen.
+        """
+        if not ok and self.ring:
+            if self.header is not None:
+                self._write(self.header)
+            self._write(f"... últimos {len(self.ring)} registros de {self.steps} pasos:")
+            for format, args in self.ring:
+                self._write(format(*args))
+        if self.ring is not None:
+            self.ring.clear()
+        if self.level == SUMMARY:
+            self._write(self.summary())
+
+    def summary(self):
+        detail = ', '.join(f"{kind} {n}" for kind, n in self.counts.items())
+        return f"Pasos: {self.steps} ({detail})" if detail else f"Pasos: {self.steps}"
+
+
+def make_tracer(trace):
+    """Tracer para el argumento `trace` de un parser: un Tracer, un nivel o un bool."""
+    if isinstance(trace, Tracer):
+        return trace
+    if trace is True:
+        return Tracer(FULL)
+    if trace is False or trace is None:
+        return Tracer(OFF)
+    return Tracer(trace)
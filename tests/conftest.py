@@ -0,0 +1,9 @@
+import os
+import sys
+
+# Las etapas no son paquetes: sus módulos se importan desde su directorio
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for directorio in ('', 'Etapa_Semantico_Final', 'Practica_Semantico', 'Avances-Traductor'):
+    ruta = os.path.join(RAIZ, directorio)
+    if ruta not in sys.path:
+        sys.path.insert(0, ruta)
@@ -0,0 +1,45 @@
+"""benchmarks/corpus.py: tamaño exacto y lo que cada lexer hace con el código."""
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'benchmarks'))
+from corpus import FORMAS, generar, parse_size  # noqa: E402
+
+import analizador_lexico
+import compilador2
+import compiler
+import lexer
+import semantico
+
+
+@pytest.mark.parametrize('forma', FORMAS)
+@pytest.mark.parametrize('tamano', [0, 1, 100, 4000, 54321])
+def test_tamano_exacto(forma, tamano):
+    codigo = generar(forma, tamano)
+    assert len(codigo) == tamano
+    assert codigo == generar(forma, tamano)
+
+
+def test_sufijos_decimales():
+    assert parse_size('2K') == 2000
+    assert parse_size('1.5M') == 1_500_000
+
+
+@pytest.mark.parametrize('forma', FORMAS)
+def test_ningun_lexer_se_detiene(forma, capsys):
+    codigo = generar(forma, 20000)
+    lexer.tokenize(codigo)
+    compiler.LexicalAnalyzer().tokenize(codigo)
+    analizador_lexico.Lexer(codigo).tokenize()
+    assert compilador2.AnalizadorLexico(codigo).analizar()
+    lexico = semantico.AnalizadorLexico(codigo)
+    lexico.analizar()
+    assert lexico.errores == []
+
+
+def test_lexer_sin_comentarios():
+    # lexer.py no tiene comentarios: salen como operadores
+    assert [valor for _, valor in lexer.tokenize('// a /* b */')] == ['/', '/', 'a', '/', '*', 'b', '*', '/']
+    assert [valor for _, valor in lexer.tokenize('a != b')] == ['a', '!', '=', 'b']
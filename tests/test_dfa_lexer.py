@@ -0,0 +1,103 @@
+"""El AFD de comun.dfa_lexer debe dar las mismas coincidencias que `re`."""
+import random
+import re
+
+import pytest
+
+from comun.dfa_lexer import DFAScanner, RegexSyntaxError, compile_spec
+
+import analizador_lexico
+import lexer
+import semantico
+import tokens_def
+
+COMPILER_SPEC = [
+    ('INT', r'int'), ('FLOAT', r'float'), ('RETURN', r'return'),
+    ('ID', r'[a-zA-Z][a-zA-Z0-9_]*'), ('NUMBER', r'\d+(\.\d+)?'),
+    ('PLUS', r'\+'), ('MINUS', r'-'), ('MULTIPLY', r'\*'), ('DIVIDE', r'/'),
+    ('ASSIGN', r'='), ('SEMICOLON', r';'), ('COMMA', r','),
+    ('LPAREN', r'\('), ('RPAREN', r'\)'), ('LBRACE', r'\{'), ('RBRACE', r'\}'),
+    ('WHITESPACE', r'[ \t\n]+'), ('COMMENT', r'//.*'),
+]
+
+ALFABETO = list("abifelsntwhrm019._ \t\n\r+-*/=!<>&|;,(){}$\"#\\'é٣\x85\x1c") + [
+    'if', 'int', 'char', 'while', 'else', 'return', 'float', 'main',
+    '12', '3.5', '!=', '==', '<=', '/*', '*/', '//', "'a'"]
+
+
+def especificaciones():
+    return {
+        'lexer': [(f'T{i}', patron) for i, (nombre, patron) in enumerate(lexer.token_specification)],
+        'tokens_def': tokens_def.TOKEN_SPECIFICATION,
+        'compiler': COMPILER_SPEC,
+        'semantico': [(f'P{i}', p[0], p[2] if len(p) > 2 else 0)
+                      for i, p in enumerate(semantico.AnalizadorLexico('').patrones)],
+    }
+
+
+def maestra(spec):
+    partes = []
+    for entrada in spec:
+        nombre, patron = entrada[:2]
+        if len(entrada) > 2 and entrada[2] & re.DOTALL:
+            patron = f'(?s:{patron})'
+        partes.append(f'(?P<{nombre}>{patron})')
+    return re.compile('|'.join(partes))
+
+
+def coincidencias(regex, texto):
+    return [(m.lastgroup, m.span()) for m in regex.finditer(texto)]
+
+
+@pytest.mark.parametrize('nombre', ['lexer', 'tokens_def', 'compiler', 'semantico'])
+def test_paridad_con_re(nombre):
+    spec = especificaciones()[nombre]
+    regex = maestra(spec)
+    dfa = DFAScanner(spec)
+    rng = random.Random(nombre)
+    for _ in range(3000):
+        texto = ''.join(rng.choice(ALFABETO) for _ in range(rng.randint(0, 30)))
+        assert coincidencias(dfa, texto) == coincidencias(regex, texto), texto
+
+
+@pytest.mark.parametrize('texto', ['12abc', '!=', 'x != y', 'ifx if', '3.5x', 'a_1 2.0'])
+def test_limites_de_palabra_y_prioridad(texto):
+    finditer_re, _ = lexer.compile_scanner(backend='re')
+    finditer_dfa, _ = lexer.compile_scanner(backend='dfa')
+    esperado = [(m.lastgroup, m.span()) for m in finditer_re(texto)]
+    assert [(m.lastgroup, m.span()) for m in finditer_dfa(texto)] == esperado
+
+
+def test_tokenize_igual_en_los_dos_backends():
+    codigo = 'int x = 12; float y = 3.5; if (x != y && !z) { return x; }\n'
+    assert lexer.tokenize(codigo, backend='dfa') == lexer.tokenize(codigo)
+
+
+def test_limite_de_palabra_en_medio_se_rechaza():
+    with pytest.raises(RegexSyntaxError):
+        DFAScanner([('X', r'a\bb')])
+
+
+def test_patron_que_acepta_vacio_se_rechaza():
+    with pytest.raises(RegexSyntaxError):
+        DFAScanner([('X', r'a*')])
+
+
+def test_compile_spec_reutiliza_el_escaner():
+    assert compile_spec(COMPILER_SPEC) is compile_spec(list(COMPILER_SPEC))
+
+
+def test_lexer_de_avances_con_afd():
+    codigo = 'int x = 10; // comentario\nfloat y = 3.14; # otro\nprint(x != y);\n'
+    con_re = [(t.type, t.value, t.line, t.column) for t in analizador_lexico.Lexer(codigo).tokenize()]
+    con_afd = [(t.type, t.value, t.line, t.column)
+               for t in analizador_lexico.Lexer(codigo, backend='dfa').tokenize()]
+    assert con_afd == con_re
+
+
+def test_analizador_de_semantico_con_afd():
+    codigo = "int main() {\n  char c = '\\n'; /* varias\nlíneas */ float f = 2.5;\n  return 0;\n}\n"
+    con_re = semantico.AnalizadorLexico(codigo).analizar()
+    con_afd = semantico.AnalizadorLexico(codigo, backend='dfa').analizar()
+    assert [(t.tipo, t.valor, t.linea, t.columna) for t in con_afd] == \
+        [(t.tipo, t.valor, t.linea, t.columna) for t in con_re]
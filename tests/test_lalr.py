@@ -0,0 +1,98 @@
+"""Generador LALR(1): autómata canónico, modo compat y precedencia por regla."""
+import contextlib
+import io
+import os
+import random
+
+import pytest
+
+import lalr
+from lalr import LALR, read_grammar, to_csv
+from lexer import token_map, tokenize
+from parser_lr import LRParser
+
+ETAPA = os.path.dirname(os.path.abspath(lalr.__file__))
+INF = os.path.join(ETAPA, 'compilador.inf')
+CSV = os.path.join(ETAPA, 'compilador.csv')
+
+
+@pytest.fixture(scope='module')
+def gramatica():
+    return read_grammar(INF)
+
+
+def test_compat_igual_a_compilador_csv(gramatica):
+    with open(CSV, encoding='utf-8', newline='') as f:
+        assert to_csv(*LALR(*gramatica, compat=True).rows()) == f.read()
+
+
+def test_estados_con_el_nucleo_exacto(gramatica):
+    automata = LALR(*gramatica)
+    nucleos = [frozenset(nucleo) for nucleo in automata.states]
+    assert len(set(nucleos)) == len(nucleos)
+    for estado, cerradura in enumerate(automata.closures):
+        for (origen, simbolo), destino in automata.transitions.items():
+            if origen != estado:
+                continue
+            nucleo = {(regla, punto + 1) for regla, punto in cerradura
+                      if punto < len(automata.rules[regla][1]) and automata.rules[regla][1][punto] == simbolo}
+            assert nucleos[destino] == nucleo
+
+
+def test_canonico_y_compat_aceptan_lo_mismo(gramatica):
+    parsers = [LRParser(a.table(), a.rule_sizes())
+               for a in (LALR(*gramatica), LALR(*gramatica, compat=True))]
+    with open(os.path.join(ETAPA, 'codigo.txt'), encoding='utf-8') as f:
+        base = tokenize(f.read())
+    terminales = [t for t in gramatica[0] if t != '$']
+    rng = random.Random(0)
+    aceptadas = 0
+    for _ in range(3000):
+        tokens = list(base)
+        for _ in range(rng.randint(0, 2)):
+            i = rng.randrange(len(tokens))
+            t = rng.choice(terminales)
+            if rng.random() < 0.5:
+                tokens.insert(i, (token_map[t], t))
+            else:
+                del tokens[i]
+        resultados = []
+        for parser in parsers:
+            with contextlib.redirect_stdout(io.StringIO()):
+                try:
+                    resultados.append(parser.parse(tokens + [(token_map['$'], '$')], False))
+                except SyntaxError:
+                    resultados.append(False)
+        assert resultados[0] == resultados[1], tokens
+        aceptadas += resultados[0]
+    assert aceptadas
+
+
+def test_precedencia_por_contenido_de_la_regla(gramatica):
+    terminales, reglas = gramatica
+    # Se intercambian los números de las reglas 44 y 45: la del opSuma
+    # unario sigue en el nivel de opNot
+    reglas = dict(reglas)
+    reglas[44], reglas[45] = reglas[45], reglas[44]
+    automata = LALR(terminales, reglas)
+    nivel_not = automata.precedence['opNot'][0]
+    assert reglas[45] == ('Expresion', ('opSuma', 'Expresion'))
+    assert automata.rule_precedence[45] == nivel_not
+    assert automata.unused_precedence == []
+
+
+def test_precedencia_sin_regla_se_reporta(gramatica):
+    automata = LALR(*gramatica, precedence=lalr.PRECEDENCE + (('left', ('opPot',)),),
+                    rule_precedence={('Expresion', ('opResta', 'Expresion')): 'opNot',
+                                     ('Expresion', ('opSuma', 'Expresion')): 'opNot'})
+    assert automata.unused_precedence == ['opPot', ('Expresion', ('opResta', 'Expresion'))]
+
+
+@pytest.mark.parametrize('compat', [False, True])
+def test_load_con_cache(tmp_path, compat):
+    cache = str(tmp_path / 'tabla.cache')
+    tabla, reglas, conflictos = lalr.load(INF, cache, compat=compat)
+    de_nuevo = lalr.load(INF, cache, compat=compat)
+    assert tabla.n_states == (95 if compat else 97)
+    assert list(de_nuevo[0].action) == list(tabla.action)
+    assert de_nuevo[2] == conflictos
@@ -0,0 +1,60 @@
+"""tokenize(), tokenize_file() y tokenize_mmap() dan los mismos tokens."""
+import os
+import sys
+
+import pytest
+
+import lexer
+
+BENCH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'benchmarks')
+sys.path.insert(0, BENCH)
+from corpus import FORMAS, generar  # noqa: E402
+
+CODIGO = os.path.join(os.path.dirname(lexer.__file__), 'codigo.txt')
+
+
+def posiciones(codigo):
+    """(id, lexema, línea, columna) calculados sobre tokenize_iter con backend='re'."""
+    finditer, kinds = lexer.compile_scanner()
+    linea, inicio_linea = 1, 0
+    tokens = []
+    for match in finditer(codigo):
+        name, kind = kinds[match.lastgroup]
+        if name == 'NEWLINE':
+            linea += 1
+            inicio_linea = match.end()
+        elif name != 'SKIP':
+            tokens.append((kind, match.group(), linea, match.start() - inicio_linea + 1))
+    assert [t[:2] for t in tokens] == lexer.tokenize(codigo)
+    return tokens
+
+
+def escribir(tmp_path, codigo):
+    ruta = tmp_path / 'codigo.txt'
+    ruta.write_text(codigo, encoding='ascii', newline='')
+    return str(ruta)
+
+
+@pytest.mark.parametrize('forma', FORMAS + ('codigo.txt',))
+@pytest.mark.parametrize('fragmento', [1, 7, 64, 1 << 16])
+def test_tokenize_file_igual_a_tokenize(tmp_path, forma, fragmento):
+    if forma == 'codigo.txt':
+        with open(CODIGO, encoding='utf-8') as f:
+            codigo = f.read()
+    else:
+        codigo = generar(forma, 4000)
+    ruta = escribir(tmp_path, codigo)
+    esperado = posiciones(codigo)
+    assert list(lexer.tokenize_file(ruta, chunk_size=fragmento)) == esperado
+    stream = lexer.tokenize_mmap(ruta)
+    try:
+        assert list(stream) == esperado
+    finally:
+        stream.code.close()
+
+
+@pytest.mark.parametrize('fragmento', [1, 3, 1 << 16])
+def test_tokenize_file_error_con_posicion(tmp_path, fragmento):
+    ruta = escribir(tmp_path, 'int a;\n  b = a # 2;\n')
+    with pytest.raises(RuntimeError, match=r"'#' en la línea 2, columna 9"):
+        list(lexer.tokenize_file(ruta, chunk_size=fragmento))
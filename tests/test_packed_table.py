@@ -0,0 +1,49 @@
+"""La tabla comprimida da las mismas transiciones que la completa."""
+import os
+
+import pytest
+
+from comun.packed_table import PackedTable
+
+import semantico
+from parser_lr import DenseTable
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture
+def en_directorio(monkeypatch):
+    def cambiar(etapa):
+        monkeypatch.chdir(os.path.join(RAIZ, etapa))
+    return cambiar
+
+
+def test_goto_de_semantico_sin_transicion_es_none(en_directorio):
+    en_directorio('Practica_Semantico')
+    completa = semantico.ParsingTable('compilador.csv')
+    comprimida = semantico.ParsingTable('compilador.csv', packed=True)
+    fin = completa.symbol_to_col['$'] + 1
+    no_terminales = [completa.col_to_symbol[c] for c in range(fin, completa.width)]
+    vacias = 0
+    for estado in range(-1, len(completa.action) // completa.width + 1):
+        for simbolo in no_terminales + ['NoExiste']:
+            esperado = completa.get_goto(estado, simbolo)
+            assert comprimida.get_goto(estado, simbolo) == esperado, (estado, simbolo)
+            vacias += esperado is None
+    assert vacias
+
+
+def test_goto_de_densa_empacada(en_directorio):
+    en_directorio('Etapa_Semantico_Final')
+    tabla, _ = DenseTable.load('compilador.csv', 'compilador.inf')
+    empacada = tabla.pack()
+    for estado in range(tabla.n_states):
+        for columna in range(tabla.n_nonterminals):
+            assert empacada.goto(estado, columna) == tabla.goto[estado * tabla.n_nonterminals + columna]
+
+
+def test_goto_vacio():
+    # Dos estados, un no terminal: solo el estado 0 tiene transición
+    tabla = PackedTable([0, 0], [5, -1], 2, 1, 1)
+    assert tabla.goto(0, 0) == 5
+    assert tabla.goto(1, 0) == -1
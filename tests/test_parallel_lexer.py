@@ -0,0 +1,70 @@
+"""El análisis léxico en paralelo da los mismos tokens que el secuencial."""
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'benchmarks'))
+from corpus import generar  # noqa: E402
+
+from comun import parallel_lexer
+import analizador_lexico
+import semantico
+
+# Con comentarios de bloque: los cortes tienen que evitarlos
+CODIGO = generar('comentarios', 20000)
+
+
+def columnas(stream):
+    tipos = [stream.kind_names[k] for k in stream.kinds]
+    return tipos, list(stream.starts), list(stream.ends), list(stream.lines), \
+        list(stream.columns), stream.values
+
+
+def fragmentos(monkeypatch, lex_shard):
+    # Registra (primera línea, es_ultimo) de cada fragmento, sin procesos
+    llamadas = []
+
+    def registrar(*args):
+        llamadas.append(args[1:])
+        return lex_shard(*args)
+
+    class Pool:
+        def __init__(self, max_workers):
+            pass
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            return False
+
+        def map(self, funcion, *iterables):
+            return map(funcion, *iterables)
+
+    monkeypatch.setattr('concurrent.futures.ProcessPoolExecutor', Pool)
+    return llamadas, registrar
+
+
+@pytest.mark.parametrize('minimo', [64, 1000, parallel_lexer.MIN_SHARD_SIZE])
+def test_semantico_min_shard_size(monkeypatch, minimo):
+    secuencial = semantico.AnalizadorLexico(CODIGO).analizar(flujo=True)
+    llamadas, registrar = fragmentos(monkeypatch, semantico.analizar_fragmento)
+    monkeypatch.setattr(semantico, 'analizar_fragmento', registrar)
+    stream = semantico.analizar_en_paralelo(CODIGO, 4, min_shard_size=minimo)
+    assert columnas(stream) == columnas(secuencial)
+    assert len(llamadas) == max(1, min(4, len(CODIGO) // minimo))
+    # Solo el último fragmento agrega el EOF
+    assert [ultimo for _, ultimo in llamadas] == [False] * (len(llamadas) - 1) + [True]
+
+
+@pytest.mark.parametrize('minimo', [64, parallel_lexer.MIN_SHARD_SIZE])
+def test_avances_min_shard_size(monkeypatch, minimo):
+    secuencial = analizador_lexico.Lexer(CODIGO).tokenize_stream()
+    llamadas, registrar = fragmentos(monkeypatch, analizador_lexico.tokenize_shard)
+    monkeypatch.setattr(analizador_lexico, 'tokenize_shard', registrar)
+    stream = analizador_lexico.tokenize_parallel_stream(CODIGO, 4, min_shard_size=minimo)
+    assert columnas(stream) == columnas(secuencial)
+    assert len(llamadas) == max(1, min(4, len(CODIGO) // minimo))
+    # Sin token de fin, los fragmentos no reciben es_ultimo
+    assert all(len(args) == 1 for args in llamadas)
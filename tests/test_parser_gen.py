@@ -0,0 +1,106 @@
+"""El parser generado por parser_gen.py acepta y falla igual que LRParser."""
+import contextlib
+import io
+import os
+import random
+from itertools import chain
+
+import pytest
+
+from lexer import token_map, tokenize_iter
+import parser_gen
+from parser_lr import DenseTable, LRParser
+
+ETAPA = os.path.dirname(os.path.abspath(parser_gen.__file__))
+PROGRAMAS = [
+    'int main(){ float a; int b; int c; c = a + b; c = suma(8, 9); }',
+    'int x, y; float z; int main(){ x = (a + b * c) / d; }',
+    'int f(int a, float b){ if (a < b) { return a; } else { while (a) { a = a - 1; } } return b; }',
+    'float g(){ return h(1, 2.5, "s") || !x && y == z; }',
+]
+
+
+@pytest.fixture(scope='module')
+def parsers(tmp_path_factory):
+    actual = os.getcwd()
+    os.chdir(ETAPA)
+    try:
+        tabla, reglas = DenseTable.load('compilador.csv', 'compilador.inf')
+        modulo = parser_gen.load('compilador.csv', 'compilador.inf',
+                                 str(tmp_path_factory.mktemp('gen') / 'parser_tabla.py'))
+    finally:
+        os.chdir(actual)
+    return LRParser(tabla, reglas), modulo, tabla
+
+
+def tokens_de(codigo):
+    return list(chain(tokenize_iter(codigo), [(token_map['$'], '$')]))
+
+
+def resultado(parse, tokens):
+    with contextlib.redirect_stdout(io.StringIO()):
+        try:
+            parse(iter(tokens))
+        except SyntaxError as e:
+            return str(e)
+    return True
+
+
+def reducciones(tabla, tokens):
+    # Reglas en el orden en que las reduce el autómata de la tabla
+    hechas = []
+    pila = [0]
+    for kind, value in tokens:
+        while True:
+            code = tabla.action[pila[-1] * tabla.n_terminals + kind]
+            if code > 0:
+                pila.append(code - 1)
+                break
+            if code == -1:
+                return hechas
+            rule = -code - 1
+            hechas.append(rule)
+            del pila[len(pila) - tabla.rule_size[rule]:]
+            pila.append(tabla.goto[pila[-1] * tabla.n_nonterminals + tabla.rule_head[rule]])
+
+
+@pytest.mark.parametrize('codigo', PROGRAMAS)
+def test_acepta_con_las_mismas_reducciones(parsers, codigo):
+    lr, modulo, tabla = parsers
+    tokens = tokens_de(codigo)
+    hechas = []
+    assert modulo.parse(iter(tokens), hechas) is True
+    assert resultado(lr._parse_fast, tokens) is True
+    assert hechas == reducciones(tabla, tokens)
+
+
+def test_tipos_por_nombre(parsers):
+    lr, modulo, tabla = parsers
+    tokens = [(tabla.terminals[kind], value) for kind, value in tokens_de(PROGRAMAS[1])]
+    assert modulo.parse(tokens) is True
+    assert resultado(modulo.parse, tokens[:-1]) == "Fin de entrada inesperado"
+    assert resultado(modulo.parse, [('nada', 'x')]) == resultado(lr._parse_fast, [('nada', 'x')])
+    assert resultado(modulo.parse, [(99, 'x')]) == "Token desconocido: (99, 'x')"
+
+
+def test_entradas_alteradas(parsers):
+    lr, modulo, tabla = parsers
+    rng = random.Random(18)
+    base = [tokens_de(codigo) for codigo in PROGRAMAS]
+    errores = 0
+    for _ in range(3000):
+        tokens = list(rng.choice(base))
+        for _ in range(rng.randint(1, 3)):
+            i = rng.randrange(len(tokens))
+            cambio = rng.random()
+            if cambio < 0.4:
+                del tokens[i]
+            elif cambio < 0.8:
+                tokens.insert(i, (rng.randrange(tabla.n_terminals), '?'))
+            else:
+                j = rng.randrange(len(tokens))
+                tokens[i], tokens[j] = tokens[j], tokens[i]
+        esperado = resultado(lr._parse_fast, tokens)
+        assert resultado(modulo.parse, tokens) == esperado, tokens
+        errores += esperado is not True
+    assert errores > 1000
@@ -0,0 +1,108 @@
+"""La traza con anillo imprime los mismos pasos que el final de la traza full."""
+import contextlib
+import io
+import os
+import re
+from itertools import chain
+
+import pytest
+
+from comun.tracer import Tracer
+
+from lexer import token_map, tokenize_iter
+import parser_lr
+from parser_lr import DenseTable, LRParser
+import semantico
+
+ETAPA = os.path.dirname(os.path.abspath(parser_lr.__file__))
+PROGRAMAS = [
+    'int main(){ float a; c = a + b; c = suma(8, 9) + ; }',
+    'int x; x = (a + b * c) / d;;',
+    'int f(int a){ if (a < b) { return a; } else { while (a) { a = a - 1; } } return b; } )',
+]
+
+
+@pytest.fixture(scope='module')
+def tabla():
+    actual = os.getcwd()
+    os.chdir(ETAPA)
+    try:
+        return DenseTable.load('compilador.csv', 'compilador.inf')
+    finally:
+        os.chdir(actual)
+
+
+def trazar(parser, codigo, ring):
+    salida = io.StringIO()
+    with contextlib.redirect_stdout(io.StringIO()):
+        with pytest.raises(SyntaxError):
+            parser.parse(chain(tokenize_iter(codigo), [(token_map['$'], '$')]),
+                         Tracer('full', ring=ring, out=salida))
+    return salida.getvalue().splitlines()
+
+
+@pytest.mark.parametrize('colapsar', [False, True])
+@pytest.mark.parametrize('codigo', PROGRAMAS)
+@pytest.mark.parametrize('ultimos', [1, 5, 1000])
+def test_anillo_igual_al_final_de_la_traza(tabla, colapsar, codigo, ultimos):
+    parser = LRParser(*tabla, collapse_units=colapsar)
+    completa = trazar(parser, codigo, None)
+    anillo = trazar(parser, codigo, ultimos)
+    assert anillo[0].startswith(f'... últimos {min(ultimos, len(completa))} registros')
+    assert anillo[1:] == completa[-ultimos:]
+
+
+# Parser de Practica_Semantico: sus tokens se pasan con los nombres de
+# terminal de compilador.csv
+SEMANTICO = os.path.dirname(os.path.abspath(semantico.__file__))
+TERMINALES = {
+    'TIPO_DATO': 'tipo', 'ID': 'identificador', 'MAIN': 'identificador', 'NUM_INT': 'entero',
+    'NUM_FLOAT': 'real', 'CADENA': 'cadena', 'OP_SUMA': 'opSuma', 'OP_RESTA': 'opSuma',
+    'OP_MULT': 'opMul', 'OP_DIV': 'opMul', 'OP_RELAC': 'opRelac', 'OP_OR': 'opOr',
+    'OP_AND': 'opAnd', 'OP_NOT': 'opNot', 'OP_IGUALDAD': 'opIgualdad', 'PUNTO_COMA': ';',
+    'COMA': ',', 'PARENTESIS_IZQ': '(', 'PARENTESIS_DER': ')', 'LLAVE_IZQ': '{',
+    'LLAVE_DER': '}', 'OP_ASIG': '=', 'EOF': '$',
+}
+PROGRAMAS_SEMANTICO = [
+    'int x; float y; int main(){ float a; c = a + b * 2; c = (8 + 9) + ; }',
+    'int main(){ int a; while (a < 3) { a = a + 1; } if (a) { return a; } else { a = 0; } c = ; }',
+    'int x; x = 1;',
+]
+
+
+@pytest.fixture(scope='module')
+def tablas_semantico():
+    inf = os.path.join(SEMANTICO, 'compilador.inf')
+    grammar = semantico.Grammar(inf)
+    # Las reglas se leen aquí: Grammar solo toma los terminales del .inf
+    with open(inf, encoding='utf-8') as f:
+        for linea in f:
+            regla = re.match(r'R(\d+)\s*<(\w+)>\s*::=(.*)', linea)
+            if regla:
+                grammar.rules[int(regla[1])] = (regla[2], [s for s in regla[3].split() if s != '\\e'])
+    return grammar, semantico.ParsingTable(os.path.join(SEMANTICO, 'compilador.csv'))
+
+
+def trazar_semantico(tablas, codigo, ring):
+    lexer = semantico.AnalizadorLexico(codigo)
+    tokens = list(lexer.iterar())
+    for token in tokens:
+        token.tipo = TERMINALES.get(token.tipo, token.tipo.lower())
+    salida = io.StringIO()
+    with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+        assert not semantico.Parser(lexer, *tablas).parse(Tracer('full', ring=ring, out=salida),
+                                                          tokens, semantic=False)
+    return salida.getvalue().splitlines()
+
+
+@pytest.mark.parametrize('codigo', PROGRAMAS_SEMANTICO)
+@pytest.mark.parametrize('ultimos', [1, 5, 1000])
+def test_anillo_semantico_igual_al_final_de_la_traza(tablas_semantico, codigo, ultimos):
+    # El anillo guarda solo la acción y lo que saca de la pila; al
+    # imprimirlo se reconstruyen la pila y la entrada de cada paso
+    completa = trazar_semantico(tablas_semantico, codigo, None)
+    anillo = trazar_semantico(tablas_semantico, codigo, ultimos)
+    pasos = len(completa) - 1
+    assert anillo[0] == completa[0]
+    assert anillo[1].startswith(f'... últimos {min(ultimos, pasos)} registros de {pasos} pasos')
+    assert anillo[2:] == completa[1:][-ultimos:]
@@ -0,0 +1,100 @@
+"""AnalizadorLexico contra el análisis línea por línea que reemplazó."""
+import random
+import re
+import sys
+
+import pytest
+
+from semantico import AnalizadorLexico
+
+
+def analizar_anterior(codigo):
+    """
+    El AnalizadorLexico.analizar() anterior: cada línea de splitlines() se
+    analiza por separado probando los patrones uno por uno. Devuelve
+    (tokens, errores) con los tokens como (tipo, valor, línea, columna).
+    """
+    lexico = AnalizadorLexico('')
+    patrones = [(re.compile(p[0]), p[1]) for p in lexico.patrones]
+    reservadas = lexico.palabras_reservadas
+    tokens, errores = [], []
+    linea, columna = 1, 1
+    for linea, texto in enumerate(codigo.splitlines(), 1):
+        columna = 1
+        texto += '\n'
+        while columna - 1 < len(texto):
+            for regex, definicion in patrones:
+                match = regex.match(texto, columna - 1)
+                if match:
+                    valor = match.group(0)
+                    if definicion is not None:
+                        tipo = definicion if isinstance(definicion, str) else definicion(valor)
+                        if tipo == 'ID' and valor in reservadas:
+                            tipo = reservadas[valor]
+                        tokens.append((tipo, valor, linea, columna))
+                    columna += len(valor)
+                    break
+            else:
+                errores.append(f"Error léxico: Carácter inesperado '{texto[columna - 1]}' "
+                               f"en línea {linea}, columna {columna}")
+                columna += 1
+    tokens.append(('EOF', '', linea, columna))
+    return tokens, errores
+
+
+def analizar_actual(codigo, **opciones):
+    lexico = AnalizadorLexico(codigo, **opciones)
+    tokens = [(t.tipo, t.valor, t.linea, t.columna) for t in lexico.analizar()]
+    return tokens, lexico.errores
+
+
+# Piezas que no forman un /* */ de varias líneas ni usan otros saltos que '\n'
+PIEZAS = ['int', 'char', 'float', 'void', 'main', 'if', 'else', 'while', 'return',
+          'x', 'ifx', '_a1', '12', '3.5', '7.', '"cad"', '"', "'a'", "'\\n'", "'",
+          '<=', '>=', '==', '!=', '<', '>', '+', '-', ' * ', '/ ', '=', '(', ')',
+          '{', '}', ';', ',', '// nota', '/* b */', ' ', '  ', '\t', '\n', '\n\n',
+          '\r\n', '@', '!', '#', 'é']
+
+
+@pytest.mark.parametrize('backend', ['re', 'dfa'])
+def test_mismos_tokens_que_el_analisis_anterior(backend, monkeypatch):
+    monkeypatch.setattr(sys, 'stderr', sys.stdout)
+    rng = random.Random(4)
+    for _ in range(1500):
+        codigo = ''.join(rng.choice(PIEZAS) for _ in range(rng.randint(0, 25)))
+        assert analizar_actual(codigo, backend=backend) == analizar_anterior(codigo), repr(codigo)
+
+
+def test_demo_sin_cambios():
+    codigo = ("int main() {\n  int x = 10; // comentario\n  float y = 2.5;\n"
+              "  if (x >= 3 && y != 1.0) { x = x + 1; }\n  return x;\n}\n")
+    assert analizar_actual(codigo) == analizar_anterior(codigo)
+
+
+# Diferencias documentadas en AnalizadorLexico.escanear
+
+def test_retorno_de_carro_suelto_no_corta_la_linea():
+    tokens, _ = analizar_actual('a\rb')
+    assert tokens[:2] == [('ID', 'a', 1, 1), ('ID', 'b', 1, 3)]
+    anteriores, _ = analizar_anterior('a\rb')
+    assert anteriores[:2] == [('ID', 'a', 1, 1), ('ID', 'b', 2, 1)]
+
+
+@pytest.mark.parametrize('separador', ['\x0b', '\x0c', '\x1c', '\x85', '\u2028'])
+def test_otros_separadores_son_espacios(separador):
+    tokens, errores = analizar_actual(f'x{separador}y')
+    assert tokens[1] == ('ID', 'y', 1, 3)
+    assert errores == []
+
+
+def test_comentario_de_linea_hasta_el_salto():
+    tokens, _ = analizar_actual('x // a\rb\ny')
+    assert [t[1] for t in tokens] == ['x', 'y', '']
+    assert tokens[1][2:] == (2, 1)
+
+
+def test_comentario_de_bloque_de_varias_lineas():
+    tokens, _ = analizar_actual('/* a\n b */ x')
+    assert tokens[0] == ('ID', 'x', 2, 7)
+    anteriores, _ = analizar_anterior('/* a\n b */ x')
+    assert [t[1] for t in anteriores][:2] == ['/', '*']
@@ -0,0 +1,110 @@
+"""Las tablas de símbolos usan el id que el lexer deja en cada token ID."""
+import pytest
+
+import compilador2
+import compiler
+import semantico
+
+PROGRAMA = """
+int a;
+int suma(int x, int y){ return x + y; }
+int main(){
+    float b;
+    int b;
+    b = a + 1;
+    c = 2;
+    suma(a, b);
+    nada(1);
+}
+"""
+
+
+def sin_hashear(nombres):
+    # Después del lexer, la tabla de símbolos no debe volver a buscar nombres
+    def falla(nombre):
+        raise AssertionError(f"se volvió a buscar {nombre!r} en la NameTable")
+    nombres.intern = nombres.lookup = nombres.canonical = falla
+
+
+@pytest.mark.parametrize('modulo', [semantico, compilador2])
+def test_ids_en_los_tokens(modulo):
+    lexer = modulo.AnalizadorLexico(PROGRAMA)
+    ids = [token for token in lexer.analizar() if token.tipo == 'ID']
+    assert ids
+    for token in ids:
+        assert token.nombre_id == lexer.nombres.lookup(token.valor)
+        assert token.valor is lexer.nombres.names[token.nombre_id]
+    assert all(token.nombre_id is None for token in lexer.tokens if token.tipo != 'ID')
+
+
+def test_semantico_busca_por_id():
+    lexer = semantico.AnalizadorLexico(PROGRAMA)
+    tokens = {token.valor: token for token in lexer.analizar() if token.tipo == 'ID'}
+    tabla = semantico.TablaSimbolo([], lexer.nombres)
+    parser = semantico.Parser(lexer, None, None)
+
+    def declarar(nombre, tipo='int'):
+        return semantico.NodoDeclaracionVariable(semantico.NodoTipoDato(tipo),
+                                                 parser._nodo_id(tokens[nombre]))
+
+    sin_hashear(lexer.nombres)
+    errores = []
+    declarar('a').validaTipos(tabla, errores)
+    tabla.entrar_ambito('main')
+    declarar('b', 'float').validaTipos(tabla, errores)
+    declarar('b').validaTipos(tabla, errores)
+    for nombre in ('a', 'b', 'c'):
+        parser._nodo_id(tokens[nombre]).validaTipos(tabla, errores)
+
+    assert tabla.buscar(tokens['a'].nombre_id)['nivel'] == 0
+    assert tabla.buscar_en_ambito_actual(tokens['a'].nombre_id) is None
+    assert tabla.buscar_en_ambito_actual(tokens['b'].nombre_id)['tipo'] == 'float'
+    b = tokens['b']
+    assert tabla.errores_list == [
+        f"Error semántico: Redeclaración de 'b' en el ámbito actual. (Línea: {b.linea}, Columna: {b.columna})"]
+    assert errores == ["Error semántico: Uso de identificador no declarado 'c'."]
+
+
+def test_semantico_tokens_sin_id():
+    # Tokens que no vienen de iterar(): el id se toma una vez al crear el nodo
+    lexer = semantico.AnalizadorLexico('')
+    parser = semantico.Parser(lexer, None, None)
+    nodo = parser._nodo_id(semantico.Token('ID', 'x', 1, 1))
+    assert nodo.nombre_id == lexer.nombres.lookup('x')
+
+
+def test_compilador2_busca_por_id():
+    lexer = compilador2.AnalizadorLexico(PROGRAMA)
+    ast, _ = compilador2.AnalizadorSintactico(lexer.iterar()).analizar()
+    analizador = compilador2.AnalizadorSemantico(ast, lexer.nombres)
+    sin_hashear(lexer.nombres)
+    aceptado, errores, _ = analizador.analizar()
+    assert not aceptado
+    assert errores == [
+        "Error semántico: La variable 'b' ya está definida en este ámbito",
+        "Error semántico: Incompatibilidad de tipos en asignación a 'b'",
+        "Error semántico: La variable 'c' no está definida",
+        "Error semántico: La función 'suma' no está definida",
+        "Error semántico: La función 'nada' no está definida",
+    ]
+
+
+def test_compiler_ambitos_fuera_de_la_tabla_de_nombres():
+    lexer = compiler.LexicalAnalyzer()
+    tokens = {token.value: token for token in lexer.tokenize('int f; float x; x = f;')
+              if token.type == 'ID'}
+    analizador = compiler.SemanticAnalyzer(lexer.names)
+    sin_hashear(lexer.names)
+    x = tokens['x'].name_id
+    assert analizador.add_variable(x, 'float')
+    assert analizador.add_function(tokens['f'].name_id, 'int', ['int'])
+    analizador.enter_scope('f')
+    analizador.enter_scope('cuerpo')
+    assert analizador.add_variable(x, 'int')
+    assert not analizador.add_variable(x, 'int')
+    assert analizador.get_variable_type(x) == 'int'
+    analizador.exit_scope()
+    assert analizador.get_variable_type(x) == 'float'
+    assert analizador.check_function_call(tokens['f'].name_id, ['int'])
+    assert analizador.errors == ["Error semántico: Variable 'x' ya declarada en el ámbito 'cuerpo'"]
+    assert 'global' not in lexer.names and 'cuerpo' not in lexer.names